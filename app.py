@@ -1,263 +1,683 @@
 import streamlit as st
+import html
+import importlib.util
+import tempfile
 import time
-from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-import random
-from typing import Dict, List, Tuple, Union
-
-# --- Enhanced Data Structures ---
-DAILY_TASKS = {
-    "Work": [
-        "Check emails", 
-        "Attend meetings", 
-        "Complete project tasks", 
-        "Review daily reports", 
-        "Team standup",
-        "Update project documentation",
-        "Code review session",
-        "Client communication",
-        "Weekly planning",
-        "Performance analysis"
-    ],
-    "Study": [
-        "Review lecture notes", 
-        "Complete assignments", 
-        "Practice coding", 
-        "Read course materials", 
-        "Study group session",
-        "Research project topics",
-        "Prepare for exams",
-        "Online course modules",
-        "Academic writing",
-        "Lab experiments"
-    ],
-    "Personal": [
-        "Exercise", 
-        "Meal prep", 
-        "Call family", 
-        "Read a book", 
-        "Plan tomorrow",
-        "Grocery shopping",
-        "House cleaning",
-        "Personal reflection",
-        "Hobby time",
-        "Social activities"
-    ],
-    "Creative": [
-        "Write in journal", 
-        "Learn new skill", 
-        "Work on side project", 
-        "Practice hobby", 
-        "Brainstorm ideas",
-        "Digital art creation",
-        "Music practice",
-        "Creative writing",
-        "Photography session",
-        "Design exploration"
-    ]
-}
-
-MOTIVATIONAL_QUOTES = [
-    "Work smarter, not harder. 💪",
-    "Automate the boring stuff, enjoy life! 🚀",
-    "One hour saved is one more for yourself tomorrow. ⏰",
-    "Let technology work for you! 🤖",
-    "Consistency beats intensity. Small steps daily! 📈",
-    "Progress, not perfection. 🎯",
-    "Your future self will thank you. 🙏",
-    "Make it happen! ⚡",
-    "Dream big, start small, move fast. 🏃‍♂️",
-    "Success is automated habits. 🔄",
-    "Innovation distinguishes between a leader and a follower. 🌟",
-    "The best time to plant a tree was 20 years ago. The second best time is now. 🌳",
-    "Don't wait for opportunity. Create it. 🔥",
-    "Excellence is not a skill, it's an attitude. ✨",
-    "The future belongs to those who believe in the beauty of their dreams. 🌈"
-]
-
-# Priority levels with their corresponding time multipliers
-PRIORITY_CONFIG = {
-    "High": {"emoji": "🔴", "multiplier": 1.5},
-    "Medium": {"emoji": "🟡", "multiplier": 1.0},
-    "Low": {"emoji": "🟢", "multiplier": 0.7}
-}
-
-# Time estimates for different types of tasks
-TIME_ESTIMATES = ["15 min", "30 min", "45 min", "1 hour", "1.5 hours", "2 hours", "3 hours"]
-
-# --- Core Functions ---
-def generate_smart_todo(user_name: str, category: str = "Work", priority: str = "Medium") -> Tuple[List[str], str]:
-    """
-    Enhanced todo generator with categories, priorities, and time estimates
-    """
-    if not user_name.strip():
-        raise ValueError("User name cannot be empty")
-    
-    # Get tasks for the specified category
-    base_tasks = DAILY_TASKS.get(category, DAILY_TASKS["Work"])
-    
-    # Select random tasks (3-5 tasks based on priority)
-    num_tasks = 5 if priority == "High" else 4 if priority == "Medium" else 3
-    num_tasks = min(num_tasks, len(base_tasks))
-    selected_tasks = random.sample(base_tasks, num_tasks)
-    
-    # Enhance tasks with priority indicators and time estimates
-    enhanced_tasks = []
-    priority_config = PRIORITY_CONFIG[priority]
-    
-    for task in selected_tasks:
-        # Select time estimate based on priority
-        base_time_idx = random.randint(0, len(TIME_ESTIMATES) - 1)
-        time_idx = min(len(TIME_ESTIMATES) - 1, 
-                      int(base_time_idx * priority_config["multiplier"]))
-        time_estimate = TIME_ESTIMATES[time_idx]
-        
-        enhanced_task = f"{priority_config['emoji']} {task} ({time_estimate})"
-        enhanced_tasks.append(enhanced_task)
-    
-    # Select motivational message
-    motivation = random.choice(MOTIVATIONAL_QUOTES)
-    
-    return enhanced_tasks, motivation
+from datetime import datetime, timedelta
+from datetime import time as time_of_day
+
+# --- Core Logic ---
+# Only the standard-library parts of core are imported here; NumPy, pandas and
+# plotly (and the core modules built on them) are imported by the tabs that use
+# them, so a fresh session on the About tab does not pay for them.
+from core import (
+    PRIORITY_CONFIG,
+    PROGRESS_CHUNK,
+    TODO_CACHE,
+    advanced_financial_calc,
+    dedupe_names,
+    find_groups,
+    generate_daily_todo,
+    generate_smart_todo,
+    group_page,
+    normalize_name,
+    smart_group_generator,
+)
+from core.analytics import UsageStore
+from core.catalog import format_minutes, get_catalog_store
+from core.export import (
+    COMPRESSIONS,
+    EXPORT_FORMATS,
+    export_file_name,
+    export_finance,
+    export_groups,
+    export_mime_type,
+    export_todo_lists,
+)
+from core.fx import consolidate, load_rate_table
+from core.tax import get_tax_table, load_tax_tables
 
-def advanced_financial_calc(salary: float, expenses: float, savings_goal: float = 0, 
-                          currency: str = "UGX") -> Dict[str, Union[float, str]]:
+# Near-duplicate clusters listed for review
+PREVIEW_GROUPS = 60
+
+# Groups per results page; only the visible page is rendered, as one element
+GROUP_PAGE_SIZES = (12, 24, 48, 96)
+
+# Matching groups offered by the name search
+MAX_LISTED_MATCHES = 100
+
+# Analytics time ranges in days (None = all recorded history)
+TIME_RANGES = {"Last 7 Days": 7, "Last 30 Days": 30, "Last 90 Days": 90,
+               "Last Year": 365, "All Time": None}
+RESOLUTION_LABELS = {"day": "Daily", "week": "Weekly", "month": "Monthly"}
+
+# Largest scenario sweep the Financial Hub will start, and seconds between chart refreshes
+MAX_SWEEP_SCENARIOS = 50_000_000
+SWEEP_REFRESH = 0.5
+
+@st.cache_resource
+def get_usage_store() -> UsageStore:
     """
-    Advanced financial calculator with comprehensive analysis
+    One usage store (and writer thread) shared by every session
     """
-    if salary < 0 or expenses < 0 or savings_goal < 0:
-        raise ValueError("Financial values cannot be negative")
-    
-    # Tax calculation (10% flat rate)
-    tax_rate = 0.10
-    tax = tax_rate * salary
-    net_salary = salary - tax
-    
-    # Basic savings calculation
-    savings = net_salary - expenses
-    
-    # Calculate percentages
-    savings_rate = (savings / salary * 100) if salary > 0 else 0
-    expense_rate = (expenses / salary * 100) if salary > 0 else 0
-    tax_rate_percent = (tax / salary * 100) if salary > 0 else 0
-    
-    # Goal tracking
-    months_to_goal = (savings_goal / savings) if savings > 0 and savings_goal > 0 else float('inf')
-    
-    # Future projections
-    projected_savings_6m = savings * 6
-    projected_savings_12m = savings * 12
-    
-    # Financial health indicators
-    emergency_fund_needed = expenses * 6  # 6 months of expenses
-    emergency_fund_coverage = (savings / expenses) if expenses > 0 else float('inf')
-    
-    # Debt-to-income ratio (assuming expenses include debt payments)
-    debt_to_income = expense_rate
-    
-    # Financial health score (0-100)
-    health_score = calculate_financial_health_score(savings_rate, debt_to_income, emergency_fund_coverage)
-    
-    return {
-        'salary': salary,
-        'tax': tax,
-        'net_salary': net_salary,
-        'expenses': expenses,
-        'savings': savings,
-        'savings_rate': savings_rate,
-        'expense_rate': expense_rate,
-        'tax_rate_percent': tax_rate_percent,
-        'savings_goal': savings_goal,
-        'months_to_goal': months_to_goal,
-        'projected_savings_6m': projected_savings_6m,
-        'projected_savings_12m': projected_savings_12m,
-        'emergency_fund_needed': emergency_fund_needed,
-        'emergency_fund_coverage': emergency_fund_coverage,
-        'debt_to_income': debt_to_income,
-        'health_score': health_score,
-        'currency': currency
-    }
+    return UsageStore()
 
-def calculate_financial_health_score(savings_rate: float, debt_to_income: float, 
-                                   emergency_coverage: float) -> float:
+@st.cache_resource
+def get_sweep_pool():
     """
-    Calculate financial health score based on key metrics
+    One worker pool (one process per core) shared by every session's sweeps
     """
-    score = 0
-    
-    # Savings rate scoring (40 points max)
-    if savings_rate >= 20:
-        score += 40
-    elif savings_rate >= 10:
-        score += 30
-    elif savings_rate >= 5:
-        score += 20
-    elif savings_rate > 0:
-        score += 10
-    
-    # Debt-to-income scoring (30 points max)
-    if debt_to_income <= 20:
-        score += 30
-    elif debt_to_income <= 30:
-        score += 25
-    elif debt_to_income <= 40:
-        score += 15
-    elif debt_to_income <= 50:
-        score += 10
-    
-    # Emergency fund scoring (30 points max)
-    if emergency_coverage >= 6:
-        score += 30
-    elif emergency_coverage >= 3:
-        score += 20
-    elif emergency_coverage >= 1:
-        score += 10
-    
-    return min(100, score)
+    from core.sweep import sweep_executor
+    return sweep_executor()
 
-def smart_group_generator(names_str: str, group_size: int = 3, shuffle_mode: str = "Random") -> List[List[str]]:
+@st.cache_data(max_entries=4)
+def find_roster_duplicates(names: tuple, threshold: float):
     """
-    Enhanced group generator with multiple algorithms and validation
+    Near-duplicate name clusters, once per roster and threshold
     """
-    if not names_str.strip():
-        return []
-    
-    if group_size < 1:
-        raise ValueError("Group size must be at least 1")
-    
-    # Parse and clean names
-    names = [name.strip() for name in names_str.split(",") if name.strip()]
+    from core.dedupe import find_near_duplicates
+    return find_near_duplicates(names, threshold)
+
+def review_near_duplicates(names, merge, threshold):
+    """
+    Show flagged near-duplicate clusters; returns the names to group
+    """
+    from core.dedupe import describe_clusters, merge_near_duplicates
+
+    clusters = find_roster_duplicates(tuple(names), threshold)
+    if not clusters:
+        st.info("🔍 No near-duplicate names found.")
+        return names
+    flagged = sum(len(members) for members in clusters)
+    action = "keeping the first spelling of each" if merge else "all kept, review below"
+    noun = "cluster" if len(clusters) == 1 else "clusters"
+    st.warning(f"🔍 {len(clusters):,} {noun} of possible duplicates flagged "
+               f"({flagged:,} names, {action}).")
+    with st.expander("👀 Review flagged names"):
+        for spellings in describe_clusters(names, clusters, limit=PREVIEW_GROUPS):
+            st.markdown("- " + " · ".join(f"`{name}`" for name in spellings))
+        if len(clusters) > PREVIEW_GROUPS:
+            st.caption(f"Showing the first {PREVIEW_GROUPS} of {len(clusters):,} clusters.")
+    return merge_near_duplicates(names, clusters) if merge else names
+
+@st.cache_data(max_entries=4)
+def load_attribute_roster(data: bytes):
+    """
+    Parse an uploaded attribute roster once per file content
+    """
+    from core.balance import read_attribute_roster
+    return read_attribute_roster(data)
+
+@st.fragment
+def export_panel(stem, export, key):
+    """
+    Format and compression pickers with a download button. export(target,
+    fmt, compression) streams the file into a temporary file only when the
+    button is clicked; changing the format reruns only this panel.
+    """
+    formats = [fmt for fmt in EXPORT_FORMATS
+               if fmt != "parquet" or importlib.util.find_spec("pyarrow") is not None]
+    col_f, col_c, col_d = st.columns([1, 1, 2])
+    with col_f:
+        fmt = st.selectbox("📄 Export Format:", formats, key=f"{key}_format", format_func=str.upper)
+    with col_c:
+        compression = st.selectbox("🗜️ Compression:", ["none"] + list(COMPRESSIONS),
+                                   key=f"{key}_compression", disabled=fmt == "parquet",
+                                   help="Parquet files are always compressed per column")
+    compression = None if compression == "none" or fmt == "parquet" else compression
+    
+    def build_file():
+        target = tempfile.TemporaryFile()
+        export(target, fmt, compression)
+        target.seek(0)
+        return target
+    
+    with col_d:
+        st.download_button(f"⬇️ Download {export_file_name(stem, fmt, compression)}", build_file,
+                           file_name=export_file_name(stem, fmt, compression),
+                           mime=export_mime_type(fmt, compression), key=f"{key}_download",
+                           on_click="ignore")
+
+# --- Group Results ---
+def show_group_page(page_number):
+    """
+    Search callback target: open the results page holding a group
+    """
+    st.session_state["groups_page"] = page_number
+
+def jump_to_match():
+    """
+    Search callback: open the page of the first (or chosen) matching group
+    """
+    result = st.session_state["group_result"]
+    query = st.session_state.get("groups_search", "").strip()
+    result["matches"] = find_groups(result["groups"], query) if query else []
+    result["query"] = query
+    if result["matches"]:
+        show_group_page(result["matches"][0] // st.session_state["groups_per_page"] + 1)
+
+def group_cards_html(groups, first_number, query=""):
+    """
+    One HTML string for a page of group cards, built in a single pass;
+    members matching the query as find_groups does are highlighted
+    """
+    needle = normalize_name(query)
+    parts = ['<div class="group-grid">']
+    for number, members in enumerate(groups, first_number):
+        parts.append(f'<div class="group-card"><h4>👥 Group {number:,}</h4><ul>')
+        for member in members:
+            name = html.escape(member)
+            if needle and needle in normalize_name(member):
+                name = f"<mark>{name}</mark>"
+            parts.append(f"<li><strong>{name}</strong></li>")
+        parts.append("</ul></div>")
+    parts.append("</div>")
+    return "".join(parts)
+
+@st.fragment
+def group_results_panel():
+    """
+    The last generated groups, one page at a time, as cards or a table,
+    with a name search that jumps to the matching group's page. Paging and
+    searching rerun only this panel, and only the visible page is built.
+    """
+    result = st.session_state["group_result"]
+    groups, total_groups = result["groups"], result["total_groups"]
+    
+    col_v, col_s, col_n = st.columns([1, 2, 1])
+    with col_v:
+        view = st.radio("🗂️ View:", ["Cards", "Table"], horizontal=True, key="groups_view")
+    with col_n:
+        per_page = st.selectbox("Groups per page:", GROUP_PAGE_SIZES, index=1,
+                                key="groups_per_page", on_change=show_group_page, args=(1,))
+    with col_s:
+        st.text_input("🔎 Find a name:", key="groups_search", on_change=jump_to_match,
+                      placeholder="Type a name and press Enter")
+    page_count = max(1, -(-total_groups // per_page))
+    
+    matches = result.get("matches", [])
+    if result.get("query"):
+        if matches:
+            listed = matches[:MAX_LISTED_MATCHES]
+            noun = "group" if len(matches) == 1 else "groups"
+            choice = st.selectbox(f"🎯 {len(matches):,} matching {noun}, jump to:",
+                                  listed, format_func=lambda index: f"Group {index + 1:,}",
+                                  key="groups_match")
+            st.button("➡️ Go to group", key="groups_go", on_click=show_group_page,
+                      args=(choice // per_page + 1,))
+        else:
+            st.caption(f"No group has a member matching “{result['query']}”.")
+    
+    st.session_state["groups_page"] = min(st.session_state.get("groups_page", 1), page_count)
+    page = st.number_input(f"📄 Page (of {page_count:,}):", min_value=1, max_value=page_count,
+                           step=1, key="groups_page")
+    start = (page - 1) * per_page
+    visible = group_page(groups, start, per_page)
+    st.caption(f"Groups {start + 1:,}–{start + len(visible):,} of {total_groups:,}")
+    
+    if view == "Cards":
+        st.markdown(group_cards_html(visible, start + 1, result.get("query", "")),
+                    unsafe_allow_html=True)
+    else:
+        st.dataframe({"Group": list(range(start + 1, start + len(visible) + 1)),
+                      "Size": [len(members) for members in visible],
+                      "Members": [", ".join(members) for members in visible]},
+                     hide_index=True, use_container_width=True)
+    
+    # The full assignment is written only when its download is clicked
+    export_panel("group_assignment", lambda target, fmt, compression: export_groups(
+        groups, target, fmt, compression), key="groups_export")
+    
+    # Group statistics
+    st.markdown("### 📊 Group Statistics")
+    col1, col2, col3 = st.columns(3)
     
-    if not names:
-        return []
+    with col1:
+        st.metric("🏆 Total Groups", f"{total_groups:,}")
+    with col2:
+        avg_size = result["name_count"] / total_groups if total_groups else 0
+        st.metric("👥 Avg Group Size", f"{avg_size:.1f}")
+    with col3:
+        st.metric("🔄 Method Used", result["shuffle_mode"])
+
+# --- Financial Hub Panels ---
+@st.cache_resource(max_entries=4)
+def load_uploaded_statement(file_id, _upload, dayfirst):
+    """
+    Parse an uploaded bank statement once per upload. Uploading the same
+    file again is a hit in the on-disk statement cache (keyed by its hash).
+    """
+    from core.statements import StatementParser, load_statement
+    _upload.seek(0)
+    return load_statement(_upload, StatementParser(dayfirst=dayfirst))
+
+def use_statement_averages(salary, expenses):
+    """
+    Button callback: copy a statement's monthly averages into the calculator
+    """
+    st.session_state["finance_salary"] = salary
+    st.session_state["finance_expenses"] = expenses
+
+def bank_statement_section(savings_goal, currency, tax_table, report_currency):
+    """
+    Bank statement upload: monthly income and expenses from a transaction
+    export, the calculator's results for every month (in the report
+    currency, at each month's rates), and a button copying the recent
+    averages into the inputs above
+    """
+    with st.expander("🏦 Import Bank Statement"):
+        upload = st.file_uploader("Transaction export (CSV):", type=["csv", "txt"],
+                                  key="statement_upload")
+        col_a, col_b = st.columns(2)
+        with col_a:
+            dayfirst = st.checkbox("📅 Day-first dates (DD/MM/YYYY)", value=True)
+        with col_b:
+            gross_up = st.checkbox("🧾 Deposits are take-home pay", value=True,
+                                   help="Gross each month's income up through the tax table "
+                                        "to the salary the calculator expects")
+        if upload is None:
+            st.caption("Columns are found from the header: a date, an amount (or debit and "
+                       "credit columns) and a description. Transactions are categorised by "
+                       "keyword rules into income, expenses and transfers.")
+            return
+        try:
+            statement = load_uploaded_statement(upload.file_id, upload, dayfirst)
+        except ValueError as exc:
+            st.error(f"⚠️ {exc}")
+            return
+        if not len(statement):
+            st.warning("No transactions with a valid date and amount were found.")
+            return
+        
+        import plotly.graph_objects as go
+        
+        results = statement.financials(savings_goal, currency, tax_table, gross_up=gross_up)
+        window = len(statement)
+        if len(statement) > 1:
+            window = st.slider("🗓️ Average over the last N months:", 1, len(statement),
+                               min(12, len(statement)))
+        average_salary = round(float(results["salary"][-window:].mean()), 2)
+        average_expenses = round(float(results["expenses"][-window:].mean()), 2)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("🗓️ Months", f"{len(statement):,}",
+                      delta=f"{statement.months[0]} – {statement.months[-1]}", delta_color="off")
+        with col2:
+            st.metric("🧾 Transactions", f"{statement.transactions:,}")
+        with col3:
+            st.metric("💰 Avg Salary", f"{average_salary:,.0f} {currency}")
+        with col4:
+            st.metric("🛒 Avg Expenses", f"{average_expenses:,.0f} {currency}")
+        notes = []
+        if statement.from_cache:
+            notes.append("loaded from the statement cache")
+        if statement.skipped:
+            notes.append(f"{statement.skipped:,} rows without a valid date or amount skipped")
+        if notes:
+            st.caption("ℹ️ " + "; ".join(notes).capitalize() + ".")
+        st.button("📥 Use these averages in the calculator", on_click=use_statement_averages,
+                  args=(average_salary, average_expenses))
+        
+        series = statement.monthly_series()
+        fig = go.Figure([
+            go.Bar(name='Income', x=series['month'], y=series['income'], marker_color='#4ecdc4'),
+            go.Bar(name='Expenses', x=series['month'], y=series['expenses'],
+                   marker_color='#ff6b6b'),
+            go.Scatter(name='Net', x=series['month'], y=series['net'], mode='lines+markers',
+                       line=dict(color='#667eea', width=3)),
+        ])
+        fig.update_layout(title='🏦 Monthly Income and Expenses', barmode='group',
+                          yaxis_title=f'Amount ({currency})', height=400, template='plotly_white')
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("#### 🏷️ Categories")
+        st.dataframe(statement.category_totals(), hide_index=True, use_container_width=True)
+        st.markdown("#### 📅 Results by Month")
+        if report_currency is not None and report_currency != currency:
+            try:
+                results = statement.financials(savings_goal, currency, tax_table, gross_up=gross_up,
+                                               report_currency=report_currency)
+            except ValueError as exc:
+                st.warning(f"⚠️ Shown in {currency}: {exc}")
+            else:
+                st.caption(f"💱 Amounts in {report_currency}, each month at its own exchange rates.")
+        st.dataframe({column: results[column] for column in
+                      ("month", "salary", "net_salary", "expenses", "savings", "savings_rate",
+                       "health_score")}, hide_index=True, use_container_width=True)
+        export_panel("monthly_finances", lambda target, fmt, compression: export_finance(
+            [results], target, fmt, compression), key="statement_export")
+
+@st.cache_resource(max_entries=32)
+def financial_analysis(salary, expenses, savings_goal, currency, tax_table, fx_lines,
+                       report_currency, rate_date, projection):
+    """
+    Results and figures for one set of Financial Hub inputs. Figures are built
+    once and shared read-only by every session, so showing them again only
+    serializes them.
     
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_names = []
-    for name in names:
-        if name.lower() not in seen:
-            seen.add(name.lower())
-            unique_names.append(name)
+    fx_lines are (type, amount, currency) rows added to the salary or
+    expenses; everything shown is converted to the report currency.
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
+    from core.projection import savings_projection
+    
+    projection_model, horizon, num_paths, salary_volatility, expense_volatility = projection
+    salary = consolidate([(salary, currency)] + [(amount, line_currency) for kind, amount, line_currency
+                                                  in fx_lines if kind == "Income"],
+                         currency, rate_date)
+    expenses = consolidate([(expenses, currency)] + [(amount, line_currency) for kind, amount, line_currency
+                                                      in fx_lines if kind == "Expense"],
+                           currency, rate_date)
+    results = advanced_financial_calc(salary, expenses, savings_goal, currency, tax_table,
+                                      report_currency, rate_date)
+    fx_rate, shown = results['fx_rate'], results['currency']
+    figures = []
+    
+    fig = go.Figure(data=[
+        go.Bar(name='Tax', x=['Breakdown'], y=[results['tax']], marker_color='#ff6b6b'),
+        go.Bar(name='Expenses', x=['Breakdown'], y=[results['expenses']], marker_color='#4ecdc4'),
+        go.Bar(name='Savings', x=['Breakdown'], y=[results['savings']], marker_color='#45b7d1')
+    ])
+    fig.update_layout(
+        title='💰 Monthly Financial Breakdown',
+        barmode='stack',
+        height=400,
+        template='plotly_white'
+    )
+    figures.append(fig)
+    
+    # Tax paid per bracket, with the marginal and effective rates
+    brackets = get_tax_table(tax_table, currency).breakdown(salary)
+    labels = [f"{b['lower'] * fx_rate:,.0f}+ @ {b['rate']:.0%}" for b in brackets]
+    fig_tax = go.Figure([
+        go.Bar(name='Tax in Bracket', x=labels, y=[b['tax'] * fx_rate for b in brackets],
+               marker_color='#ff6b6b'),
+        go.Scatter(name='Marginal Rate (%)', x=labels, y=[b['rate'] * 100 for b in brackets],
+                   yaxis='y2', mode='lines+markers', line=dict(color='#667eea', width=3)),
+        go.Scatter(name='Effective Rate (%)', x=labels,
+                   y=[results['tax_rate_percent']] * len(brackets), yaxis='y2', mode='lines',
+                   line=dict(color='#45b7d1', dash='dash')),
+    ])
+    fig_tax.update_layout(
+        title=f"🧾 Tax by Bracket ({results['tax_table']})",
+        yaxis=dict(title=f'Tax ({shown})'),
+        yaxis2=dict(title='Rate (%)', overlaying='y', side='right', rangemode='tozero'),
+        height=400,
+        template='plotly_white'
+    )
+    figures.append(fig_tax)
+    
+    # Savings projection
+    if projection_model == "Monte Carlo":
+        projection = savings_projection(salary, expenses, savings_goal, months=horizon,
+                                        paths=num_paths, salary_volatility=salary_volatility,
+                                        expense_volatility=expense_volatility,
+                                        currency=currency, tax_table=tax_table)
+        months = projection['month']
+        
+        fig2 = go.Figure([
+            go.Scatter(x=months, y=projection['p90'] * fx_rate, name='P90', mode='lines',
+                       line=dict(color='#667eea', width=0)),
+            go.Scatter(x=months, y=projection['p10'] * fx_rate, name='P10–P90', mode='lines',
+                       line=dict(color='#667eea', width=0), fill='tonexty',
+                       fillcolor='rgba(102, 126, 234, 0.25)'),
+            go.Scatter(x=months, y=projection['p50'] * fx_rate, name='Median (P50)', mode='lines',
+                       line=dict(color='#667eea', width=3)),
+        ])
+        if savings_goal > 0:
+            fig2.add_hline(y=results['savings_goal'], line_dash='dash', line_color='#ff6b6b',
+                           annotation_text='Savings Goal')
+        fig2.update_layout(title=f'📈 {horizon}-Month Savings Projection ({num_paths:,} simulated paths)',
+                           xaxis_title='Month', yaxis_title=f'Cumulative Savings ({shown})',
+                           template='plotly_white')
+        figures.append(fig2)
+        
+        if savings_goal > 0:
+            fig3 = px.line(x=months, y=projection['goal_probability'] * 100,
+                           title='🎯 Probability of Reaching the Savings Goal',
+                           labels={'x': 'Month', 'y': 'Probability (%)'})
+            fig3.update_traces(line_color='#45b7d1', line_width=3)
+            fig3.update_layout(template='plotly_white', yaxis_range=[0, 100])
+            figures.append(fig3)
+    else:
+        months = list(range(1, horizon + 1))
+        projected = [results['savings'] * m for m in months]
+        
+        fig2 = px.line(x=months, y=projected, title=f'📈 {horizon}-Month Savings Projection',
+                       labels={'x': 'Month', 'y': f'Cumulative Savings ({shown})'})
+        fig2.update_traces(line_color='#667eea', line_width=3)
+        fig2.update_layout(template='plotly_white')
+        figures.append(fig2)
+    return {"results": results, "figures": figures}
+
+@st.fragment
+def financial_results_panel(inputs, projection):
+    """
+    Calculate button and results. Clicking reruns only this panel, and the
+    last analysis stays in session state, so reruns from other controls
+    show it again without recomputing.
+    """
+    if st.button("📈 Calculate & Analyze", type="primary"):
+        st.session_state["finance_analysis"] = {
+            "inputs": inputs, "projection": projection,
+            **financial_analysis(*inputs, projection),
+        }
+        get_usage_store().record("finance", currency=inputs[3])
+    analysis = st.session_state.get("finance_analysis")
+    if analysis is None:
+        return
+    results = analysis["results"]
+    currency = results["currency"]
+    
+    # Display results with metrics
+    st.markdown("### 📊 Financial Analysis Results")
+    if (analysis["inputs"], analysis["projection"]) != (inputs, projection):
+        st.caption("ℹ️ Inputs changed since this analysis; press Calculate & Analyze to update it.")
+    if results["fx_rate"] != 1.0:
+        rate_date = analysis["inputs"][7]
+        st.caption(f"💱 Converted at 1 {analysis['inputs'][3]} = {results['fx_rate']:.6g} {currency} "
+                   f"({'rates of ' + str(rate_date) if rate_date else 'latest rates'}).")
     
-    names = unique_names
+    col1, col2, col3, col4 = st.columns(4)
     
-    # Apply sorting based on shuffle mode
-    if shuffle_mode == "Alphabetical":
-        names.sort(key=str.lower)
-    elif shuffle_mode == "Reverse":
-        names.sort(key=str.lower, reverse=True)
-    else:  # Random
-        random.shuffle(names)
+    with col1:
+        st.metric("💰 Net Salary", f"{results['net_salary']:,.0f} {currency}")
+    with col2:
+        st.metric(f"🏦 Tax ({results['tax_rate_percent']:.1f}% effective)", f"{results['tax']:,.0f} {currency}",
+                 delta=f"{results['marginal_tax_rate_percent']:.0f}% marginal", delta_color="off")
+    with col3:
+        st.metric("💵 Monthly Savings", f"{results['savings']:,.0f} {currency}", 
+                 delta=f"{results['savings_rate']:.1f}%")
+    with col4:
+        st.metric("🎯 Months to Goal", 
+                 f"{results['months_to_goal']:.1f}" if results['months_to_goal'] != float('inf') else "∞")
     
-    # Create groups
-    groups = []
-    for i in range(0, len(names), group_size):
-        group = names[i:i + group_size]
-        groups.append(group)
+    for fig in analysis["figures"]:
+        st.plotly_chart(fig, use_container_width=True)
     
-    return groups
+    export_panel("financial_analysis", lambda target, fmt, compression: export_finance(
+        [results], target, fmt, compression), key="finance_export")
+
+@st.fragment
+def goal_solver_panel(salary, expenses, savings_goal, currency, tax_table, report_currency,
+                      rate_date):
+    """
+    Months to the savings goal with compound interest, and the expenses,
+    salary and return that reach it by a deadline. Its controls rerun only
+    this panel; the solver is cheap enough not to need caching.
+    """
+    import numpy as np
+    import plotly.graph_objects as go
+
+    from core.goals import MAX_ANNUAL_RETURN, solve_goals
+
+    st.markdown("### 🎯 Goal Solver")
+    today = datetime.now().date()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        deadline = st.date_input("🗓️ Reach the Goal By:", value=today + timedelta(days=365),
+                                 min_value=today + timedelta(days=1))
+    with col2:
+        annual_return = st.number_input("📈 Annual Return (%):", min_value=0.0,
+                                        max_value=MAX_ANNUAL_RETURN * 100, value=5.0, step=0.5,
+                                        help="Compounded monthly") / 100
+    with col3:
+        balance = st.number_input("🏦 Current Savings:", min_value=0.0, step=100000.0, value=0.0)
+    with col4:
+        savings_growth = st.number_input("🚀 Savings Growth (%/year):", min_value=-50.0,
+                                         max_value=100.0, value=0.0, step=1.0,
+                                         help="Yearly rise in what you save, e.g. from raises") / 100
+    if savings_goal <= 0:
+        st.caption("Set a savings goal above to solve for it.")
+        return
+    months = (deadline - today).days / (365.25 / 12)
+    solved = solve_goals(salary, expenses, savings_goal, months, annual_return, balance,
+                         savings_growth, currency, tax_table)
+    value = {key: float(solved[key]) for key in
+             ("months_to_goal", "months_to_goal_simple", "max_expenses", "required_salary",
+              "required_return", "required_savings", "projected_balance")}
+    fx_rate, shown = 1.0, currency
+    if report_currency is not None and report_currency != currency:
+        fx_rate, shown = load_rate_table().rate(currency, report_currency, rate_date), report_currency
+
+    def money(amount):
+        return "Out of reach" if amount != amount else f"{amount * fx_rate:,.0f} {shown}"
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        reached = value["months_to_goal"]
+        simple = value["months_to_goal_simple"]
+        st.metric("⏱️ Months to Goal", f"{reached:.1f}" if reached != float('inf') else "∞",
+                  delta=f"{reached - simple:+.1f} vs. no interest or growth"
+                  if float('inf') not in (reached, simple) else None, delta_color="inverse")
+    with col2:
+        st.metric("🛒 Max Monthly Expenses", money(value["max_expenses"]),
+                  help="Highest expenses that still reach the goal by the deadline")
+    with col3:
+        st.metric("💼 Required Salary", money(value["required_salary"]),
+                  help="Gross salary reaching the goal by the deadline at today's expenses")
+    with col4:
+        needed = value["required_return"]
+        st.metric("📈 Required Return", "Out of reach" if needed != needed else f"{needed:.1%}",
+                  help="Annual return reaching the goal by the deadline at today's savings")
+    st.caption(f"By {deadline}: {money(value['projected_balance'])} at the current savings rate; "
+               f"the goal needs {money(value['required_savings'])} saved in the first month.")
+
+    # Required salary for every deadline up to 10 years, at a few returns, in one solve
+    horizons = np.arange(1, 121)
+    returns = sorted({0.0, 0.05, 0.10, annual_return})
+    grid = solve_goals(salary, expenses, savings_goal, horizons[None, :],
+                       np.array(returns)[:, None], balance, savings_growth, currency, tax_table)
+    fig = go.Figure([
+        go.Scatter(x=horizons, y=grid['required_salary'][i] * fx_rate, mode='lines',
+                   name=f'{rate:.1%} return', line=dict(width=3 if rate == annual_return else 1.5))
+        for i, rate in enumerate(returns)
+    ])
+    fig.add_hline(y=salary * fx_rate, line_dash='dash', line_color='#ff6b6b',
+                  annotation_text='Current Salary')
+    fig.update_layout(title='💼 Salary Needed to Reach the Goal, by Deadline',
+                      xaxis_title='Months to Deadline', yaxis_title=f'Monthly Salary ({shown})',
+                      height=400, template='plotly_white')
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def scenario_sweep_panel(salary, savings_goal, currency, tax_table):
+    """
+    Scenario sweep: the same calculator over a salary x expenses x goal x tax
+    table grid. Its controls rerun only this panel.
+    """
+    import numpy as np
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
+    from core.sweep import GOAL_HORIZON, SweepGrid, finalize_summary, iter_sweep
+    
+    tax_tables = load_tax_tables()
+    st.markdown("### 🧪 Scenario Sweep")
+    with st.expander("⚙️ Sweep Ranges"):
+        col_s, col_e, col_g = st.columns(3)
+        with col_s:
+            salary_from = st.number_input("Salary From:", min_value=0.0, step=50000.0,
+                                          value=salary / 2)
+            salary_to = st.number_input("Salary To:", min_value=0.0, step=50000.0,
+                                        value=salary * 4)
+            salary_steps = st.slider("Salary Steps:", 2, 500, 100)
+        with col_e:
+            expenses_from = st.number_input("Expenses From:", min_value=0.0, step=10000.0, value=0.0)
+            expenses_to = st.number_input("Expenses To:", min_value=0.0, step=10000.0,
+                                          value=salary * 2)
+            expense_steps = st.slider("Expense Steps:", 2, 500, 100)
+        with col_g:
+            goal_from = st.number_input("Goal From:", min_value=0.0, step=100000.0, value=0.0)
+            goal_to = st.number_input("Goal To:", min_value=0.0, step=100000.0,
+                                      value=max(savings_goal * 4, 100000.0))
+            goal_steps = st.slider("Goal Steps:", 1, 200, 20)
+        sweep_tables = st.multiselect("Tax Tables:", list(tax_tables),
+                                      default=[get_tax_table(tax_table, currency).key],
+                                      format_func=lambda key: tax_tables[key].name)
+    
+    scenarios = salary_steps * expense_steps * goal_steps * len(sweep_tables)
+    st.caption(f"{scenarios:,} scenarios ({salary_steps} salaries × {expense_steps} expense levels "
+               f"× {goal_steps} goals × {len(sweep_tables)} tax tables)")
+    if st.button("🧪 Run Sweep"):
+        if not sweep_tables:
+            st.warning("Choose at least one tax table to sweep.")
+        elif scenarios > MAX_SWEEP_SCENARIOS:
+            st.warning(f"Sweeps are limited to {MAX_SWEEP_SCENARIOS:,} scenarios; use fewer steps.")
+        else:
+            grid = SweepGrid(np.linspace(salary_from, salary_to, salary_steps),
+                             np.linspace(expenses_from, expenses_to, expense_steps),
+                             np.linspace(goal_from, goal_to, goal_steps), sweep_tables, currency)
+            progress = st.progress(0.0, text="Starting workers...")
+            heatmap = st.empty()
+    
+            def draw_heatmap(summary):
+                fig = px.imshow(summary['mean_score'], x=grid.expenses, y=grid.salaries,
+                                origin='lower', aspect='auto', zmin=0, zmax=100,
+                                color_continuous_scale='RdYlGn',
+                                labels={'x': f'Monthly Expenses ({currency})',
+                                        'y': f'Monthly Salary ({currency})', 'color': 'Health Score'},
+                                title='❤️ Mean Financial Health Score')
+                fig.update_layout(template='plotly_white', height=500)
+                heatmap.plotly_chart(fig, use_container_width=True)
+    
+            # Shards merge as they finish; redraw the partial heatmap at most every SWEEP_REFRESH
+            start = time.perf_counter()
+            last_draw = 0.0
+            for done, total, summary in iter_sweep(grid, get_sweep_pool()):
+                progress.progress(done / total, text=f"{done}/{total} shards, "
+                                                     f"{summary['scenarios']:,} scenarios")
+                if done == total or time.perf_counter() - last_draw >= SWEEP_REFRESH:
+                    draw_heatmap(finalize_summary(grid, summary))
+                    last_draw = time.perf_counter()
+            elapsed = time.perf_counter() - start
+            result = finalize_summary(grid, summary, elapsed)
+            progress.progress(1.0, text=f"{result['scenarios']:,} scenarios in {elapsed:.1f}s "
+                                        f"({result['scenarios'] / elapsed:,.0f}/s)")
+    
+            fig_be = go.Figure([
+                go.Scatter(x=grid.salaries, y=values, name=tax_tables[key].name, mode='lines')
+                for key, values in result['break_even_expense'].items()
+            ])
+            fig_be.update_layout(title='⚖️ Break-even Expenses by Salary',
+                                 xaxis_title=f'Monthly Salary ({currency})',
+                                 yaxis_title=f'Expenses with Zero Savings ({currency})',
+                                 template='plotly_white')
+            st.plotly_chart(fig_be, use_container_width=True)
+    
+            if goal_steps > 1:
+                fig_goal = px.imshow(result['goal_share'] * 100, x=grid.savings_goals, y=grid.salaries,
+                                     origin='lower', aspect='auto', zmin=0, zmax=100,
+                                     color_continuous_scale='Blues',
+                                     labels={'x': f'Savings Goal ({currency})',
+                                             'y': f'Monthly Salary ({currency})',
+                                             'color': 'Scenarios (%)'},
+                                     title=f'🎯 Share of Scenarios Reaching the Goal within {GOAL_HORIZON} Months')
+                fig_goal.update_layout(template='plotly_white', height=500)
+                st.plotly_chart(fig_goal, use_container_width=True)
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -320,6 +740,18 @@ st.markdown("""
         font-weight: 500;
     }
     
+    .group-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(220px, 1fr));
+        gap: 0 1rem;
+    }
+    
+    .group-card mark {
+        background: #fde68a;
+        padding: 0 0.15rem;
+        border-radius: 3px;
+    }
+    
     .group-card {
         background: linear-gradient(135deg, #fff5f5 0%, #fef2f2 100%);
         padding: 1rem;
@@ -452,14 +884,15 @@ if selected_tab == "ℹ️ About":
         st.markdown("""
         <div class="code-block">
 def generate_smart_todo(user_name, category, priority):
-    base_tasks = DAILY_TASKS.get(category)
+    catalog = get_task_catalog()  # reloaded in the background
     num_tasks = 5 if priority == "High" else 4
-    selected_tasks = random.sample(base_tasks, num_tasks)
+    # O(1) weighted draws from a per-(category, priority) alias table
+    selected_tasks = catalog.sample(category, priority, num_tasks, rng)
     
     enhanced_tasks = []
     for task in selected_tasks:
-        time_estimate = TIME_ESTIMATES[random_idx]
-        enhanced_task = f"{priority_emoji} {task} ({time_estimate})"
+        time_estimate = task.time_estimate(rng, multiplier)
+        enhanced_task = f"{priority_emoji} {task.name} ({time_estimate})"
         enhanced_tasks.append(enhanced_task)
     
     return enhanced_tasks, motivation
@@ -471,7 +904,7 @@ def generate_smart_todo(user_name, category, priority):
         st.markdown("""
         <div class="code-block">
 def advanced_financial_calc(salary, expenses, savings_goal):
-    tax = 0.10 * salary
+    tax = tax_table.tax(salary)  # progressive brackets
     net_salary = salary - tax
     savings = net_salary - expenses
     savings_rate = (savings / salary * 100)
@@ -571,19 +1004,29 @@ elif selected_tab == "✅ Smart To-Do":
     
     with col1:
         user_name = st.text_input("👤 Enter your name:", placeholder="e.g., Sarah")
-        category = st.selectbox("📂 Task Category:", list(DAILY_TASKS.keys()))
+        catalog_store = get_catalog_store()
+        category = st.selectbox("📂 Task Category:", catalog_store.current().categories)
         priority = st.selectbox("⚡ Priority Level:", ["High", "Medium", "Low"])
+        same_all_day = st.checkbox("📌 Keep the same list all day", value=True)
     
     with col2:
         st.markdown("### 🕐 Current Time")
         st.info(f"**{datetime.now().strftime('%A, %B %d, %Y')}**\n\n{datetime.now().strftime('%I:%M %p')}")
     
-    if st.button("🚀 Generate Smart To-Do", type="primary"):
+    clicked = st.button("🚀 Generate Smart To-Do", type="primary")
+    if clicked:
+        st.session_state["todo_requested"] = True
+    
+    # Daily lists are deterministic and cached, so once requested they stay
+    # on screen across reruns (e.g. changing the priority) at no cost
+    if clicked or (same_all_day and st.session_state.get("todo_requested")):
         if user_name:
-            with st.spinner('Generating your personalized tasks...'):
-                time.sleep(1)  # Simulate processing
-                
-            tasks, motivation = generate_smart_todo(user_name, category, priority)
+            if same_all_day:
+                tasks, motivation = generate_daily_todo(user_name, category, priority)
+            else:
+                tasks, motivation = generate_smart_todo(user_name, category, priority)
+            if clicked:
+                get_usage_store().record("todo", category=category, priority=priority)
             
             st.success(f"✨ Tasks generated for **{user_name}**!")
             
@@ -601,16 +1044,59 @@ elif selected_tab == "✅ Smart To-Do":
                 <p style="font-size: 1.2em; font-style: italic;">{motivation}</p>
             </div>
             """, unsafe_allow_html=True)
-            
-            # Progress tracking simulation
-            progress = st.progress(0)
-            for i in range(100):
-                progress.progress(i + 1)
-                time.sleep(0.01)
             st.success("Tasks loaded successfully! 🎉")
+            todo_result = {"user_name": user_name, "tasks": tasks, "motivation": motivation}
+            export_panel("todo_list", lambda target, fmt, compression: export_todo_lists(
+                [todo_result], target, fmt, compression), key="todo_export")
+            if same_all_day:
+                cache_stats = TODO_CACHE.stats()
+                st.caption(f"To-do cache: {cache_stats['hits']:,} hits, {cache_stats['misses']:,} misses, "
+                           f"{cache_stats['size']:,} lists stored")
+            st.caption(f"Task catalog: {len(catalog_store.current()):,} tasks")
+            if catalog_store.last_error:
+                st.warning(f"⚠️ The task catalog file could not be reloaded, still using the "
+                           f"previous version: {catalog_store.last_error}")
         else:
             st.warning("Please enter your name to generate personalized tasks.")
 
+    # --- Day Planner ---
+    st.markdown("---")
+    st.markdown("### 🗓️ Time-Boxed Day Plan")
+    st.caption("Packs tasks of the chosen category and priority into your free hours around "
+               "fixed meetings, highest-value tasks first.")
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        day_start = st.time_input("🌅 Day starts:", value=time_of_day(9, 0), step=900)
+    with col2:
+        day_end = st.time_input("🌇 Day ends:", value=time_of_day(17, 0), step=900)
+    with col3:
+        meetings = st.text_input("📅 Meetings:", placeholder="e.g., 10:00-11:00; 14:00-14:30")
+
+    if st.button("🧩 Plan My Day"):
+        # NumPy is only needed once a plan is requested
+        from core.planner import plan_day
+
+        if not user_name:
+            st.warning("Please enter your name to plan your day.")
+        else:
+            try:
+                schedule = plan_day(user_name, category, priority, day_start.strftime("%H:%M"),
+                                    day_end.strftime("%H:%M"), meetings, catalog=catalog_store.current())
+            except ValueError as exc:
+                st.error(f"❌ {exc}")
+            else:
+                planned = sum(entry["minutes"] for entry in schedule if entry["kind"] == "task")
+                st.success(f"✨ {sum(entry['kind'] == 'task' for entry in schedule)} tasks planned, "
+                           f"{format_minutes(planned)} of focused work")
+                for entry in schedule:
+                    label = (f"📅 {entry['task']}" if entry["kind"] == "meeting"
+                             else f"{PRIORITY_CONFIG[entry['priority']]['emoji']} {entry['task']}")
+                    st.markdown(f"""
+                    <div class="task-item">
+                        <strong>{entry['start']}–{entry['end']}</strong> {label}
+                    </div>
+                    """, unsafe_allow_html=True)
+
 elif selected_tab == "💰 Financial Hub":
     st.markdown("### 💼 Advanced Financial Calculator")
     
@@ -618,10 +1104,57 @@ elif selected_tab == "💰 Financial Hub":
     
     with col1:
         st.markdown("#### 💸 Income & Expenses")
-        salary = st.number_input("💰 Monthly Salary:", min_value=0.0, step=50000.0, value=1000000.0)
-        expenses = st.number_input("🛒 Monthly Expenses:", min_value=0.0, step=10000.0, value=600000.0)
+        # Keyed so a bank statement's averages can be copied in (see use_statement_averages)
+        st.session_state.setdefault("finance_salary", 1000000.0)
+        st.session_state.setdefault("finance_expenses", 600000.0)
+        salary = st.number_input("💰 Monthly Salary:", min_value=0.0, step=50000.0, key="finance_salary")
+        expenses = st.number_input("🛒 Monthly Expenses:", min_value=0.0, step=10000.0,
+                                   key="finance_expenses")
         savings_goal = st.number_input("🎯 Savings Goal:", min_value=0.0, step=100000.0, value=2000000.0)
         currency = st.selectbox("💱 Currency:", ["UGX", "USD", "EUR", "GBP"])
+        tax_tables = load_tax_tables()
+        tax_choice = st.selectbox("🧾 Tax Table:", ["Auto (by currency)"] + list(tax_tables),
+                                  format_func=lambda key: tax_tables[key].name if key in tax_tables else key)
+        tax_table = tax_choice if tax_choice in tax_tables else None
+        
+        rates = load_rate_table()
+        col_c, col_d = st.columns(2)
+        with col_c:
+            report_choice = st.selectbox("🌍 Report Currency:", ["Input currency"] + rates.currencies)
+            report_currency = None if report_choice == "Input currency" else report_choice
+        with col_d:
+            rate_date = st.date_input("📅 Exchange Rates As Of:", value=None,
+                                      min_value=rates.dates[0], help="Empty: the latest rates")
+        
+        with st.expander("🌍 Income & Expenses in Other Currencies"):
+            import pandas as pd
+            
+            lines = st.data_editor(
+                pd.DataFrame({"Type": pd.Series(dtype=str), "Amount": pd.Series(dtype=float),
+                              "Currency": pd.Series(dtype=str)}),
+                num_rows="dynamic", hide_index=True, use_container_width=True, key="finance_lines",
+                column_config={
+                    "Type": st.column_config.SelectboxColumn(options=["Income", "Expense"], required=True),
+                    "Amount": st.column_config.NumberColumn(min_value=0.0, required=True),
+                    "Currency": st.column_config.SelectboxColumn(options=rates.currencies, required=True),
+                })
+            # Monthly lines added to the salary or expenses above at the chosen date's rates
+            fx_lines = tuple((kind, float(amount), line_currency) for kind, amount, line_currency
+                             in lines.dropna().itertuples(index=False, name=None))
+        
+        with st.expander("🎲 Projection Settings"):
+            projection_model = st.radio("Projection Model:", ["Linear", "Monte Carlo"],
+                                        horizontal=True)
+            horizon = st.slider("🗓️ Horizon (months):", min_value=6, max_value=60, value=12)
+            if projection_model == "Monte Carlo":
+                col_p, col_q, col_r = st.columns(3)
+                with col_p:
+                    num_paths = st.select_slider("Simulated Paths:",
+                                                 [10000, 25000, 50000, 100000], value=10000)
+                with col_q:
+                    salary_volatility = st.slider("Salary Volatility (%):", 0, 50, 5) / 100
+                with col_r:
+                    expense_volatility = st.slider("Expense Volatility (%):", 0, 50, 10) / 100
     
     with col2:
         st.markdown("#### 📊 Financial Health Tips")
@@ -629,48 +1162,20 @@ elif selected_tab == "💰 Financial Hub":
         st.info("🎯 Emergency fund: 3-6 months expenses")
         st.info("📈 Invest surplus savings for growth")
     
-    if st.button("📈 Calculate & Analyze", type="primary"):
-        results = advanced_financial_calc(salary, expenses, savings_goal, currency)
-        
-        # Display results with metrics
-        st.markdown("### 📊 Financial Analysis Results")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("💰 Net Salary", f"{results['net_salary']:,.0f} {currency}")
-        with col2:
-            st.metric("🏦 Tax (10%)", f"{results['tax']:,.0f} {currency}")
-        with col3:
-            st.metric("💵 Monthly Savings", f"{results['savings']:,.0f} {currency}", 
-                     delta=f"{results['savings_rate']:.1f}%")
-        with col4:
-            st.metric("🎯 Months to Goal", 
-                     f"{results['months_to_goal']:.1f}" if results['months_to_goal'] != float('inf') else "∞")
-        
-        # Create visualizations
-        fig = go.Figure(data=[
-            go.Bar(name='Tax', x=['Breakdown'], y=[results['tax']], marker_color='#ff6b6b'),
-            go.Bar(name='Expenses', x=['Breakdown'], y=[expenses], marker_color='#4ecdc4'),
-            go.Bar(name='Savings', x=['Breakdown'], y=[results['savings']], marker_color='#45b7d1')
-        ])
-        fig.update_layout(
-            title='💰 Monthly Financial Breakdown',
-            barmode='stack',
-            height=400,
-            template='plotly_white'
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Savings projection
-        months = list(range(1, 13))
-        projected = [results['savings'] * m for m in months]
-        
-        fig2 = px.line(x=months, y=projected, title='📈 12-Month Savings Projection',
-                       labels={'x': 'Month', 'y': f'Cumulative Savings ({currency})'})
-        fig2.update_traces(line_color='#667eea', line_width=3)
-        fig2.update_layout(template='plotly_white')
-        st.plotly_chart(fig2, use_container_width=True)
+    bank_statement_section(savings_goal, currency, tax_table, report_currency)
+    
+    if projection_model == "Monte Carlo":
+        projection = (projection_model, horizon, num_paths, salary_volatility, expense_volatility)
+    else:
+        projection = (projection_model, horizon, None, None, None)
+    financial_results_panel((salary, expenses, savings_goal, currency, tax_table, fx_lines,
+                             report_currency, rate_date), projection)
+    
+    st.markdown("---")
+    goal_solver_panel(salary, expenses, savings_goal, currency, tax_table, report_currency, rate_date)
+    
+    st.markdown("---")
+    scenario_sweep_panel(salary, savings_goal, currency, tax_table)
 
 elif selected_tab == "👥 Group Generator":
     st.markdown("### 🔀 Smart Group Generator")
@@ -683,86 +1188,205 @@ elif selected_tab == "👥 Group Generator":
             placeholder="John, Sarah, Mike, Emma, David, Lisa, Tom, Anna",
             height=100
         )
+        roster_file = st.file_uploader("📁 ...or upload a roster (CSV/TXT, names one per line or comma separated):",
+                                       type=["csv", "txt"])
         
         col_a, col_b = st.columns(2)
         with col_a:
             group_size = st.slider("👫 Group Size:", min_value=2, max_value=8, value=3)
         with col_b:
             shuffle_mode = st.selectbox("🔄 Grouping Method:", 
-                                       ["Random", "Alphabetical", "Reverse"])
+                                       ["Random", "Alphabetical", "Reverse", "Balanced"])
+        
+        if shuffle_mode == "Balanced":
+            st.caption("Balanced mode reads a CSV roster with a header row: a name column "
+                       "plus attribute columns such as skill score, department or gender.")
+            from core.balance import balanced_group_partition, split_attribute_columns
+            
+            numeric_cols, categorical_cols = [], []
+            if roster_file is not None:
+                _, roster_columns = load_attribute_roster(roster_file.getvalue())
+                numeric_cols, categorical_cols = split_attribute_columns(roster_columns)
+            col_c, col_d = st.columns(2)
+            with col_c:
+                balance_numeric = st.multiselect("📏 Balance averages of:", numeric_cols,
+                                                 default=numeric_cols)
+                min_size = st.number_input("⬇️ Min Group Size:", min_value=1, value=max(1, group_size - 1))
+            with col_d:
+                balance_categorical = st.multiselect("🧩 Balance the mix of:", categorical_cols,
+                                                     default=categorical_cols)
+                max_size = st.number_input("⬆️ Max Group Size:", min_value=1, value=group_size + 1)
+            keep_apart_input = st.text_area("🚫 Keep apart (one pair per line, e.g. John, Sarah):",
+                                            height=80)
+        flag_duplicates = st.checkbox("🔍 Flag near-duplicate names (accents, typos, word order)",
+                                      value=True)
+        merge_duplicates = st.checkbox("🧹 Keep only the first spelling of flagged names",
+                                       value=False, disabled=not flag_duplicates)
+        duplicate_threshold = st.slider("🎚️ Name similarity to flag:", min_value=0.5,
+                                        max_value=0.95, value=0.7, step=0.05,
+                                        disabled=not flag_duplicates)
     
     with col2:
-        if names_input:
+        if roster_file is not None:
+            st.metric("📁 Roster Size", f"{roster_file.size / 1024:,.0f} KB")
+        elif names_input:
             name_count = len([n.strip() for n in names_input.split(",") if n.strip()])
             st.metric("👥 Total Students", name_count)
             st.metric("🔢 Expected Groups", f"{(name_count + group_size - 1) // group_size}")
     
     if st.button("🎲 Generate Smart Groups", type="primary"):
-        if names_input:
-            with st.spinner('Creating optimal groups...'):
-                time.sleep(1)
+        if roster_file is not None or names_input:
+            if shuffle_mode == "Balanced":
+                if roster_file is not None:
+                    names, roster_columns = load_attribute_roster(roster_file.getvalue())
+                else:
+                    names, roster_columns = dedupe_names(
+                        n.strip() for n in names_input.split(",") if n.strip()), {}
+                if flag_duplicates:
+                    # Merged spellings take their attribute values with them
+                    kept = review_near_duplicates(names, merge_duplicates, duplicate_threshold)
+                    if len(kept) < len(names):
+                        position = {name: i for i, name in enumerate(names)}
+                        rows = [position[name] for name in kept]
+                        roster_columns = {column: [values[i] for i in rows]
+                                          for column, values in roster_columns.items()}
+                        names = kept
+                keep_apart = [tuple(part.strip() for part in line.split(",", 1))
+                              for line in keep_apart_input.splitlines() if line.count(",") == 1]
+                try:
+                    balanced = balanced_group_partition(
+                        names,
+                        numeric={c: roster_columns[c] for c in balance_numeric},
+                        categorical={c: roster_columns[c] for c in balance_categorical},
+                        group_size=group_size, min_size=int(min_size), max_size=int(max_size),
+                        keep_apart=keep_apart,
+                    )
+                except ValueError as exc:
+                    st.error(f"⚠️ {exc}")
+                    st.stop()
+                name_count = len(names)
+                total_groups = balanced.num_groups
+                groups = balanced
                 
-            groups = smart_group_generator(names_input, group_size, shuffle_mode)
-            
-            st.success(f"✨ Generated {len(groups)} groups using {shuffle_mode} method!")
-            
-            # Display groups with enhanced styling
-            cols = st.columns(min(3, len(groups)))
-            for i, group in enumerate(groups):
-                with cols[i % 3]:
-                    st.markdown(f"""
-                    <div class="group-card">
-                        <h4>👥 Group {i+1}</h4>
-                        <ul>
-                    """ + ''.join([f"<li><strong>{member}</strong></li>" for member in group]) + """
-                        </ul>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # Group statistics
-            st.markdown("### 📊 Group Statistics")
-            col1, col2, col3 = st.columns(3)
+                col_e, col_f, col_g = st.columns(3)
+                with col_e:
+                    st.metric("⚖️ Balance Objective", f"{balanced.objective['total']:,.2f}",
+                              delta=f"{balanced.objective['total'] - balanced.initial_objective['total']:,.2f}",
+                              delta_color="inverse")
+                with col_f:
+                    st.metric("🚫 Keep-Apart Conflicts", balanced.objective['conflicts'])
+                with col_g:
+                    st.metric("⏱️ Solve Time", f"{balanced.solve_time:.2f} s")
+            elif roster_file is not None:
+                # Uploaded rosters are streamed in chunks into a compact assignment
+                from core.roster import iter_roster_names, stream_group_assignment
+                
+                roster_file.seek(0)
+                roster_source = roster_file
+                if flag_duplicates:
+                    roster_source = review_near_duplicates(dedupe_names(iter_roster_names(roster_file)),
+                                                           merge_duplicates, duplicate_threshold)
+                assignment = stream_group_assignment(roster_source, group_size, shuffle_mode)
+                name_count = len(assignment)
+                total_groups = assignment.num_groups
+                groups = assignment
+            else:
+                # Only large rosters get a progress bar, driven by names actually grouped
+                progress_callback = None
+                if name_count > PROGRESS_CHUNK:
+                    progress = st.progress(0.0, text="Creating optimal groups...")
+                    
+                    def progress_callback(done, total):
+                        progress.progress(done / total, text=f"Grouped {done:,} of {total:,} names...")
+                
+                grouped_names = names_input
+                if flag_duplicates:
+                    grouped_names = ", ".join(review_near_duplicates(
+                        dedupe_names(n.strip() for n in names_input.split(",") if n.strip()),
+                        merge_duplicates, duplicate_threshold))
+                groups = smart_group_generator(grouped_names, group_size, shuffle_mode,
+                                               progress_callback=progress_callback)
+                name_count = sum(len(g) for g in groups)
+                total_groups = len(groups)
+            get_usage_store().record("groups", names=name_count, group_size=group_size,
+                                     shuffle_mode=shuffle_mode)
             
-            with col1:
-                st.metric("🏆 Total Groups", len(groups))
-            with col2:
-                avg_size = sum(len(g) for g in groups) / len(groups) if groups else 0
-                st.metric("👥 Avg Group Size", f"{avg_size:.1f}")
-            with col3:
-                st.metric("🔄 Method Used", shuffle_mode)
+            st.success(f"✨ Generated {total_groups:,} groups using {shuffle_mode} method!")
+            # Kept for the results panel, which pages through it across reruns
+            st.session_state["group_result"] = {"groups": groups, "total_groups": total_groups,
+                                                "name_count": name_count,
+                                                "shuffle_mode": shuffle_mode}
+            st.session_state["groups_page"] = 1
+            st.session_state["groups_search"] = ""
         else:
             st.warning("Please enter student names to generate groups.")
+    
+    if "group_result" in st.session_state:
+        group_results_panel()
 
 elif selected_tab == "📊 Analytics":
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    
+    from core.downsample import MAX_CHART_POINTS, lttb_indices
+    
     st.markdown("### 📈 Usage Analytics Dashboard")
     
-    # Simulated analytics data
-    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
-    usage_data = pd.DataFrame({
-        'Date': dates,
-        'Todo_Generated': [random.randint(5, 50) for _ in dates],
-        'Financial_Calcs': [random.randint(2, 20) for _ in dates],
-        'Groups_Created': [random.randint(1, 15) for _ in dates]
-    })
+    col_a, col_b = st.columns(2)
+    with col_a:
+        time_range = st.selectbox("🗓️ Time Range:", list(TIME_RANGES), index=1)
+    with col_b:
+        resolution_choice = st.selectbox("🔍 Resolution:", ["Auto", "Daily", "Weekly", "Monthly"])
+    
+    # Read the rollup matching the range, so the query and the chart stay small
+    store = get_usage_store()
+    today = datetime.now().date()
+    range_days = TIME_RANGES[time_range]
+    if range_days is None:
+        first_day = store.first_day() or today
+        range_days = (today - first_day).days + 1
+    start = today - timedelta(days=range_days - 1)
+    if resolution_choice == "Auto":
+        resolution = "day" if range_days <= 120 else "week" if range_days <= 730 else "month"
+    else:
+        resolution = {"Daily": "day", "Weekly": "week", "Monthly": "month"}[resolution_choice]
+    series = store.rollup_series(resolution, start, today)
+    
+    # Dense series are downsampled with LTTB before they reach the browser
+    x_days = np.array(series['bucket'], dtype='datetime64[D]')
+    chart_frames = []
+    for feature, label in [('todo', 'Todo_Generated'), ('finance', 'Financial_Calcs'),
+                           ('groups', 'Groups_Created')]:
+        index = lttb_indices(x_days.astype(np.int64), series[feature], MAX_CHART_POINTS)
+        chart_frames.append(pd.DataFrame({'Date': x_days[index],
+                                          'Count': np.asarray(series[feature])[index],
+                                          'Feature': label}))
+    usage_data = pd.concat(chart_frames, ignore_index=True)
+    totals = store.totals()
     
     # Feature usage chart
-    fig = px.line(usage_data.tail(30), x='Date', 
-                  y=['Todo_Generated', 'Financial_Calcs', 'Groups_Created'],
-                  title='📊 Daily Feature Usage (Last 30 Days)')
+    fig = px.line(usage_data, x='Date', y='Count', color='Feature',
+                  title=f'📊 {RESOLUTION_LABELS[resolution]} Feature Usage ({time_range})')
     fig.update_layout(template='plotly_white', height=400)
     st.plotly_chart(fig, use_container_width=True)
+    if len(x_days) > MAX_CHART_POINTS:
+        st.caption(f"Showing {MAX_CHART_POINTS:,} of {len(x_days):,} points per series (LTTB downsampled).")
     
-    # Summary metrics
+    # Summary metrics (delta = today's count)
+    daily = store.daily_series(days=30)
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📝 Total To-Dos", "1,247", delta="23")
+        st.metric("📝 Total To-Dos", f"{totals['todo']:,}", delta=daily['todo'][-1])
     with col2:
-        st.metric("💰 Calculations", "892", delta="15")
+        st.metric("💰 Calculations", f"{totals['finance']:,}", delta=daily['finance'][-1])
     with col3:
-        st.metric("👥 Groups Made", "456", delta="8")
+        st.metric("👥 Groups Made", f"{totals['groups']:,}", delta=daily['groups'][-1])
     with col4:
-        st.metric("⭐ User Rating", "4.9/5", delta="0.1")
+        active_days = sum(1 for counts in zip(daily['todo'], daily['finance'], daily['groups'])
+                          if any(counts))
+        st.metric("📅 Active Days (30d)", active_days)
 
 # --- Footer ---
 st.markdown("---")
@@ -0,0 +1,8 @@
+"""
+Benchmark suite for the Personal Automation Hub.
+
+Times the core functions across input sizes and a full script rerun of
+every sidebar tab (Streamlit's headless AppTest), records wall time, peak
+memory and allocated blocks, and compares runs against a JSON baseline.
+Run ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,174 @@
+"""
+Latency benchmark client for the hub's JSON API (core.api).
+
+Opens C keep-alive connections and sends requests back to back for a
+fixed time, then reports throughput and p50/p95/p99 latency per endpoint
+mix. Starts ``python -m core.api`` itself unless --url is given.
+
+    python -m benchmarks.api --concurrency 1 16 64 --duration 10
+    python -m benchmarks.api --url http://127.0.0.1:8600 --mix finance-batch --batch-size 100000
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .load import _free_port, _percentile
+
+CATEGORIES = ["Work", "Study", "Personal", "Creative"]
+PRIORITIES = ["High", "Medium", "Low"]
+
+
+# --- Request mixes: each returns (path, payload) ---
+def _todo(rng: random.Random, batch_size: int) -> Tuple[str, Dict[str, Any]]:
+    return "/todo", {"user_name": f"User {rng.randrange(10 ** 6)}",
+                     "category": rng.choice(CATEGORIES), "priority": rng.choice(PRIORITIES)}
+
+def _finance(rng: random.Random, batch_size: int) -> Tuple[str, Dict[str, Any]]:
+    return "/finance", {"salary": rng.uniform(0, 5e6), "expenses": rng.uniform(0, 3e6),
+                        "savings_goal": rng.uniform(0, 1e7)}
+
+def _finance_records(rng: random.Random, batch_size: int) -> Tuple[str, Dict[str, Any]]:
+    return "/finance", {"records": [_finance(rng, 1)[1] for _ in range(batch_size)]}
+
+def _finance_batch(rng: random.Random, batch_size: int) -> Tuple[str, Dict[str, Any]]:
+    return "/finance/batch", {"salary": [rng.uniform(0, 5e6) for _ in range(batch_size)],
+                              "expenses": [rng.uniform(0, 3e6) for _ in range(batch_size)]}
+
+def _groups(rng: random.Random, batch_size: int) -> Tuple[str, Dict[str, Any]]:
+    return "/groups", {"names": [f"Student {i}" for i in range(batch_size)],
+                       "group_size": rng.randint(2, 8)}
+
+MIXES: Dict[str, List[Callable[[random.Random, int], Tuple[str, Dict[str, Any]]]]] = {
+    "small": [_todo, _finance, _groups],
+    "todo": [_todo],
+    "finance": [_finance],
+    "finance-records": [_finance_records],
+    "finance-batch": [_finance_batch],
+    "groups": [_groups],
+}
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str,
+                   path: str, body: bytes) -> int:
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _client(host: str, port: int, mix: str, batch_size: int, deadline: float, seed: int,
+                  latencies: List[float], statuses: Dict[int, int]) -> None:
+    rng = random.Random(seed)
+    # Payloads are prepared up front so JSON encoding is not part of the latency
+    bodies = [(path, json.dumps(payload).encode("utf-8"))
+              for path, payload in (rng.choice(MIXES[mix])(rng, batch_size) for _ in range(16))]
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.monotonic() < deadline:
+            path, body = rng.choice(bodies)
+            start = time.perf_counter()
+            status = await _request(reader, writer, host, path, body)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run_level(host: str, port: int, concurrency: int, duration: float, mix: str,
+                    batch_size: int, seed: int = 0) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    start = time.monotonic()
+    await asyncio.gather(*(_client(host, port, mix, batch_size, start + duration, seed + i,
+                                   latencies, statuses) for i in range(concurrency)))
+    elapsed = time.monotonic() - start
+    latencies.sort()
+    return {"concurrency": concurrency, "requests": len(latencies), "elapsed": elapsed,
+            "throughput": len(latencies) / elapsed, "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95), "p99": _percentile(latencies, 99),
+            "statuses": statuses}
+
+def start_server(port: int, workers: Optional[int]) -> subprocess.Popen:
+    command = [sys.executable, "-m", "core.api", "--port", str(port)]
+    if workers:
+        command += ["--workers", str(workers)]
+    server = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("API server exited during startup")
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("API server did not start within 30s")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api",
+                                     description="Benchmark the hub's JSON API.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32],
+                        help="concurrent keep-alive connections per level")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="small")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="records or names per request for batch mixes")
+    parser.add_argument("--url", help="base URL of a running server (default: start one)")
+    parser.add_argument("--workers", type=int, default=None, help="workers for the started server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    else:
+        host, port = "127.0.0.1", _free_port()
+        server = start_server(port, args.workers)
+
+    results = []
+    try:
+        print(f"{'conns':>6} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8}  statuses", file=sys.stderr)
+        for concurrency in args.concurrency:
+            level = asyncio.run(run_level(host, port, concurrency, args.duration, args.mix,
+                                          args.batch_size, args.seed))
+            results.append(level)
+            print(f"{concurrency:>6} {level['requests']:>9} {level['throughput']:>9.1f} "
+                  f"{level['p50'] * 1000:>8.2f} {level['p95'] * 1000:>8.2f} "
+                  f"{level['p99'] * 1000:>8.2f}  {level['statuses']}", file=sys.stderr)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {"host": host, "port": port, "mix": args.mix, "batch_size": args.batch_size,
+              "levels": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0 if all(set(level["statuses"]) <= {200} for level in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+Concurrent-session load test for the Streamlit app.
+
+Starts ``streamlit run app.py`` headless (or targets a running server with
+--url) and drives N simulated browser sessions over Streamlit's websocket
+protocol: each session sends rerun requests with widget states, exactly as
+the frontend does, and waits for the script_finished message. Sessions
+walk realistic click paths (tab switches, Generate Smart To-Do, Calculate
+& Analyze, typing a roster and Generate Smart Groups) for a fixed time per
+concurrency level. For every level the harness reports throughput,
+p50/p95/p99 rerun latency, script errors and the server's RSS.
+
+    python -m benchmarks.load --sessions 1 5 10 25 50 --duration 20
+    python -m benchmarks.load --url ws://127.0.0.1:8501 --sessions 10
+
+Requires the ``websockets`` package (installed with recent Streamlit).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from .suite import APP_PATH, TABS
+
+STREAM_PATH = "/_stcore/stream"
+
+# Script finished statuses counted as a completed rerun (successful, fragment)
+_FINISHED_OK = (0, 3)
+
+ROSTER_NAMES = ["John", "Sarah", "Mike", "Emma", "David", "Lisa", "Tom", "Anna", "Grace",
+                "Peter", "Ruth", "Samuel", "Joy", "Brian", "Esther", "Henry"]
+
+
+class Session:
+    """
+    One simulated browser tab: keeps widget ids and values like the frontend
+    """
+    def __init__(self, ws, latencies: List[float], rng: random.Random):
+        from streamlit.proto.Selectbox_pb2 import Selectbox
+
+        self.ws = ws
+        self.latencies = latencies
+        self.rng = rng
+        self.errors = 0
+        self.widgets: Dict[str, Any] = {}  # label -> widget proto from the last run
+        self.states: Dict[str, Any] = {}   # widget id -> WidgetState sent on every rerun
+        # Selectboxes send the option text since Streamlit 1.4x, an index before
+        self._selectbox_by_value = "raw_value" in Selectbox.DESCRIPTOR.fields_by_name
+
+    async def rerun(self, trigger: Optional[str] = None) -> None:
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        for state in self.states.values():
+            msg.rerun_script.widget_states.widgets.add().CopyFrom(state)
+        if trigger is not None:
+            button = msg.rerun_script.widget_states.widgets.add()
+            button.id = self.widgets[trigger].id
+            button.trigger_value = True
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        self.widgets = {}
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    self.errors += 1
+                widget = getattr(element, element_type)
+                if hasattr(widget, "id") and hasattr(widget, "label"):
+                    self.widgets[widget.label] = widget
+            elif kind == "script_finished":
+                if forward.script_finished not in _FINISHED_OK:
+                    self.errors += 1
+                break
+        self.latencies.append(time.perf_counter() - start)
+
+    def _set(self, label: str, value: Any) -> None:
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget = self.widgets[label]
+        state = WidgetState(id=widget.id)
+        if hasattr(widget, "options"):
+            if self._selectbox_by_value:
+                state.string_value = value
+            else:
+                state.int_value = list(widget.options).index(value)
+        else:
+            state.string_value = value
+        self.states[widget.id] = state
+
+    async def select_tab(self, tab: str) -> None:
+        self._set("Choose Feature:", tab)
+        await self.rerun()
+
+    # --- Click paths ---
+    async def todo_path(self) -> None:
+        await self.select_tab("✅ Smart To-Do")
+        self._set("👤 Enter your name:", f"User {self.rng.randrange(1000)}")
+        await self.rerun()
+        await self.rerun(trigger="🚀 Generate Smart To-Do")
+
+    async def finance_path(self) -> None:
+        await self.select_tab("💰 Financial Hub")
+        await self.rerun(trigger="📈 Calculate & Analyze")
+
+    async def groups_path(self) -> None:
+        await self.select_tab("👥 Group Generator")
+        names = self.rng.sample(ROSTER_NAMES, self.rng.randint(6, len(ROSTER_NAMES)))
+        # Typing: the text area commits a few times while the roster grows
+        for end in range(4, len(names) + 1, 4):
+            self._set("👥 Enter student names (comma separated):", ", ".join(names[:end]))
+            await self.rerun()
+        await self.rerun(trigger="🎲 Generate Smart Groups")
+
+    async def browse_path(self) -> None:
+        await self.select_tab(self.rng.choice(TABS))
+
+
+PATHS = ("todo_path", "finance_path", "groups_path", "browse_path")
+
+async def _run_session(url: str, deadline: float, think_time: float, seed: int,
+                       latencies: List[float]) -> int:
+    import websockets
+
+    rng = random.Random(seed)
+    async with websockets.connect(url + STREAM_PATH, max_size=None) as ws:
+        session = Session(ws, latencies, rng)
+        await session.rerun()  # initial page load
+        while time.monotonic() < deadline:
+            await getattr(session, rng.choice(PATHS))()
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+    return session.errors
+
+
+# --- Server ---
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(port: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    # Keep load test events out of the real analytics database
+    env.setdefault("HUB_USAGE_DB", os.path.join(tempfile.mkdtemp(), "usage.sqlite3"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("streamlit server exited during startup")
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit server did not start within 60s")
+
+def rss_bytes(pid: Optional[int]) -> Optional[int]:
+    """
+    Resident set size of a process (Linux /proc, or psutil when installed)
+    """
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(pid).memory_info().rss
+
+
+# --- Levels ---
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+async def run_level(url: str, sessions: int, duration: float, think_time: float,
+                    server_pid: Optional[int], seed: int = 0) -> Dict[str, Any]:
+    latencies: List[float] = []
+    peak_rss = rss_bytes(server_pid)
+    start = time.monotonic()
+    tasks = [asyncio.create_task(_run_session(url, start + duration, think_time, seed + i,
+                                              latencies))
+             for i in range(sessions)]
+    pending = set(tasks)
+    while pending:
+        _, pending = await asyncio.wait(pending, timeout=0.5)
+        rss = rss_bytes(server_pid)
+        if rss is not None:
+            peak_rss = max(peak_rss or 0, rss)
+    elapsed = time.monotonic() - start
+
+    errors = 0
+    failed_sessions = 0
+    for task in tasks:
+        if task.exception() is not None:
+            failed_sessions += 1
+        else:
+            errors += task.result()
+    latencies.sort()
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+        "script_errors": errors,
+        "failed_sessions": failed_sessions,
+        "rss_end": rss_bytes(server_pid),
+        "rss_peak": peak_rss,
+    }
+
+def _format_mib(value: Optional[int]) -> str:
+    return f"{value / 2 ** 20:.0f}" if value is not None else "n/a"
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load",
+                                     description="Drive concurrent sessions against the app.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25],
+                        help="concurrency levels to run, in order")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per level")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean pause between click paths per session, in seconds")
+    parser.add_argument("--url", help="websocket base URL of a running server "
+                                      "(default: start one; RSS is only reported then)")
+    parser.add_argument("--port", type=int, default=None, help="port for the started server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        print("the load test needs the websockets package: pip install websockets", file=sys.stderr)
+        return 2
+
+    server = None
+    url = args.url
+    if url is None:
+        port = args.port or _free_port()
+        server = start_server(port)
+        url = f"ws://127.0.0.1:{port}"
+    server_pid = server.pid if server is not None else None
+
+    results = []
+    try:
+        print(f"{'sessions':>8} {'reruns':>8} {'rerun/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'errors':>7} {'RSS MiB':>8} {'peak':>6}", file=sys.stderr)
+        for sessions in args.sessions:
+            level = asyncio.run(run_level(url, sessions, args.duration, args.think_time,
+                                          server_pid, args.seed))
+            results.append(level)
+            print(f"{level['sessions']:>8} {level['reruns']:>8} {level['throughput']:>8.1f} "
+                  f"{level['p50'] * 1000:>8.0f} {level['p95'] * 1000:>8.0f} "
+                  f"{level['p99'] * 1000:>8.0f} "
+                  f"{level['script_errors'] + level['failed_sessions']:>7} "
+                  f"{_format_mib(level['rss_end']):>8} {_format_mib(level['rss_peak']):>6}",
+                  file=sys.stderr)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {"url": url, "duration": args.duration, "think_time": args.think_time,
+              "levels": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 1 if any(level["failed_sessions"] for level in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Cold-start profile of the Streamlit app, per tab.
+
+For every tab a fresh Python process loads Streamlit (not counted), then
+renders the app once and switches to the tab, the way a new session's
+first load does. The timing runs use ``python -X importtime`` to attribute
+import time to each top-level module; a separate run under tracemalloc
+(which slows imports down) reports the memory each top-level module still
+holds afterwards. Results go through the same baseline comparison as the
+benchmark suite, so a tab that starts importing something heavy shows up
+as a regression:
+
+    python -m benchmarks.startup --save-baseline benchmarks/startup_baseline.json
+    python -m benchmarks.startup --baseline benchmarks/startup_baseline.json
+    python -m benchmarks.startup --tab "ℹ️ About" --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from .suite import APP_PATH, TABS, compare
+
+# Modules whose presence after a tab's first render is reported by name
+HEAVY_MODULES = ("numpy", "pandas", "plotly", "pyarrow")
+
+_MARKER = "--- app start ---"
+
+# Runs in the profiled process: argv = app path, tab, first tab, trace memory (0/1)
+_CHILD = r"""
+import json, os, resource, sys, time, tracemalloc
+from streamlit.testing.v1 import AppTest
+
+app_path, tab, first_tab, trace = sys.argv[1:5]
+# Load Streamlit's script runner with a trivial script so only the app is measured
+AppTest.from_string("import streamlit as st\nst.write('')").run()
+before = set(sys.modules)
+print(%(marker)r, file=sys.stderr, flush=True)
+
+if trace == "1":
+    tracemalloc.start(32)
+start = time.perf_counter()
+app = AppTest.from_file(app_path, default_timeout=120).run()
+if tab != first_tab:
+    app.sidebar.selectbox[0].select(tab).run()
+wall = time.perf_counter() - start
+
+report = {
+    "wall": wall,
+    "errors": [exc.message for exc in app.exception],
+    "new_modules": sorted(set(sys.modules) - before),
+    "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+}
+if trace == "1":
+    report["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    roots = sorted({os.path.abspath(path or os.curdir) for path in sys.path}, key=len, reverse=True)
+    owners = {}
+    retained = {}
+    for stat in tracemalloc.take_snapshot().statistics("traceback"):
+        # Charge import machinery allocations to the closest module frame
+        filename = next((frame.filename for frame in reversed(stat.traceback)
+                         if not frame.filename.startswith("<")), "<frozen>")
+        if filename not in owners:
+            owners[filename] = "<other>"
+            for root in roots:
+                if filename.startswith(root + os.sep):
+                    owner = os.path.relpath(filename, root).split(os.sep)[0]
+                    owners[filename] = owner[:-3] if owner.endswith(".py") else owner
+                    break
+        retained[owners[filename]] = retained.get(owners[filename], 0) + stat.size
+    report["retained_bytes"] = retained
+print(json.dumps(report))
+""" % {"marker": _MARKER}
+
+
+def _run_child(tab: str, trace: bool) -> Tuple[Dict[str, Any], str]:
+    env = dict(os.environ)
+    env.setdefault("HUB_USAGE_DB", os.path.join(tempfile.mkdtemp(), "usage.sqlite3"))
+    command = [sys.executable]
+    if not trace:
+        command += ["-X", "importtime"]
+    command += ["-c", _CHILD, APP_PATH, tab, TABS[0], "1" if trace else "0"]
+    process = subprocess.run(command, capture_output=True, text=True, env=env,
+                             cwd=os.path.dirname(APP_PATH))
+    if process.returncode != 0:
+        raise RuntimeError(f"profiling {tab} failed:\n{process.stderr[-2000:]}")
+    return json.loads(process.stdout.strip().splitlines()[-1]), process.stderr
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """
+    Seconds of import time per top-level module after the start marker
+    (self time summed over the module and its submodules)
+    """
+    _, _, app_part = stderr.partition(_MARKER)
+    per_module: Dict[str, float] = {}
+    for line in app_part.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        root = name.strip().split(".")[0]
+        per_module[root] = per_module.get(root, 0.0) + int(self_us) / 1e6
+    return per_module
+
+def profile_tab(tab: str, repeats: int = 3) -> Dict[str, Any]:
+    """
+    Median cold-start wall and import time over repeats, plus one memory run
+    """
+    walls, import_times, runs = [], [], []
+    for _ in range(repeats):
+        report, stderr = _run_child(tab, trace=False)
+        if report["errors"]:
+            raise RuntimeError(f"{tab} raised: {report['errors'][0]}")
+        per_module = parse_importtime(stderr)
+        walls.append(report["wall"])
+        import_times.append(sum(per_module.values()))
+        runs.append(per_module)
+    memory, _ = _run_child(tab, trace=True)
+
+    modules = sorted(set().union(*runs, memory["retained_bytes"]))
+    return {
+        "repeats": repeats,
+        "wall_median": statistics.median(walls),
+        "import_median": statistics.median(import_times),
+        "peak_bytes": memory["peak_bytes"],
+        "max_rss": report["max_rss"],
+        "heavy_modules": [name for name in HEAVY_MODULES
+                          if name in {module.split(".")[0] for module in report["new_modules"]}],
+        "modules": {name: {"import_seconds": statistics.median(run.get(name, 0.0) for run in runs),
+                           "retained_bytes": memory["retained_bytes"].get(name, 0)}
+                    for name in modules},
+    }
+
+def _print_tab(tab: str, stats: Dict[str, Any], top: int) -> None:
+    print(f"{tab:<22} {stats['wall_median'] * 1000:>8.0f} ms wall  "
+          f"{stats['import_median'] * 1000:>7.0f} ms imports  "
+          f"{stats['peak_bytes'] / 2 ** 20:>7.1f} MiB traced peak  "
+          f"heavy: {', '.join(stats['heavy_modules']) or '-'}", file=sys.stderr)
+    ranked = sorted(stats["modules"].items(), key=lambda item: -item[1]["import_seconds"])
+    for name, module in ranked[:top]:
+        print(f"    {name:<28} {module['import_seconds'] * 1000:>8.1f} ms  "
+              f"{module['retained_bytes'] / 2 ** 20:>7.2f} MiB", file=sys.stderr)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                     description="Profile the app's cold start per tab.")
+    parser.add_argument("--tab", action="append", choices=TABS,
+                        help="profile only this tab (repeatable; default: every tab)")
+    parser.add_argument("--repeats", type=int, default=3, help="timed cold starts per tab")
+    parser.add_argument("--top", type=int, default=8,
+                        help="modules listed per tab, by import time")
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative growth before a tab counts as a regression")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = {}
+    for tab in args.tab or TABS:
+        results[f"startup/{tab}"] = stats = profile_tab(tab, args.repeats)
+        _print_tab(tab, stats, args.top)
+    report = {"meta": {"python": sys.version.split()[0]}, "results": results}
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2, ensure_ascii=False)
+    if args.output is None and args.save_baseline is None:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as stream:
+            baseline = json.load(stream)
+        regressions = compare(report, baseline, args.threshold)
+        for name, stats in results.items():
+            base = baseline["results"].get(name)
+            added = set(stats["heavy_modules"]) - set(base["heavy_modules"]) if base else set()
+            if added:
+                regressions.append(f"{name}: now imports {', '.join(sorted(added))}")
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Benchmark cases, measurement and baseline comparison.
+
+Each case is timed over several repeats (min and median wall time per run,
+looping fast cases so every sample lasts at least MIN_SAMPLE_TIME), then
+run once more under tracemalloc for its peak traced memory and once with
+sys.getallocatedblocks() for the number of memory blocks its result keeps
+alive. Results are written as JSON; given a baseline, any case whose
+median time or peak memory grew by more than the threshold is reported
+as a regression and the run exits with status 1.
+
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks --baseline benchmarks/baseline.json --threshold 0.25
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Input sizes per case; --quick drops the largest
+TODO_CALLS = (1, 100, 10000)
+FINANCE_CALLS = (1, 100, 10000)
+GROUP_NAMES = (10, 1000, 100000, 1000000)
+QUICK_LIMIT = 100000
+
+# Shortest timed sample in seconds; faster cases are run in a loop
+MIN_SAMPLE_TIME = 0.05
+
+# Sidebar tabs rerun through AppTest, as listed in app.py
+TABS = ["ℹ️ About", "🏠 Dashboard", "✅ Smart To-Do", "💰 Financial Hub", "👥 Group Generator",
+        "📊 Analytics"]
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# A case yields (name, repeats, prepare); prepare() returns the callable to time
+Case = Tuple[str, int, Callable[[], Callable[[], Any]]]
+
+
+# --- Cases ---
+def _todo_cases(sizes: Tuple[int, ...], repeats: int) -> Iterator[Case]:
+    from core import DAILY_TASKS, PRIORITY_CONFIG, generate_smart_todo
+
+    def prepare(calls: int) -> Callable[[], Any]:
+        rng = random.Random(calls)
+        inputs = [(f"user{i}", rng.choice(list(DAILY_TASKS)), rng.choice(list(PRIORITY_CONFIG)))
+                  for i in range(calls)]
+        return lambda: [generate_smart_todo(*args) for args in inputs]
+
+    for calls in sizes:
+        yield f"generate_smart_todo/{calls}", repeats, lambda calls=calls: prepare(calls)
+
+def _finance_cases(sizes: Tuple[int, ...], repeats: int) -> Iterator[Case]:
+    from core import advanced_financial_calc, calculate_financial_health_score
+
+    def prepare_calc(calls: int) -> Callable[[], Any]:
+        rng = random.Random(calls)
+        inputs = [(rng.uniform(0, 5e6), rng.uniform(0, 3e6), rng.uniform(0, 1e7))
+                  for _ in range(calls)]
+        return lambda: [advanced_financial_calc(*args) for args in inputs]
+
+    def prepare_score(calls: int) -> Callable[[], Any]:
+        rng = random.Random(calls)
+        inputs = [(rng.uniform(-50, 60), rng.uniform(0, 120), rng.uniform(-1, 10))
+                  for _ in range(calls)]
+        return lambda: [calculate_financial_health_score(*args) for args in inputs]
+
+    for calls in sizes:
+        yield f"advanced_financial_calc/{calls}", repeats, lambda calls=calls: prepare_calc(calls)
+    for calls in sizes:
+        yield (f"calculate_financial_health_score/{calls}", repeats,
+               lambda calls=calls: prepare_score(calls))
+
+def _group_cases(sizes: Tuple[int, ...], repeats: int) -> Iterator[Case]:
+    from core import smart_group_generator
+
+    def prepare(count: int, mode: str) -> Callable[[], Any]:
+        names = ", ".join(f"Student {i}" for i in range(count))
+        return lambda: smart_group_generator(names, 4, mode)
+
+    for count in sizes:
+        # The largest rosters take seconds per run, fewer repeats keep the suite usable
+        case_repeats = min(repeats, 3) if count >= 100000 else repeats
+        for mode in ("Random", "Alphabetical"):
+            yield (f"smart_group_generator[{mode}]/{count}", case_repeats,
+                   lambda count=count, mode=mode: prepare(count, mode))
+
+def _page_cases(repeats: int) -> Iterator[Case]:
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit is not installed, skipping page benchmarks", file=sys.stderr)
+        return
+
+    def prepare(tab: str) -> Callable[[], Any]:
+        app = AppTest.from_file(APP_PATH, default_timeout=120).run()
+        app.sidebar.selectbox[0].select(tab).run()
+        if app.exception:
+            raise RuntimeError(f"{tab} raised: {app.exception[0].message}")
+        return app.run
+
+    for tab in TABS:
+        yield f"page_rerun/{tab}", repeats, lambda tab=tab: prepare(tab)
+
+
+# --- Measurement ---
+def measure(prepare: Callable[[], Callable[[], Any]], repeats: int) -> Dict[str, Any]:
+    """
+    Wall time over repeats, peak traced memory and retained blocks of one run
+    """
+    run = prepare()
+    start = time.perf_counter()
+    run()  # warm-up: first-call imports and caches are not what we measure
+    elapsed = time.perf_counter() - start
+
+    # Like timeit: fast cases are looped so each sample is long enough to time reliably
+    number = 1
+    while elapsed * number < MIN_SAMPLE_TIME and number < 1 << 20:
+        number *= 2
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        times.append((time.perf_counter() - start) / number)
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    result = run()
+    alloc_blocks = sys.getallocatedblocks() - blocks_before
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {
+        "repeats": repeats,
+        "loops": number,
+        "wall_min": min(times),
+        "wall_median": statistics.median(times),
+        "peak_bytes": peak_bytes,
+        "alloc_blocks": alloc_blocks,
+    }
+
+def collect_cases(args: argparse.Namespace) -> List[Case]:
+    limit = QUICK_LIMIT if args.quick else None
+
+    def sized(sizes: Tuple[int, ...]) -> Tuple[int, ...]:
+        return tuple(size for size in sizes if limit is None or size <= limit)
+
+    cases: List[Case] = []
+    cases += _todo_cases(sized(TODO_CALLS), args.repeats)
+    cases += _finance_cases(sized(FINANCE_CALLS), args.repeats)
+    cases += _group_cases(sized(GROUP_NAMES), args.repeats)
+    if not args.no_pages:
+        cases += _page_cases(args.repeats)
+    if args.only:
+        cases = [case for case in cases if any(pattern in case[0] for pattern in args.only)]
+    return cases
+
+def run_suite(cases: List[Case]) -> Dict[str, Any]:
+    results = {}
+    for name, repeats, prepare in cases:
+        results[name] = stats = measure(prepare, repeats)
+        print(f"{name:<55} {stats['wall_median'] * 1000:>10.2f} ms  "
+              f"{stats['peak_bytes'] / 2 ** 20:>9.2f} MiB  {stats['alloc_blocks']:>10,} blocks",
+              file=sys.stderr)
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+# --- Baselines ---
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float) -> List[str]:
+    """
+    Regression messages for cases slower or heavier than baseline * (1 + threshold)
+    """
+    regressions = []
+    for name, stats in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in ("wall_median", "peak_bytes"):
+            if base[metric] > 0 and stats[metric] > base[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {base[metric]:.6g} -> {stats[metric]:.6g} "
+                                   f"(+{stats[metric] / base[metric] - 1:.0%})")
+    return regressions
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark the hub's core functions and pages.")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--quick", action="store_true",
+                        help=f"skip inputs larger than {QUICK_LIMIT:,}")
+    parser.add_argument("--no-pages", action="store_true", help="skip the AppTest page reruns")
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="run only cases whose name contains PATTERN (repeatable)")
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative growth before a case counts as a regression")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Keep page runs from writing usage events into the real analytics database
+    os.environ.setdefault("HUB_USAGE_DB", os.path.join(tempfile.mkdtemp(), "usage.sqlite3"))
+
+    results = run_suite(collect_cases(args))
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as stream:
+            json.dump(results, stream, indent=2, ensure_ascii=False)
+    if args.output is None and args.save_baseline is None:
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as stream:
+            regressions = compare(results, json.load(stream), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
@@ -0,0 +1,40 @@
+"""
+Headless core of the Personal Automation Hub.
+
+Importing this package only pulls in the standard library, so batch jobs
+can use the To-Do, financial and group logic without a Streamlit runtime.
+Run ``python -m core --help`` for the batch command line interface.
+"""
+from .data import DAILY_TASKS, MOTIVATIONAL_QUOTES, PRIORITY_CONFIG, TIME_ESTIMATES
+from .finance import advanced_financial_calc, calculate_financial_health_score
+from .fx import consolidate, convert, load_rate_table
+from .groups import (
+    PROGRESS_CHUNK,
+    dedupe_names,
+    find_groups,
+    group_page,
+    normalize_name,
+    smart_group_generator,
+)
+from .todo import TODO_CACHE, generate_daily_todo, generate_smart_todo
+
+__all__ = [
+    "DAILY_TASKS",
+    "MOTIVATIONAL_QUOTES",
+    "PROGRESS_CHUNK",
+    "PRIORITY_CONFIG",
+    "TIME_ESTIMATES",
+    "TODO_CACHE",
+    "advanced_financial_calc",
+    "calculate_financial_health_score",
+    "consolidate",
+    "convert",
+    "dedupe_names",
+    "find_groups",
+    "generate_daily_todo",
+    "generate_smart_todo",
+    "group_page",
+    "load_rate_table",
+    "normalize_name",
+    "smart_group_generator",
+]
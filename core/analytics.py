@@ -0,0 +1,288 @@
+"""
+Persistent usage event store for the Analytics tab.
+
+Events are appended to a local SQLite database in WAL mode by a background
+writer thread, so recording an event never blocks the caller. Each batch
+of events also bumps per-(day, feature) counters and weekly/monthly
+rollups in the same transaction, which lets the dashboard read small
+rollups at the resolution it needs instead of scanning the raw event log.
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Feature names recorded by the app handlers
+FEATURES = ("todo", "finance", "groups")
+
+# Rollup resolutions kept besides the daily counters
+RESOLUTIONS = ("day", "week", "month")
+
+DEFAULT_DB_PATH = os.environ.get(
+    "HUB_USAGE_DB", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "data", "usage.sqlite3"))
+
+# Writer batching: flush after this many events or this many seconds
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    details TEXT
+);
+CREATE TABLE IF NOT EXISTS daily_counts (
+    day TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, feature)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_counts (
+    resolution TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (resolution, bucket, feature)
+) WITHOUT ROWID;
+"""
+
+# Rebuild the weekly/monthly rollups from the daily counters, for databases
+# created before the rollups existed. Weeks start on Monday.
+_BACKFILL_ROLLUPS = """
+INSERT INTO rollup_counts (resolution, bucket, feature, count)
+SELECT 'week', date(day, 'weekday 0', '-6 days'), feature, SUM(count)
+FROM daily_counts GROUP BY 2, 3;
+INSERT INTO rollup_counts (resolution, bucket, feature, count)
+SELECT 'month', strftime('%Y-%m-01', day), feature, SUM(count)
+FROM daily_counts GROUP BY 2, 3;
+"""
+
+_STOP = object()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def bucket_start(day: date, resolution: str) -> date:
+    """
+    First day of the day/week (Monday)/month bucket containing day
+    """
+    if resolution == "day":
+        return day
+    if resolution == "week":
+        return day - timedelta(days=day.weekday())
+    if resolution == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+def _next_bucket(start: date, resolution: str) -> date:
+    if resolution == "day":
+        return start + timedelta(days=1)
+    if resolution == "week":
+        return start + timedelta(days=7)
+    return (start + timedelta(days=31)).replace(day=1)
+
+class UsageStore:
+    """
+    Append-only usage event log with incrementally maintained daily,
+    weekly and monthly counters
+    """
+    def __init__(self, path: str = DEFAULT_DB_PATH, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _connect(path) as conn:
+            conn.executescript(_SCHEMA)
+            if conn.execute("SELECT 1 FROM rollup_counts LIMIT 1").fetchone() is None:
+                conn.executescript(_BACKFILL_ROLLUPS)
+        conn.close()
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer = threading.Thread(target=self._run_writer, name="usage-store-writer",
+                                        daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # --- Writing ---
+    def record(self, feature: str, **details: Any) -> None:
+        """
+        Queue one usage event; returns immediately
+        """
+        if feature not in FEATURES:
+            raise ValueError(f"Unknown feature: {feature}")
+        now = datetime.now()
+        self._queue.put((now.timestamp(), now.date().isoformat(), feature,
+                         json.dumps(details) if details else None))
+
+    def flush(self) -> None:
+        """
+        Block until every event queued so far has been written
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _run_writer(self) -> None:
+        conn = _connect(self.path)
+        pending: List[Tuple[float, str, str, Optional[str]]] = []
+        waiters: List[threading.Event] = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                pending.append(item)
+
+            if stopping or waiters or len(pending) >= self.batch_size \
+                    or time.monotonic() >= deadline:
+                if pending:
+                    self._write_batch(conn, pending)
+                    pending = []
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                deadline = time.monotonic() + self.flush_interval
+        conn.close()
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection,
+                     events: List[Tuple[float, str, str, Optional[str]]]) -> None:
+        increments: Dict[Tuple[str, str], int] = {}
+        for _, day, feature, _ in events:
+            increments[(day, feature)] = increments.get((day, feature), 0) + 1
+        rollups: Dict[Tuple[str, str, str], int] = {}
+        for (day, feature), count in increments.items():
+            for resolution in ("week", "month"):
+                key = (resolution, bucket_start(date.fromisoformat(day), resolution).isoformat(),
+                       feature)
+                rollups[key] = rollups.get(key, 0) + count
+        with conn:
+            conn.executemany(
+                "INSERT INTO events (ts, day, feature, details) VALUES (?, ?, ?, ?)", events)
+            conn.executemany(
+                "INSERT INTO daily_counts (day, feature, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (day, feature) DO UPDATE SET count = count + excluded.count",
+                [(day, feature, count) for (day, feature), count in increments.items()])
+            conn.executemany(
+                "INSERT INTO rollup_counts (resolution, bucket, feature, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (resolution, bucket, feature) "
+                "DO UPDATE SET count = count + excluded.count",
+                [key + (count,) for key, count in rollups.items()])
+
+    # --- Reading ---
+    def daily_counts(self, since: Optional[date] = None) -> List[Tuple[str, str, int]]:
+        """
+        (day, feature, count) rows from the daily counters, oldest first
+        """
+        query = "SELECT day, feature, count FROM daily_counts"
+        params: Tuple[str, ...] = ()
+        if since is not None:
+            query += " WHERE day >= ?"
+            params = (since.isoformat(),)
+        conn = _connect(self.path)
+        try:
+            return conn.execute(query + " ORDER BY day", params).fetchall()
+        finally:
+            conn.close()
+
+    def totals(self) -> Dict[str, int]:
+        """
+        All-time event count per feature
+        """
+        conn = _connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT feature, SUM(count) FROM daily_counts GROUP BY feature").fetchall()
+        finally:
+            conn.close()
+        totals = {feature: 0 for feature in FEATURES}
+        totals.update({feature: int(count) for feature, count in rows})
+        return totals
+
+    def daily_series(self, days: int = 30,
+                     today: Optional[date] = None) -> Dict[str, List[int]]:
+        """
+        Per-feature counts for the last ``days`` days (zero-filled), plus a
+        'day' list of ISO dates
+        """
+        today = today or date.today()
+        start = today - timedelta(days=days - 1)
+        index = {(start + timedelta(days=i)).isoformat(): i for i in range(days)}
+        series: Dict[str, List[Any]] = {feature: [0] * days for feature in FEATURES}
+        series["day"] = list(index)
+        for day, feature, count in self.daily_counts(since=start):
+            if day in index and feature in series:
+                series[feature][index[day]] = count
+        return series
+
+    def first_day(self) -> Optional[date]:
+        """
+        Earliest day with any recorded event
+        """
+        conn = _connect(self.path)
+        try:
+            row = conn.execute("SELECT MIN(day) FROM daily_counts").fetchone()
+        finally:
+            conn.close()
+        return date.fromisoformat(row[0]) if row and row[0] else None
+
+    def rollup_series(self, resolution: str, start: date,
+                      end: Optional[date] = None) -> Dict[str, List[Any]]:
+        """
+        Per-feature counts per day/week/month bucket from start to end
+        (zero-filled), plus a 'bucket' list of ISO bucket start dates
+        """
+        end = end or date.today()
+        first = bucket_start(start, resolution)
+        buckets = []
+        current = first
+        while current <= end:
+            buckets.append(current.isoformat())
+            current = _next_bucket(current, resolution)
+        index = {bucket: i for i, bucket in enumerate(buckets)}
+        series: Dict[str, List[Any]] = {feature: [0] * len(buckets) for feature in FEATURES}
+        series["bucket"] = buckets
+
+        if resolution == "day":
+            query = "SELECT day, feature, count FROM daily_counts WHERE day >= ? AND day <= ?"
+            params: Tuple[str, ...] = (first.isoformat(), end.isoformat())
+        else:
+            query = ("SELECT bucket, feature, count FROM rollup_counts "
+                     "WHERE resolution = ? AND bucket >= ? AND bucket <= ?")
+            params = (resolution, first.isoformat(), end.isoformat())
+        conn = _connect(self.path)
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        for bucket, feature, count in rows:
+            if bucket in index and feature in series:
+                series[feature][index[bucket]] = count
+        return series
@@ -0,0 +1,290 @@
+"""
+Asyncio HTTP JSON API for the hub's calculators.
+
+A small HTTP/1.1 server (standard library only, keep-alive supported) that
+exposes the same handlers as the batch CLI:
+
+    GET  /health
+    POST /todo            {"user_name": ..., "category": ..., "priority": ..., "day": ...}
+    POST /finance         {"salary": ..., "expenses": ..., "savings_goal": ..., "currency": ...,
+                           "report_currency": ..., "rate_date": ...}
+    POST /finance/batch   {"salary": [...], "expenses": [...], ..., "columns": [...]}
+                          (vectorized, needs NumPy; "columns" limits the output)
+    POST /groups          {"names": "a, b, c" or [...], "group_size": 3, "shuffle_mode": ...}
+
+/todo, /finance and /groups also accept {"records": [...]} and answer with
+{"results": [...]}, a failed record yielding {"error": ...} in its place.
+At most max_concurrency requests are processed at once; beyond
+max_pending waiting requests the server answers 503. Requests whose work
+is large (many records, long rosters, any /finance/batch) run in a process
+pool so the event loop keeps serving small requests.
+
+    python -m core.api --port 8600 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cli import HANDLERS, Record
+from .export import jsonable
+
+DEFAULT_PORT = 8600
+
+# Requests with more records (or roster names) than this go to the worker pool
+INLINE_LIMIT = 2000
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _content_length(headers: Dict[str, str]) -> int:
+    value = headers.get("content-length") or "0"
+    if not (value.isascii() and value.isdigit()):
+        raise HTTPError(400, f"invalid Content-Length: {value!r}")
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "request body too large")
+    return length
+
+
+# --- Work (module level so the process pool can pickle it) ---
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+def run_records(command: str, records: List[Record]) -> List[Record]:
+    """
+    Run a CLI handler over records, keeping failures in place as errors
+    """
+    handler = HANDLERS[command]
+    results = []
+    for record in records:
+        try:
+            results.append(jsonable(handler(record)))
+        except (KeyError, TypeError, ValueError) as exc:
+            results.append({"error": repr(exc)})
+    return results
+
+def run_records_json(command: str, records: List[Record], batched: bool) -> Tuple[int, bytes]:
+    """
+    run_records plus JSON encoding, so pooled requests are encoded off the event loop
+    """
+    results = run_records(command, records)
+    if batched:
+        return 200, _encode({"results": results})
+    if "error" in results[0]:
+        return 400, _encode(results[0])
+    return 200, _encode(results[0])
+
+def run_finance_batch_json(columns: Dict[str, Any]) -> Tuple[int, bytes]:
+    """
+    Vectorized financial calculator over column lists, encoded as JSON columns
+    """
+    import numpy as np
+
+    from .batch import advanced_financial_calc_batch
+
+    try:
+        results = advanced_financial_calc_batch(
+            columns["salary"], columns["expenses"], columns.get("savings_goal", 0),
+            columns.get("currency", "UGX"), columns.get("tax_table"),
+            columns.get("report_currency"), columns.get("rate_date"))
+    except KeyError as exc:
+        return 400, _encode({"error": f"missing column {exc.args[0]}"})
+    except (TypeError, ValueError) as exc:
+        return 400, _encode({"error": repr(exc)})
+
+    # Encoding dominates for large batches, so callers may ask for fewer columns
+    wanted = columns.get("columns") or list(results)
+    unknown = set(wanted) - set(results)
+    if unknown:
+        return 400, _encode({"error": f"unknown columns: {sorted(unknown)}"})
+    encoded = {}
+    for key in wanted:
+        value = results[key]
+        if isinstance(value, np.ndarray):
+            values = value.tolist()
+            if value.dtype.kind == "f":
+                # Strict JSON: non-finite floats (e.g. months_to_goal) become null
+                for index in np.flatnonzero(~np.isfinite(value)).tolist():
+                    values[index] = None
+            value = values
+        encoded[key] = value
+    return 200, _encode(encoded)
+
+def _work_size(command: str, payload: Dict[str, Any]) -> int:
+    if "records" in payload:
+        return len(payload["records"])
+    if command == "groups":
+        names = payload.get("names") or ""
+        if isinstance(names, list):
+            return len(names)
+        if isinstance(names, str):
+            return names.count(",") + 1
+        raise HTTPError(400, "names must be a string or a list")
+    return 1
+
+
+class HubAPI:
+    """
+    The HTTP service: routing, bounded concurrency and the worker pool
+    """
+    def __init__(self, max_concurrency: int = 64, max_pending: int = 1024,
+                 workers: Optional[int] = None, inline_limit: int = INLINE_LIMIT):
+        self.inline_limit = inline_limit
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._pending = 0
+        self._pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+        """
+        (status, JSON body) for one request
+        """
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if path == "/health":
+            return 200, _encode({"status": "ok", "pending": self._pending})
+        command = {"/todo": "todo", "/finance": "finance", "/groups": "groups",
+                   "/finance/batch": "finance/batch"}.get(path)
+        if command is None:
+            raise HTTPError(404, f"no route for {path}")
+        if method != "POST":
+            raise HTTPError(405, "use POST")
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as exc:
+            raise HTTPError(400, f"invalid JSON: {exc}") from None
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "expected a JSON object")
+
+        if self._pending >= self.max_pending:
+            raise HTTPError(503, "server busy, retry later")
+        self._pending += 1
+        try:
+            async with self._slots:
+                return await self._run(command, payload)
+        finally:
+            self._pending -= 1
+
+    async def _run(self, command: str, payload: Dict[str, Any]) -> Tuple[int, bytes]:
+        loop = asyncio.get_running_loop()
+        if command == "finance/batch":
+            return await loop.run_in_executor(self._pool, run_finance_batch_json, payload)
+
+        batched = "records" in payload
+        records = payload["records"] if batched else [payload]
+        if not isinstance(records, list):
+            raise HTTPError(400, "records must be a list")
+        if _work_size(command, payload) > self.inline_limit:
+            return await loop.run_in_executor(self._pool, run_records_json, command, records,
+                                              batched)
+        return run_records_json(command, records, batched)
+
+    # --- HTTP ---
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, _encode({"error": "malformed request line"}),
+                                        False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" \
+                    and version == "HTTP/1.1"
+
+                try:
+                    length = _content_length(headers)
+                except HTTPError as exc:
+                    # The body cannot be skipped reliably, so the connection is closed
+                    await self._respond(writer, exc.status, _encode({"error": str(exc)}), False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except HTTPError as exc:
+                    status, payload = exc.status, _encode({"error": str(exc)})
+                except Exception as exc:  # keep serving other requests
+                    status, payload = 500, _encode({"error": repr(exc)})
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, body: bytes,
+                       keep_alive: bool) -> None:
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, **options: Any) -> None:
+    api = HubAPI(**options)
+    server = await asyncio.start_server(api.handle_connection, host, port)
+    print(f"Serving the hub API on http://{host}:{port}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.api",
+                                     description="Serve the hub's calculators as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-concurrency", type=int, default=64,
+                        help="requests processed at once")
+    parser.add_argument("--max-pending", type=int, default=1024,
+                        help="waiting requests before answering 503")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for large batches (default: CPU count)")
+    parser.add_argument("--inline-limit", type=int, default=INLINE_LIMIT,
+                        help="records handled on the event loop before using the pool")
+    args = parser.parse_args(argv)
+    # Exit through serve()'s cleanup on SIGTERM so the worker pool is shut down too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        asyncio.run(serve(args.host, args.port, max_concurrency=args.max_concurrency,
+                          max_pending=args.max_pending, workers=args.workers,
+                          inline_limit=args.inline_limit))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
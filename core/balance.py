@@ -0,0 +1,346 @@
+"""
+Attribute-balanced group partitioning.
+
+People are split into groups whose numeric attributes (e.g. skill score)
+have similar means and whose categorical attributes (e.g. department,
+gender) follow the roster-wide mix, subject to min/max group sizes and
+"keep apart" pairs. A greedy stratified serpentine deal gives the starting
+point, then a time-bounded local search swaps members between groups while
+the objective improves. Every swap is scored in O(attributes) from running
+group totals, so large cohorts (50k+) stay within a few seconds.
+"""
+import codecs
+import csv
+import io
+import math
+import random
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from .groups import normalize_name
+
+# Objective cost of one violated keep-apart pair
+CONFLICT_PENALTY = 100.0
+
+# Default wall-clock budget for the local search, in seconds
+DEFAULT_TIME_LIMIT = 2.0
+
+
+class BalancedGroups:
+    """
+    Result of balanced_group_partition: a zero-based group index per person
+    plus the balance objective (lower is better) and solver statistics
+    """
+    def __init__(self, names: List[str], groups: np.ndarray, objective: Dict[str, float],
+                 initial_objective: Dict[str, float], solve_time: float, iterations: int):
+        self.names = names
+        self.groups = groups
+        self.objective = objective
+        self.initial_objective = initial_objective
+        self.solve_time = solve_time
+        self.iterations = iterations
+        self._by_group: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @property
+    def num_groups(self) -> int:
+        return int(self.groups.max()) + 1 if len(self.groups) else 0
+
+    def to_groups(self, limit: Optional[int] = None, start: int = 0) -> List[List[str]]:
+        """
+        Nested lists in the smart_group_generator shape, optionally only
+        ``limit`` groups from group ``start``, in O(members returned)
+        """
+        if self._by_group is None:
+            # Name indices sorted by group (roster order within a group) and group bounds
+            order = np.argsort(self.groups, kind="stable")
+            sizes = np.bincount(self.groups, minlength=self.num_groups)
+            bounds = np.concatenate([[0], np.cumsum(sizes)])
+            self._by_group = (order, bounds)
+        order, bounds = self._by_group
+        stop = self.num_groups if limit is None else min(start + limit, self.num_groups)
+        return [[self.names[i] for i in order[bounds[g]:bounds[g + 1]].tolist()]
+                for g in range(start, stop)]
+
+    def find_groups(self, query: str) -> List[int]:
+        """
+        Zero-based indices of the groups with a member whose name contains query
+        (compared as normalize_name keys)
+        """
+        needle = normalize_name(query)
+        hits = [i for i, name in enumerate(self.names) if needle in normalize_name(name)]
+        return np.unique(self.groups[hits]).tolist() if hits else []
+
+    def iter_chunks(self, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+        """
+        {'name': names, 'group': group numbers from 1} column chunks in roster order
+        """
+        for start in range(0, len(self.names), chunk_size):
+            stop = start + chunk_size
+            yield {"name": self.names[start:stop],
+                   "group": self.groups[start:stop].astype(np.int64) + 1}
+
+
+# --- Roster Input ---
+def read_attribute_roster(source) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Read a CSV roster with a header row into (names, {column: values}).
+
+    The name column is the one called "name" (any case), else the first
+    column. Later rows repeating a name (see groups.normalize_name) are
+    dropped.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        stream: TextIO = io.StringIO(codecs.decode(source, "utf-8-sig"))
+    elif isinstance(source, str):
+        stream = open(source, encoding="utf-8-sig", newline="")
+    else:
+        stream = source
+    try:
+        reader = csv.reader(stream)
+        header = [column.strip() for column in next(reader, [])]
+        if not header:
+            return [], {}
+        lowered = [column.lower() for column in header]
+        name_col = lowered.index("name") if "name" in lowered else 0
+        columns: Dict[str, List[str]] = {column: [] for i, column in enumerate(header)
+                                         if i != name_col}
+        names: List[str] = []
+        seen = set()
+        for row in reader:
+            if len(row) <= name_col or not row[name_col].strip():
+                continue
+            name = row[name_col].strip()
+            key = normalize_name(name)
+            if key in seen:
+                continue
+            seen.add(key)
+            names.append(name)
+            for i, column in enumerate(header):
+                if i != name_col:
+                    columns[column].append(row[i].strip() if i < len(row) else "")
+        return names, columns
+    finally:
+        if isinstance(source, str):
+            stream.close()
+
+def split_attribute_columns(columns: Dict[str, List[str]]) -> Tuple[List[str], List[str]]:
+    """
+    Split roster columns into (numeric, categorical) by whether every
+    non-empty value parses as a number
+    """
+    numeric, categorical = [], []
+    for column, values in columns.items():
+        try:
+            for value in values:
+                if value:
+                    float(value)
+        except ValueError:
+            categorical.append(column)
+        else:
+            numeric.append(column)
+    return numeric, categorical
+
+
+# --- Sizing ---
+def plan_num_groups(count: int, group_size: int, min_size: Optional[int] = None,
+                    max_size: Optional[int] = None) -> int:
+    """
+    Number of groups closest to count / group_size whose even split (sizes
+    differing by at most one) respects min_size and max_size
+    """
+    if group_size < 1:
+        raise ValueError("Group size must be at least 1")
+    if count == 0:
+        return 0
+    min_size = min_size or 1
+    max_size = max_size or count
+    if min_size > max_size:
+        raise ValueError("Minimum group size cannot exceed the maximum")
+
+    lowest = math.ceil(count / max_size)
+    highest = count // min_size
+    if lowest > highest:
+        raise ValueError(f"Cannot split {count} people into groups of {min_size}-{max_size}")
+    return min(max(math.ceil(count / group_size), lowest), highest)
+
+
+# --- Objective ---
+def _objective(groups: np.ndarray, num_groups: int, z: np.ndarray, codes: List[np.ndarray],
+               shares: List[np.ndarray], pairs: np.ndarray) -> Dict[str, float]:
+    sizes = np.bincount(groups, minlength=num_groups).astype(np.float64)
+    numeric = 0.0
+    for column in z.T:
+        sums = np.bincount(groups, weights=column, minlength=num_groups)
+        numeric += float(np.sum(sums ** 2 / sizes))
+    categorical = 0.0
+    for code, share in zip(codes, shares):
+        counts = np.bincount(groups * len(share) + code,
+                             minlength=num_groups * len(share)).reshape(num_groups, len(share))
+        categorical += float(np.sum((counts - sizes[:, None] * share) ** 2 / sizes[:, None]))
+    conflicts = int(np.sum(groups[pairs[:, 0]] == groups[pairs[:, 1]])) if len(pairs) else 0
+    return {
+        "total": numeric + categorical + CONFLICT_PENALTY * conflicts,
+        "numeric": numeric,
+        "categorical": categorical,
+        "conflicts": conflicts,
+    }
+
+
+# --- Solver ---
+def balanced_group_partition(names: Sequence[str], numeric: Optional[Dict[str, Sequence]] = None,
+                             categorical: Optional[Dict[str, Sequence]] = None,
+                             group_size: int = 3, min_size: Optional[int] = None,
+                             max_size: Optional[int] = None,
+                             keep_apart: Iterable[Tuple[str, str]] = (),
+                             time_limit: float = DEFAULT_TIME_LIMIT,
+                             seed: Optional[int] = None) -> BalancedGroups:
+    """
+    Partition names into groups balanced on the given attribute columns.
+
+    numeric columns are balanced on their (standardized) group means,
+    categorical columns on each group's category mix; keep_apart pairs of
+    names (matched as normalize_name keys) should land in different groups.
+    The local search stops after time_limit seconds or when no improving
+    swap is found for a while.
+    """
+    started = time.perf_counter()
+    names = list(names)
+    count = len(names)
+    num_groups = plan_num_groups(count, group_size, min_size, max_size)
+    rng = np.random.default_rng(seed)
+
+    # Standardized numeric attributes; missing values sit at the mean
+    columns = list((numeric or {}).values())
+    z = np.zeros((count, len(columns)))
+    for j, values in enumerate(columns):
+        x = np.array([float(v) if v not in ("", None) else np.nan for v in values])
+        x = np.where(np.isnan(x), np.nanmean(x) if np.isfinite(x).any() else 0.0, x)
+        spread = x.std()
+        z[:, j] = (x - x.mean()) / (spread if spread > 0 else 1.0)
+
+    codes: List[np.ndarray] = []
+    shares: List[np.ndarray] = []
+    for values in (categorical or {}).values():
+        levels, code = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        codes.append(code.astype(np.int64))
+        shares.append(np.bincount(code, minlength=len(levels)) / count)
+
+    index = {normalize_name(name): i for i, name in enumerate(names)}
+    pair_list = []
+    for first, second in keep_apart:
+        missing = [name for name in (first, second) if normalize_name(name) not in index]
+        if missing:
+            raise ValueError(f"Keep-apart names not in roster: {', '.join(missing)}")
+        first, second = index[normalize_name(first)], index[normalize_name(second)]
+        if first != second:
+            pair_list.append((first, second))
+    pairs = np.array(pair_list, dtype=np.int64).reshape(-1, 2)
+
+    if count == 0:
+        empty = _objective(np.zeros(0, dtype=np.int64), 0, z, codes, shares, pairs)
+        return BalancedGroups(names, np.zeros(0, dtype=np.int32), empty, empty, 0.0, 0)
+
+    # Greedy start: order by category strata then score, and deal the
+    # people out serpentine so every group gets a spread of both
+    score = z.sum(axis=1)
+    order = np.lexsort([rng.random(count), -score] + codes[::-1])
+    position = np.arange(count)
+    rounds, slot = position // num_groups, position % num_groups
+    groups = np.empty(count, dtype=np.int64)
+    groups[order] = np.where(rounds % 2 == 0, slot, num_groups - 1 - slot)
+    initial = _objective(groups, num_groups, z, codes, shares, pairs)
+
+    iterations, _ = _local_search(groups, num_groups, z, codes, shares, pairs,
+                                  started + time_limit, random.Random(seed))
+
+    final = _objective(groups, num_groups, z, codes, shares, pairs)
+    return BalancedGroups(names, groups.astype(np.int32), final, initial,
+                          time.perf_counter() - started, iterations)
+
+def _local_search(groups: np.ndarray, num_groups: int, z: np.ndarray, codes: List[np.ndarray],
+                  shares: List[np.ndarray], pairs: np.ndarray, deadline: float,
+                  rand: random.Random) -> Tuple[int, float]:
+    """
+    Improve groups in place with random pairwise swaps until the deadline
+    or until a long run of proposals finds nothing better; returns the
+    number of proposals evaluated and the summed objective change of the
+    accepted swaps (which a full recompute must reproduce)
+    """
+    count = len(groups)
+    if num_groups < 2:
+        return 0, 0.0
+
+    # Plain Python state: scalar access is much faster than on arrays
+    group_of = groups.tolist()
+    sizes = np.bincount(groups, minlength=num_groups).tolist()
+    values = [column.tolist() for column in z.T]
+    sums = [np.bincount(groups, weights=column, minlength=num_groups).tolist() for column in z.T]
+    labels = [code.tolist() for code in codes]
+    share_lists = [share.tolist() for share in shares]
+    counts = [np.bincount(groups * len(share) + code, minlength=num_groups * len(share))
+              .reshape(num_groups, len(share)).tolist() for code, share in zip(codes, shares)]
+    partners: Dict[int, List[int]] = {}
+    for a, b in pairs.tolist():
+        partners.setdefault(a, []).append(b)
+        partners.setdefault(b, []).append(a)
+    constrained = list(partners)
+
+    patience = max(20000, 20 * count)
+    since_improvement = 0
+    iterations = 0
+    change = 0.0
+    while since_improvement < patience:
+        iterations += 1
+        if iterations & 1023 == 0 and time.perf_counter() >= deadline:
+            break
+        since_improvement += 1
+
+        if constrained and rand.random() < 0.5:
+            a = constrained[rand.randrange(len(constrained))]
+        else:
+            a = rand.randrange(count)
+        b = rand.randrange(count)
+        ga, gb = group_of[a], group_of[b]
+        if ga == gb:
+            continue
+        na, nb = sizes[ga], sizes[gb]
+
+        delta = 0.0
+        for value, total in zip(values, sums):
+            xa, xb = value[a], value[b]
+            if xa != xb:
+                sa, sb = total[ga], total[gb]
+                new_a, new_b = sa - xa + xb, sb - xb + xa
+                delta += (new_a * new_a - sa * sa) / na + (new_b * new_b - sb * sb) / nb
+        for label, share, table in zip(labels, share_lists, counts):
+            ca, cb = label[a], label[b]
+            if ca != cb:
+                row_a, row_b = table[ga], table[gb]
+                delta += (2 - 2 * (row_a[ca] - na * share[ca]) + 2 * (row_a[cb] - na * share[cb])) / na
+                delta += (2 - 2 * (row_b[cb] - nb * share[cb]) + 2 * (row_b[ca] - nb * share[ca])) / nb
+        for person, home, away, other in ((a, ga, gb, b), (b, gb, ga, a)):
+            for q in partners.get(person, ()):
+                if q != other:
+                    if group_of[q] == home:
+                        delta -= CONFLICT_PENALTY
+                    elif group_of[q] == away:
+                        delta += CONFLICT_PENALTY
+
+        if delta < -1e-9:
+            since_improvement = 0
+            change += delta
+            group_of[a], group_of[b] = gb, ga
+            for value, total in zip(values, sums):
+                total[ga] += value[b] - value[a]
+                total[gb] += value[a] - value[b]
+            for label, table in zip(labels, counts):
+                ca, cb = label[a], label[b]
+                table[ga][ca] -= 1
+                table[ga][cb] += 1
+                table[gb][cb] -= 1
+                table[gb][ca] += 1
+
+    groups[:] = group_of
+    return iterations, change
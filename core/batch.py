@@ -0,0 +1,195 @@
+"""
+Vectorized batch versions of the financial calculator and health score.
+
+Every output column of ``advanced_financial_calc`` is computed for a whole
+batch in one NumPy pass, with the same operations in the same order so the
+results match the scalar functions value for value. NumPy is imported here
+rather than in ``core`` so the scalar API stays dependency free.
+"""
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .finance import MONETARY_KEYS
+from .fx import load_rate_table
+from .tax import get_tax_table
+
+__all__ = [
+    "ArrayLike",
+    "FINANCIAL_COLUMNS",
+    "advanced_financial_calc_batch",
+    "as_float_array",
+    "calculate_financial_health_score_batch",
+    "tax_batch",
+]
+
+ArrayLike = Union[float, np.ndarray, Any]
+
+# Health score tiers as (threshold, points), checked from the top down
+_SAVINGS_RATE_TIERS = ((20, 40), (10, 30), (5, 20))
+_DEBT_TO_INCOME_TIERS = ((20, 30), (30, 25), (40, 15), (50, 10))
+_EMERGENCY_TIERS = ((6, 30), (3, 20), (1, 10))
+
+FINANCIAL_COLUMNS = [
+    'salary', 'tax', 'net_salary', 'expenses', 'savings', 'savings_rate',
+    'expense_rate', 'tax_rate_percent', 'marginal_tax_rate_percent', 'tax_table',
+    'savings_goal', 'months_to_goal', 'projected_savings_6m', 'projected_savings_12m',
+    'emergency_fund_needed', 'emergency_fund_coverage', 'debt_to_income', 'health_score',
+    'currency', 'fx_rate'
+]
+
+
+def as_float_array(values: ArrayLike) -> np.ndarray:
+    """
+    Scalars, lists or arrays as a float64 array (no copy when already one)
+    """
+    return np.asarray(values, dtype=np.float64)
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray, valid: np.ndarray,
+                fallback: float) -> np.ndarray:
+    """
+    numerator / denominator where valid, fallback elsewhere, without warnings
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = numerator / denominator
+    return np.where(valid, ratio, fallback)
+
+def tax_batch(salary: np.ndarray, currency: ArrayLike,
+               tax_table: ArrayLike) -> Tuple[np.ndarray, np.ndarray, Any]:
+    """
+    Tax, marginal rate and table id per row. A scalar table or currency is
+    one bracket lookup over the whole array; per-row values are grouped so
+    each distinct table is still applied in one vectorized pass.
+    """
+    keys = tax_table if tax_table is not None else currency
+    if np.ndim(keys) == 0:
+        table = get_tax_table(tax_table, currency)
+        return table.tax_batch(salary), table.marginal_rate_batch(salary), table.key
+
+    # Dict encoding is several times faster than np.unique on object arrays
+    keys = np.broadcast_to(np.asarray(keys, dtype=object), salary.shape).ravel()
+    key_codes: Dict[Any, int] = {}
+    codes = np.fromiter((key_codes.setdefault(key, len(key_codes)) for key in keys),
+                        dtype=np.int64, count=keys.size).reshape(salary.shape)
+    tax = np.empty_like(salary)
+    marginal = np.empty_like(salary)
+    table_ids = np.empty(salary.shape, dtype=object)
+    for key, code in key_codes.items():
+        table = get_tax_table(key, None) if tax_table is not None else get_tax_table(None, key)
+        rows = codes == code
+        tax[rows] = table.tax_batch(salary[rows])
+        marginal[rows] = table.marginal_rate_batch(salary[rows])
+        table_ids[rows] = table.key
+    return tax, marginal, table_ids
+
+def calculate_financial_health_score_batch(savings_rate: ArrayLike, debt_to_income: ArrayLike,
+                                           emergency_coverage: ArrayLike) -> np.ndarray:
+    """
+    Vectorized calculate_financial_health_score, returns an int64 array
+    """
+    savings_rate = as_float_array(savings_rate)
+    debt_to_income = as_float_array(debt_to_income)
+    emergency_coverage = as_float_array(emergency_coverage)
+
+    savings_points = np.select(
+        [savings_rate >= t for t, _ in _SAVINGS_RATE_TIERS] + [savings_rate > 0],
+        [p for _, p in _SAVINGS_RATE_TIERS] + [10],
+        default=0,
+    )
+    debt_points = np.select(
+        [debt_to_income <= t for t, _ in _DEBT_TO_INCOME_TIERS],
+        [p for _, p in _DEBT_TO_INCOME_TIERS],
+        default=0,
+    )
+    emergency_points = np.select(
+        [emergency_coverage >= t for t, _ in _EMERGENCY_TIERS],
+        [p for _, p in _EMERGENCY_TIERS],
+        default=0,
+    )
+    return np.minimum(100, savings_points + debt_points + emergency_points).astype(np.int64)
+
+def advanced_financial_calc_batch(salary: ArrayLike, expenses: ArrayLike = None,
+                                  savings_goal: ArrayLike = 0,
+                                  currency: ArrayLike = "UGX",
+                                  tax_table: Optional[ArrayLike] = None,
+                                  report_currency: Optional[ArrayLike] = None,
+                                  rate_date: Optional[ArrayLike] = None) -> Union[Dict[str, Any], Any]:
+    """
+    Vectorized advanced_financial_calc over arrays of inputs.
+
+    Pass NumPy arrays (or anything array-like) to get a dict of column arrays,
+    or a pandas DataFrame with salary/expenses[/savings_goal/currency/tax_table/
+    report_currency/rate_date] columns to get a DataFrame with one column per
+    result key. currency, tax_table, report_currency and rate_date may be
+    scalars or per-row arrays; the conversion to report_currency is one
+    rate lookup over all rows (see RateTable.rate_batch). Mixed-currency
+    lines are summed per row beforehand with core.fx.consolidate_batch.
+    """
+    frame = None
+    if hasattr(salary, 'columns'):
+        frame = salary
+        expenses = frame['expenses']
+        savings_goal = frame['savings_goal'] if 'savings_goal' in frame.columns else 0
+        currency = frame['currency'] if 'currency' in frame.columns else currency
+        tax_table = frame['tax_table'] if 'tax_table' in frame.columns else tax_table
+        if 'report_currency' in frame.columns:
+            report_currency = frame['report_currency']
+        rate_date = frame['rate_date'] if 'rate_date' in frame.columns else rate_date
+        salary = frame['salary']
+    if expenses is None:
+        raise ValueError("expenses is required")
+
+    salary, expenses, savings_goal = np.broadcast_arrays(
+        as_float_array(salary), as_float_array(expenses), as_float_array(savings_goal))
+    if (salary < 0).any() or (expenses < 0).any() or (savings_goal < 0).any():
+        raise ValueError("Financial values cannot be negative")
+
+    tax, marginal_rate, table_ids = tax_batch(salary, currency, tax_table)
+    net_salary = salary - tax
+    savings = net_salary - expenses
+
+    has_salary = salary > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        savings_rate = np.where(has_salary, savings / salary * 100, 0)
+        expense_rate = np.where(has_salary, expenses / salary * 100, 0)
+        tax_rate_percent = np.where(has_salary, tax / salary * 100, 0)
+
+    months_to_goal = _safe_ratio(savings_goal, savings, (savings > 0) & (savings_goal > 0),
+                                 np.inf)
+    emergency_fund_coverage = _safe_ratio(savings, expenses, expenses > 0, np.inf)
+
+    results = {
+        'salary': salary,
+        'tax': tax,
+        'net_salary': net_salary,
+        'expenses': expenses,
+        'savings': savings,
+        'savings_rate': savings_rate,
+        'expense_rate': expense_rate,
+        'tax_rate_percent': tax_rate_percent,
+        'marginal_tax_rate_percent': marginal_rate * 100,
+        'tax_table': table_ids,
+        'savings_goal': savings_goal,
+        'months_to_goal': months_to_goal,
+        'projected_savings_6m': savings * 6,
+        'projected_savings_12m': savings * 12,
+        'emergency_fund_needed': expenses * 6,
+        'emergency_fund_coverage': emergency_fund_coverage,
+        'debt_to_income': expense_rate,
+        'health_score': calculate_financial_health_score_batch(
+            savings_rate, expense_rate, emergency_fund_coverage),
+        'currency': currency,
+        'fx_rate': 1.0,
+    }
+    if report_currency is not None:
+        fx_rate = load_rate_table().rate_batch(currency, report_currency, rate_date)
+        if np.ndim(fx_rate) == 0:
+            fx_rate = float(fx_rate)
+        for key in MONETARY_KEYS:
+            results[key] = results[key] * fx_rate
+        results['currency'] = report_currency
+        results['fx_rate'] = fx_rate
+    if frame is not None:
+        import pandas as pd
+        return pd.DataFrame(results, index=frame.index)
+    return results
@@ -0,0 +1,236 @@
+"""
+Bulk to-do generation for a whole organisation.
+
+Per user the result follows generate_smart_todo: tasks come from the task
+catalog's (category, priority) alias tables, so weights and eligibility
+apply, 5/4/3 distinct tasks for High/Medium/Low, and unknown categories
+fall back to the catalog default. Instead of one call per person, the users
+of a chunk that share a (category, priority) pair are sampled together
+with a few NumPy Generator calls: random keys ranked per row for small
+tables, or vectorized alias draws with repeats dropped for large ones.
+Estimates follow the task as well: the TIME_ESTIMATES draw and clamp for
+tasks without a duration, a triangular draw scaled by the priority
+multiplier otherwise. Labels come from a lookup over the distinct rounded
+estimates rather than per-task formatting.
+"""
+import weakref
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .catalog import _LINEAR_SHARE, AliasTable, TaskCatalog, format_minutes, get_task_catalog
+from .data import MOTIVATIONAL_QUOTES, PRIORITY_CONFIG, TIME_ESTIMATE_MINUTES, TIME_ESTIMATES
+
+# Users generated per chunk when streaming
+BULK_CHUNK = 50000
+
+TASKS_PER_PRIORITY = {"High": 5, "Medium": 4, "Low": 3}
+
+BULK_COLUMNS = ["user_name", "category", "priority", "task_number", "task",
+                "time_estimate", "display", "motivation"]
+
+# Alias draws per requested task before ranking keys over the whole table
+_DRAWS_PER_TASK = 4
+
+_TIMES = np.array(TIME_ESTIMATES, dtype=object)
+_TIME_MINUTES = np.array(TIME_ESTIMATE_MINUTES, dtype=np.float64)
+_QUOTES = np.array(MOTIVATIONAL_QUOTES, dtype=object)
+
+# Task names, durations and alias arrays per table, built on first use;
+# catalogs share unchanged tables, so this follows the tables themselves
+_TABLE_ARRAYS: "weakref.WeakKeyDictionary[AliasTable, Dict[str, np.ndarray]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _table_arrays(table: AliasTable) -> Dict[str, np.ndarray]:
+    arrays = _TABLE_ARRAYS.get(table)
+    if arrays is None:
+        arrays = {
+            "name": np.array([task.name for task in table.items], dtype=object),
+            "duration": np.array([task.duration or (np.nan,) * 3 for task in table.items],
+                                 dtype=np.float64).reshape(len(table), 3),
+            "weight": np.array(table.weights),
+            "prob": np.array(table.prob),
+            "alias": np.array(table.alias, dtype=np.int64),
+        }
+        _TABLE_ARRAYS[table] = arrays
+    return arrays
+
+def _ranked_keys(arrays: Dict[str, np.ndarray], rows: int, k: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    # Weighted sampling without replacement: the k smallest Exp(1) / weight keys
+    keys = rng.exponential(size=(rows, len(arrays["weight"]))) / arrays["weight"]
+    return np.argsort(keys, axis=1)[:, :k]
+
+def _sample_rows(arrays: Dict[str, np.ndarray], rows: int, k: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    """
+    (rows, k) distinct table indices per row, drawn like AliasTable.sample
+    """
+    count = len(arrays["weight"])
+    if k > count * _LINEAR_SHARE:
+        return _ranked_keys(arrays, rows, k, rng)
+
+    # Alias draws, keeping the first k distinct ones of each row
+    draws = _DRAWS_PER_TASK * k
+    index = (rng.random((rows, draws)) * count).astype(np.int64)
+    picks = np.where(rng.random((rows, draws)) < arrays["prob"][index], index,
+                     arrays["alias"][index])
+    order = np.argsort(picks, axis=1, kind="stable")
+    ranked = np.take_along_axis(picks, order, axis=1)
+    first = np.ones_like(ranked, dtype=bool)
+    first[:, 1:] = ranked[:, 1:] != ranked[:, :-1]
+    is_first = np.empty_like(first)
+    np.put_along_axis(is_first, order, first, axis=1)
+    kept = np.cumsum(is_first, axis=1)
+    complete = kept[:, -1] >= k
+
+    sample = np.empty((rows, k), dtype=np.int64)
+    chosen = is_first & (kept <= k)
+    sample[complete] = picks[complete][chosen[complete]].reshape(-1, k)
+    short = np.flatnonzero(~complete)
+    if short.size:
+        # A few tasks hold almost all the weight: rank keys over the whole table
+        sample[short] = _ranked_keys(arrays, short.size, k, rng)
+    return sample
+
+def draw_minutes(duration: np.ndarray, multiplier: np.ndarray,
+                 rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Task.estimate for arrays: duration is (..., 3) min/mode/max minutes, NaN
+    for tasks without one. Returns the minutes and the TIME_ESTIMATES index
+    (-1 for tasks with a duration).
+    """
+    multiplier = np.broadcast_to(multiplier, duration.shape[:-1])
+    builtin = np.isnan(duration[..., 0])
+    base_time = rng.integers(0, len(TIME_ESTIMATES), size=builtin.shape)
+    time_idx = np.minimum(len(TIME_ESTIMATES) - 1, (base_time * multiplier).astype(np.int64))
+
+    # Triangular draws by the inverse CDF, which also takes fixed durations (min == max)
+    low, mode, high = duration[..., 0], duration[..., 1], duration[..., 2]
+    span = high - low
+    u = rng.random(builtin.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rising = u < (mode - low) / span
+        drawn = np.where(rising, low + np.sqrt(u * span * (mode - low)),
+                         high - np.sqrt((1 - u) * span * (high - mode)))
+    drawn = np.where(span > 0, drawn, low) * multiplier
+    return np.where(builtin, _TIME_MINUTES[time_idx], drawn), np.where(builtin, time_idx, -1)
+
+def _label_codes(minutes: np.ndarray, time_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Display labels of draw_minutes results as codes into a table of the
+    # distinct ones: TIME_ESTIMATES indices, then
+    # format_minutes keys, which only depend on the 5-minute step below an
+    # hour and the 15-minute step above
+    fives = np.maximum(5, np.round(minutes / 5).astype(np.int64) * 5)
+    keys = np.where(time_idx >= 0, time_idx,
+                    np.where(fives < 60, 100 + fives, 1000 + np.round(minutes / 15).astype(np.int64)))
+    distinct, codes = np.unique(keys, return_inverse=True)
+    labels = np.array([TIME_ESTIMATES[key] if key < 100 else
+                       format_minutes(key - 100 if key < 1000 else (key - 1000) * 15)
+                       for key in distinct.tolist()], dtype=object)
+    return codes.reshape(keys.shape), labels
+
+def generate_bulk_todo(users: Sequence[str], categories: Sequence[str],
+                       priorities: Sequence[str],
+                       rng: Optional[np.random.Generator] = None,
+                       catalog: Optional[TaskCatalog] = None) -> Dict[str, np.ndarray]:
+    """
+    Draw to-do lists for many users at once.
+
+    Returns long-format columns (see BULK_COLUMNS), one entry per task, in
+    user order. Categories, priorities and task names are object arrays of
+    the shared catalog strings.
+    """
+    if not len(users) == len(categories) == len(priorities):
+        raise ValueError("users, categories and priorities must have the same length")
+    if any(not str(user).strip() for user in users):
+        raise ValueError("User name cannot be empty")
+    rng = rng if rng is not None else np.random.default_rng()
+    catalog = catalog if catalog is not None else get_task_catalog()
+    known = set(catalog.categories)
+
+    # Dict-encode (category, priority) pairs, unknown categories as the default
+    unknown = set(priorities).difference(PRIORITY_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown priority: {min(unknown, key=str)}")
+    pairs: Dict[Tuple[str, str], int] = {}
+    default = catalog.default_category
+    codes = np.fromiter((pairs.setdefault((c if c in known else default, p), len(pairs))
+                         for c, p in zip(categories, priorities)),
+                        dtype=np.int64, count=len(users))
+    pair_categories = np.array([category for category, _ in pairs], dtype=object)
+    pair_priorities = np.array([priority for _, priority in pairs], dtype=object)
+
+    # Tasks of every pair's table side by side, so one code names a
+    # (pair, task) and with it the priority emoji
+    tables = [_table_arrays(catalog.table(category, priority)) for category, priority in pairs]
+    offsets = np.cumsum([0] + [len(arrays["name"]) for arrays in tables])
+    all_names = np.concatenate([np.empty(0, dtype=object)] + [arrays["name"] for arrays in tables])
+    all_durations = np.concatenate([np.empty((0, 3))] + [arrays["duration"] for arrays in tables])
+    all_emojis = np.repeat(np.array([PRIORITY_CONFIG[p]["emoji"] for p in pair_priorities],
+                                    dtype=object), np.diff(offsets))
+
+    count = len(users)
+    width = max(TASKS_PER_PRIORITY.values())
+    num_tasks = np.zeros(count, dtype=np.int64)
+    task_codes = np.zeros((count, width), dtype=np.int64)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(pairs) + 1))
+    for code, ((_, priority), arrays) in enumerate(zip(pairs, tables)):
+        rows = order[bounds[code]:bounds[code + 1]]
+        k = min(TASKS_PER_PRIORITY[priority], len(arrays["name"]))
+        task_codes[rows, :k] = offsets[code] + _sample_rows(arrays, rows.size, k, rng)
+        num_tasks[rows] = k
+
+    # Flatten to one row per generated task
+    mask = np.arange(width) < num_tasks[:, None]
+    rows = np.repeat(np.arange(count), num_tasks)
+    task_codes = task_codes[mask]
+    multipliers = np.array([PRIORITY_CONFIG[p]["multiplier"] for p in pair_priorities])
+    minutes, time_idx = draw_minutes(all_durations[task_codes], multipliers[codes][rows], rng)
+    label_codes, labels = _label_codes(minutes, time_idx)
+    quotes = rng.integers(0, len(MOTIVATIONAL_QUOTES), size=count)
+
+    # "<emoji> <task> (<time>)" built once per distinct task and label
+    distinct, display_codes = np.unique(label_codes * len(all_names) + task_codes,
+                                        return_inverse=True)
+    label_of, task_of = np.divmod(distinct, len(all_names))
+    display = np.array([f"{emoji} {task} ({label})" for emoji, task, label in
+                        zip(all_emojis[task_of], all_names[task_of], labels[label_of])],
+                       dtype=object)
+    return {
+        "user_name": np.asarray(users, dtype=object)[rows],
+        "category": pair_categories[codes][rows],
+        "priority": pair_priorities[codes][rows],
+        "task_number": np.nonzero(mask)[1] + 1,
+        "task": all_names[task_codes],
+        "time_estimate": labels[label_codes],
+        "display": display[display_codes.reshape(-1)],
+        "motivation": _QUOTES[quotes][rows],
+    }
+
+def iter_bulk_todo(records: Iterable[Any], chunk_size: int = BULK_CHUNK,
+                   seed: Optional[int] = None,
+                   catalog: Optional[TaskCatalog] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Generate lists chunk by chunk for (user_name, category, priority)
+    tuples or dicts with those keys, all from one catalog version
+    """
+    rng = np.random.default_rng(seed)
+    catalog = catalog if catalog is not None else get_task_catalog()
+    users: List[str] = []
+    categories: List[str] = []
+    priorities: List[str] = []
+    for record in records:
+        if isinstance(record, dict):
+            record = (record["user_name"], record.get("category") or "Work",
+                      record.get("priority") or "Medium")
+        users.append(str(record[0]))
+        categories.append(record[1])
+        priorities.append(record[2])
+        if len(users) >= chunk_size:
+            yield generate_bulk_todo(users, categories, priorities, rng, catalog)
+            users, categories, priorities = [], [], []
+    if users:
+        yield generate_bulk_todo(users, categories, priorities, rng, catalog)
@@ -0,0 +1,434 @@
+"""
+Task catalog for the Smart To-Do generator.
+
+Tasks are loaded from a local JSON or SQLite file (named by
+``HUB_TASK_CATALOG``; without one the built-in DAILY_TASKS lists are used).
+Each task has a category, tags, a sampling weight, an optional triangular
+duration distribution in minutes and the priorities it is eligible for.
+Tasks without a duration (the built-in ones among them) keep the original
+estimate: a random TIME_ESTIMATES label, shifted by the priority
+multiplier and clamped to the longest.
+
+When a catalog is built, every (category, priority) pair gets a Vose alias
+table over its eligible tasks. A weighted draw is then one uniform index
+and one coin flip, O(1) whatever the catalog size. Distinct tasks are
+drawn by redrawing repeats, which is weighted sampling without
+replacement. Tables with equal weights, such as the built-in lists, use
+random.sample directly, so the built-in catalog draws exactly as before.
+
+Catalogs are immutable. CatalogStore checks the file's modification stamp
+at most every CHECK_INTERVAL seconds and, when it changed, builds the new
+catalog on a background thread. Alias tables of categories whose tasks
+did not change are reused from the previous catalog. Readers keep using
+the old catalog until the new one replaces it in a single reference swap,
+so sessions never wait on a reload.
+
+JSON files hold ``{"tasks": [...]}`` with one object per task::
+
+    {"id": "work-0001", "name": "Check emails", "category": "Work",
+     "tags": ["email"], "weight": 2.0, "priorities": ["High", "Medium"],
+     "duration": {"min": 10, "mode": 15, "max": 30}}
+
+SQLite files hold a ``tasks`` table with the same fields; tags and
+priorities are comma separated, and the duration is split into
+duration_min, duration_mode and duration_max (NULL for no duration).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .data import DAILY_TASKS, PRIORITY_CONFIG, TIME_ESTIMATE_MINUTES, TIME_ESTIMATES
+
+DEFAULT_CATALOG_PATH = os.environ.get("HUB_TASK_CATALOG")
+
+# Seconds between checks of the catalog file for changes
+CHECK_INTERVAL = 5.0
+
+# Redraws allowed per requested task before falling back to a linear scan
+_MAX_REDRAWS = 32
+
+# Samples larger than this share of the table use the linear draw directly,
+# redrawing repeats would cost more
+_LINEAR_SHARE = 0.25
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '',
+    weight REAL NOT NULL DEFAULT 1,
+    duration_min REAL,
+    duration_mode REAL,
+    duration_max REAL,
+    priorities TEXT NOT NULL DEFAULT ''
+);
+"""
+
+
+class Task:
+    """
+    One catalog entry
+    """
+    __slots__ = ("id", "name", "category", "tags", "weight", "duration", "priorities")
+
+    def __init__(self, id: str, name: str, category: str, tags: Sequence[str] = (),
+                 weight: float = 1.0, duration: Optional[Sequence[float]] = None,
+                 priorities: Optional[Sequence[str]] = None):
+        if duration is not None:
+            low, mode, high = (float(value) for value in duration)
+            if not 0 < low <= mode <= high:
+                raise ValueError(f"Task {id}: duration must satisfy 0 < min <= mode <= max")
+            duration = (low, mode, high)
+        if not weight > 0:
+            raise ValueError(f"Task {id}: weight must be positive")
+        priorities = tuple(priorities) if priorities else tuple(PRIORITY_CONFIG)
+        unknown = set(priorities) - set(PRIORITY_CONFIG)
+        if unknown:
+            raise ValueError(f"Task {id}: unknown priorities {sorted(unknown)}")
+        self.id = id
+        self.name = name
+        self.category = category
+        self.tags = tuple(tags)
+        self.weight = float(weight)
+        self.duration = duration
+        self.priorities = priorities
+
+    def __repr__(self) -> str:
+        return f"Task({self.id!r}, {self.name!r}, {self.category!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Task) and self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return (self.id, self.name, self.category, self.tags, self.weight, self.duration,
+                self.priorities)
+
+    def estimate_index(self, rng: Any, multiplier: float = 1.0) -> int:
+        """
+        TIME_ESTIMATES index for a task without a duration: a random one,
+        scaled by the priority multiplier and clamped to the longest
+        """
+        base_time_idx = rng.randint(0, len(TIME_ESTIMATES) - 1)
+        return min(len(TIME_ESTIMATES) - 1, int(base_time_idx * multiplier))
+
+    def estimate(self, rng: Any, multiplier: float = 1.0) -> float:
+        """
+        Minutes drawn from the task's triangular duration, scaled by a
+        priority multiplier (TIME_ESTIMATE_MINUTES without a duration)
+        """
+        if self.duration is None:
+            return TIME_ESTIMATE_MINUTES[self.estimate_index(rng, multiplier)]
+        low, mode, high = self.duration
+        return rng.triangular(low, high, mode) * multiplier
+
+    def time_estimate(self, rng: Any, multiplier: float = 1.0) -> str:
+        """
+        Display label of a drawn estimate
+        """
+        if self.duration is None:
+            return TIME_ESTIMATES[self.estimate_index(rng, multiplier)]
+        return format_minutes(self.estimate(rng, multiplier))
+
+
+def format_minutes(minutes: float) -> str:
+    """
+    '45 min', '1 hour', '1.5 hours': 5-minute steps below an hour, 15 above
+    """
+    rounded = max(5, int(round(minutes / 5)) * 5)
+    if rounded < 60:
+        return f"{rounded} min"
+    hours = round(minutes / 15) / 4
+    return f"{hours:g} hour" if hours == 1 else f"{hours:g} hours"
+
+
+class AliasTable:
+    """
+    Vose alias table: O(n) to build, O(1) per weighted draw
+    """
+    def __init__(self, items: Sequence[Any], weights: Sequence[float]):
+        if not items:
+            raise ValueError("An alias table needs at least one item")
+        count = len(items)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        self.items = list(items)
+        self.weights = array("d", weights)
+        self.uniform = len(set(self.weights)) == 1
+        self.prob = array("d", [1.0]) * count
+        self.alias = array("l", range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding and keeps prob 1, alias itself
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def draw_index(self, rng: Any) -> int:
+        i = int(rng.random() * len(self.items))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def draw(self, rng: Any) -> Any:
+        return self.items[self.draw_index(rng)]
+
+    def sample(self, rng: Any, k: int) -> List[Any]:
+        """
+        k distinct items, each draw weighted among the items not yet drawn
+        """
+        count = len(self.items)
+        if self.uniform:
+            return rng.sample(self.items, min(k, count))
+        if k >= count:
+            order = list(range(count))
+            rng.shuffle(order)
+            return [self.items[i] for i in order]
+        chosen: List[int] = []
+        seen = set()
+        if k > count * _LINEAR_SHARE:
+            return self._linear_sample(rng, k, chosen, seen)
+        for _ in range(_MAX_REDRAWS * k):
+            i = self.draw_index(rng)
+            if i not in seen:
+                seen.add(i)
+                chosen.append(i)
+                if len(chosen) == k:
+                    return [self.items[i] for i in chosen]
+        # A few items hold almost all the weight: finish with a linear draw
+        return self._linear_sample(rng, k, chosen, seen)
+
+    def _linear_sample(self, rng: Any, k: int, chosen: List[int], seen: set) -> List[Any]:
+        # Weighted sampling without replacement over the items not yet
+        # chosen by random keys u ** (1 / weight) (Efraimidis-Spirakis)
+        rest = [i for i in range(len(self.items)) if i not in seen]
+        rest.sort(key=lambda i: rng.random() ** (1.0 / self.weights[i]), reverse=True)
+        return [self.items[i] for i in chosen + rest[:k - len(chosen)]]
+
+
+class TaskCatalog:
+    """
+    An immutable set of tasks with an alias table per (category, priority)
+    """
+    def __init__(self, tasks: Iterable[Task], version: Any = "builtin",
+                 previous: Optional["TaskCatalog"] = None):
+        self.version = version
+        self.tasks: Dict[str, Task] = {}
+        by_category: Dict[str, List[Task]] = {}
+        for task in tasks:
+            if task.id in self.tasks:
+                raise ValueError(f"Duplicate task id: {task.id}")
+            self.tasks[task.id] = task
+            by_category.setdefault(task.category, []).append(task)
+        if not by_category:
+            raise ValueError("The task catalog is empty")
+        self.categories = list(by_category)
+        self.default_category = "Work" if "Work" in by_category else self.categories[0]
+
+        self._category_tasks = {category: tuple(tasks) for category, tasks in by_category.items()}
+        self._tables: Dict[Tuple[str, Optional[str]], AliasTable] = {}
+        self.rebuilt: List[str] = []
+        for category, category_tasks in self._category_tasks.items():
+            if previous is not None and previous._category_tasks.get(category) == category_tasks:
+                self._tables.update({key: table for key, table in previous._tables.items()
+                                     if key[0] == category})
+                continue
+            self.rebuilt.append(category)
+            self._tables[(category, None)] = AliasTable(
+                category_tasks, [task.weight for task in category_tasks])
+            for priority in PRIORITY_CONFIG:
+                eligible = [task for task in category_tasks if priority in task.priorities]
+                if eligible:
+                    self._tables[(category, priority)] = AliasTable(
+                        eligible, [task.weight for task in eligible])
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __repr__(self) -> str:
+        return f"TaskCatalog({len(self.tasks)} tasks, {len(self.categories)} categories)"
+
+    def table(self, category: str, priority: Optional[str] = None) -> AliasTable:
+        """
+        Alias table for a category and priority; unknown categories use the
+        default one and priorities without eligible tasks the whole category
+        """
+        if category not in self._category_tasks:
+            category = self.default_category
+        return self._tables.get((category, priority)) or self._tables[(category, None)]
+
+    def sample(self, category: str, priority: Optional[str], k: int, rng: Any) -> List[Task]:
+        return self.table(category, priority).sample(rng, k)
+
+
+# --- Loading ---
+def _task_from_record(record: Dict[str, Any], index: int) -> Task:
+    duration = record.get("duration")
+    if isinstance(duration, dict):
+        duration = (duration["min"], duration.get("mode", duration["min"]), duration["max"])
+    elif isinstance(duration, (int, float)):
+        duration = (duration, duration, duration)
+    return Task(str(record.get("id", index)), record["name"], record["category"],
+                record.get("tags") or (), record.get("weight", 1.0), duration,
+                record.get("priorities"))
+
+def _split(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+def read_catalog_file(path: str) -> List[Task]:
+    """
+    Tasks from a JSON (.json) or SQLite (any other extension) catalog file
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as stream:
+            data = json.load(stream)
+        records = data["tasks"] if isinstance(data, dict) else data
+        return [_task_from_record(record, i) for i, record in enumerate(records)]
+
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT id, name, category, tags, weight, duration_min, "
+                            "duration_mode, duration_max, priorities FROM tasks "
+                            "ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+    return [Task(str(id), name, category, _split(tags), weight,
+                 None if low is None else (low, mode, high), _split(priorities))
+            for id, name, category, tags, weight, low, mode, high, priorities in rows]
+
+def write_catalog_file(tasks: Iterable[Task], path: str) -> None:
+    """
+    Write tasks as a JSON (.json) or SQLite catalog file
+    """
+    if path.endswith(".json"):
+        records = [{"id": task.id, "name": task.name, "category": task.category,
+                    "tags": list(task.tags), "weight": task.weight,
+                    "priorities": list(task.priorities),
+                    **({"duration": dict(zip(("min", "mode", "max"), task.duration))}
+                       if task.duration is not None else {})}
+                   for task in tasks]
+        with open(path, "w", encoding="utf-8") as stream:
+            json.dump({"tasks": records}, stream, ensure_ascii=False)
+        return
+
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.executescript(_SQLITE_SCHEMA)
+            conn.execute("DELETE FROM tasks")
+            conn.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(task.id, task.name, task.category, ",".join(task.tags), task.weight,
+                  *(task.duration or (None, None, None)), ",".join(task.priorities))
+                 for task in tasks])
+    finally:
+        conn.close()
+
+def builtin_catalog() -> TaskCatalog:
+    """
+    Catalog of the DAILY_TASKS lists: equal weights, every priority, no
+    durations (TIME_ESTIMATES labels)
+    """
+    return TaskCatalog(Task(f"{category.lower()}-{i:02d}", name, category)
+                       for category, names in DAILY_TASKS.items()
+                       for i, name in enumerate(names))
+
+def _file_stamp(path: str) -> Tuple[int, ...]:
+    stamp: Tuple[int, ...] = ()
+    # SQLite writers in WAL mode only touch the -wal file until a checkpoint
+    for name in (path, path + "-wal"):
+        try:
+            stat = os.stat(name)
+        except FileNotFoundError:
+            continue
+        stamp += (stat.st_mtime_ns, stat.st_size)
+    return stamp
+
+
+class CatalogStore:
+    """
+    The current catalog, reloaded in the background when its file changes
+    """
+    def __init__(self, path: Optional[str] = DEFAULT_CATALOG_PATH,
+                 check_interval: float = CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._next_check = time.monotonic() + check_interval
+        self._reloading = False
+        self._failed_stamp: Optional[Tuple[int, ...]] = None
+        if path is None:
+            self._catalog = builtin_catalog()
+        else:
+            # The first load blocks: there is nothing to serve before it
+            stamp = _file_stamp(path)
+            self._catalog = TaskCatalog(read_catalog_file(path), version=stamp)
+
+    def current(self) -> TaskCatalog:
+        """
+        The catalog to use now; starts a background reload when the file
+        changed, without waiting for it
+        """
+        if self.path is not None and time.monotonic() >= self._next_check:
+            self.reload(wait=False)
+        return self._catalog
+
+    def reload(self, wait: bool = True) -> bool:
+        """
+        Reload if the file changed since the current catalog was built;
+        returns whether a reload was started
+        """
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            stamp = _file_stamp(self.path) if self.path is not None else None
+            if self._reloading or not stamp or stamp in (self._catalog.version, self._failed_stamp):
+                return False
+            self._reloading = True
+        worker = threading.Thread(target=self._reload, args=(stamp,), name="task-catalog-reload",
+                                  daemon=True)
+        worker.start()
+        if wait:
+            worker.join()
+        return True
+
+    def _reload(self, stamp: Tuple[int, ...]) -> None:
+        try:
+            self._catalog = TaskCatalog(read_catalog_file(self.path), version=stamp,
+                                        previous=self._catalog)
+            self.last_error = None
+        except (OSError, ValueError, KeyError, TypeError, sqlite3.Error) as exc:
+            # Keep serving the previous catalog and retry once the file changes again
+            self.last_error = repr(exc)
+            self._failed_stamp = stamp
+        finally:
+            self._reloading = False
+
+
+_STORE: Optional[CatalogStore] = None
+_STORE_LOCK = threading.Lock()
+
+def get_catalog_store() -> CatalogStore:
+    """
+    The process-wide catalog store, created on first use
+    """
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = CatalogStore()
+    return _STORE
+
+def get_task_catalog() -> TaskCatalog:
+    return get_catalog_store().current()
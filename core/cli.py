@@ -0,0 +1,276 @@
+"""
+Batch command line interface for the headless core.
+
+Records are read from files or stdin as JSON lines, a JSON array or CSV,
+processed one at a time and written back out as they are produced, so a
+batch of any size streams through in constant memory. Output is JSON
+lines, CSV or Parquet (see core.export), optionally compressed on the
+fly; both are taken from the -o file name when not given:
+
+    python -m core finance payroll.csv > results.jsonl
+    cat users.jsonl | python -m core todo --output-format csv
+    python -m core finance payroll.csv -o results.csv.gz
+
+Finance records may add ``report_currency`` and ``rate_date`` columns to
+convert the results (see core.fx), and JSON records may give salary,
+expenses or savings_goal as ``[[amount, currency], ...]`` lines.
+
+The ``roster`` command instead treats each input as one roster of names
+and writes a ``name,group`` CSV assignment, and ``todo-bulk`` generates
+lists for a whole staff table in vectorized chunks, one row per task.
+``plan`` packs each user's working days into a timed schedule (see
+core.planner), one row per task or meeting:
+
+    python -m core roster campus.txt --group-size 4 -o groups.csv
+    python -m core todo-bulk staff.csv --output-format parquet -o lists.parquet
+    python -m core plan staff.csv --days 5 --start-date 2026-10-19 -o plan.csv
+
+``statement`` reads bank transaction exports (see core.statements) and
+writes the financial calculator's results for every month:
+
+    python -m core statement transactions.csv --currency UGX -o monthly.csv
+"""
+import argparse
+import csv
+import json
+import sys
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .export import COMPRESSIONS, EXPORT_FORMATS, ExportWriter, detect_export
+from .finance import advanced_financial_calc
+from .groups import smart_group_generator
+from .todo import generate_daily_todo, generate_smart_todo
+
+Record = Dict[str, Any]
+
+
+# --- Record Handlers ---
+def _run_todo(record: Record) -> Record:
+    args = (str(record["user_name"]), record.get("category") or "Work",
+            record.get("priority") or "Medium")
+    if record.get("day"):
+        # A day makes the list reproducible, see generate_daily_todo
+        tasks, motivation = generate_daily_todo(*args, day=date.fromisoformat(str(record["day"])))
+    else:
+        tasks, motivation = generate_smart_todo(*args)
+    return {"user_name": record["user_name"], "tasks": tasks, "motivation": motivation}
+
+def _money(value: Any):
+    if isinstance(value, list):
+        return [(float(amount), str(currency)) for amount, currency in value]
+    return float(value or 0)
+
+def _run_finance(record: Record) -> Record:
+    return advanced_financial_calc(
+        _money(record["salary"]),
+        _money(record["expenses"]),
+        _money(record.get("savings_goal")),
+        record.get("currency") or "UGX",
+        record.get("tax_table") or None,
+        record.get("report_currency") or None,
+        record.get("rate_date") or None,
+    )
+
+def _run_groups(record: Record) -> Record:
+    names = record["names"]
+    if isinstance(names, list):
+        names = ",".join(str(name) for name in names)
+    groups = smart_group_generator(
+        names,
+        int(record.get("group_size") or 3),
+        record.get("shuffle_mode") or "Random",
+    )
+    return {"groups": groups}
+
+HANDLERS: Dict[str, Callable[[Record], Record]] = {
+    "todo": _run_todo,
+    "finance": _run_finance,
+    "groups": _run_groups,
+}
+
+
+# --- Input ---
+def _detect_format(path: str) -> str:
+    """
+    Guess the input format from the file extension; stdin defaults to JSON
+    """
+    lowered = path.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "json"
+
+def _read_json(stream: TextIO) -> Iterator[Record]:
+    """
+    Read either a JSON array or one JSON object per line
+    """
+    first_line = stream.readline()
+    while first_line and not first_line.strip():
+        first_line = stream.readline()
+    if first_line.lstrip().startswith("["):
+        yield from json.loads(first_line + stream.read())
+        return
+    yield from _read_jsonl([first_line], stream)
+
+def _read_jsonl(*sources: Iterable[str]) -> Iterator[Record]:
+    for source in sources:
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+
+def read_records(paths: List[str], input_format: str = "auto") -> Iterator[Record]:
+    """
+    Stream records from the given files, or from stdin when no path is given
+    """
+    for path in paths or ["-"]:
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            fmt = _detect_format(path) if input_format == "auto" else input_format
+            if fmt == "csv":
+                yield from csv.DictReader(stream)
+            elif fmt == "jsonl":
+                yield from _read_jsonl(stream)
+            else:
+                yield from _read_json(stream)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+# --- Entry Point ---
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m core",
+        description="Run the Personal Automation Hub core functions over a batch of records.",
+    )
+    parser.add_argument("command", choices=sorted(HANDLERS) + ["plan", "roster", "statement", "todo-bulk"],
+                        help="core function to run")
+    parser.add_argument("inputs", nargs="*", help="input files (default: stdin, '-' for stdin)")
+    parser.add_argument("--input-format", choices=["auto", "json", "jsonl", "csv"], default="auto")
+    parser.add_argument("--output-format", choices=EXPORT_FORMATS, default=None,
+                        help="default: from the -o file name, else jsonl (csv for the "
+                             "plan, roster, statement and todo-bulk commands)")
+    parser.add_argument("--compression", choices=sorted(COMPRESSIONS), default=None,
+                        help="compress csv/jsonl output (default: from the -o file name)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    roster = parser.add_argument_group("roster options")
+    roster.add_argument("--group-size", type=int, default=3)
+    roster.add_argument("--shuffle-mode", default="Random",
+                        choices=["Random", "Alphabetical", "Reverse"])
+    roster.add_argument("--seed", type=int, default=None,
+                        help="seed for the roster Random mode, todo-bulk and plan")
+    plan = parser.add_argument_group("plan options")
+    plan.add_argument("--days", type=int, default=5, help="working days to plan per user")
+    plan.add_argument("--start-date", type=date.fromisoformat, default=None,
+                      help="first day to plan, YYYY-MM-DD (default: today)")
+    plan.add_argument("--weekends", action="store_true", help="plan Saturdays and Sundays too")
+    statement = parser.add_argument_group("statement options")
+    statement.add_argument("--currency", default="UGX")
+    statement.add_argument("--tax-table", default=None, help="tax table id (default: by currency)")
+    statement.add_argument("--savings-goal", type=float, default=0.0)
+    statement.add_argument("--report-currency", default=None,
+                           help="convert each month's results at that month's rates (see core.fx)")
+    statement.add_argument("--rules", default=None,
+                           help="JSON categorisation rules (default: HUB_STATEMENT_RULES or built in)")
+    statement.add_argument("--date-format", default=None,
+                           help="strptime format of the date column (default: detected)")
+    statement.add_argument("--month-first", action="store_true",
+                           help="read ambiguous numeric dates as month/day")
+    statement.add_argument("--gross-income", action="store_true",
+                           help="deposits are gross pay; do not gross them up through the tax table")
+    statement.add_argument("--no-cache", action="store_true",
+                           help="always parse, without the on-disk statement cache")
+    return parser
+
+def _run_todo_bulk(args: argparse.Namespace, writer: ExportWriter) -> int:
+    from .bulk_todo import BULK_COLUMNS, iter_bulk_todo
+
+    writer.columns = BULK_COLUMNS
+    for chunk in iter_bulk_todo(read_records(args.inputs, args.input_format), seed=args.seed):
+        writer.write_chunk(chunk)
+    return 0
+
+def _run_plan(args: argparse.Namespace, writer: ExportWriter) -> int:
+    from .planner import PLAN_COLUMNS, iter_plan_batch, week_days
+
+    days = week_days(args.start_date or date.today(), args.days, args.weekends)
+    writer.columns = PLAN_COLUMNS
+    for chunk in iter_plan_batch(read_records(args.inputs, args.input_format), days,
+                                 seed=args.seed):
+        writer.write_chunk(chunk)
+    return 0
+
+def _run_roster(args: argparse.Namespace, writer: ExportWriter) -> int:
+    # NumPy is only needed for the roster command
+    from .roster import stream_group_assignment
+
+    writer.columns = ["name", "group"]
+    for path in args.inputs or ["-"]:
+        source = sys.stdin if path == "-" else path
+        assignment = stream_group_assignment(source, args.group_size, args.shuffle_mode,
+                                             seed=args.seed)
+        for chunk in assignment.iter_chunks():
+            writer.write_chunk(chunk)
+    return 0
+
+def _run_statement(args: argparse.Namespace, writer: ExportWriter) -> int:
+    from .batch import FINANCIAL_COLUMNS
+    from .statements import DEFAULT_CACHE_DIR, StatementParser, load_rules, load_statement
+
+    rules = load_rules(args.rules) if args.rules else None
+    writer.columns = ["month"] + FINANCIAL_COLUMNS
+    for path in args.inputs or ["-"]:
+        parser = StatementParser(rules, date_format=args.date_format, dayfirst=not args.month_first)
+        if path == "-":
+            # stdin cannot be hashed before it is parsed
+            statement = load_statement(sys.stdin.buffer, parser, cache_dir=None)
+        else:
+            statement = load_statement(path, parser,
+                                       cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+        writer.write_chunk(statement.financials(args.savings_goal, args.currency, args.tax_table,
+                                                gross_up=not args.gross_income,
+                                                report_currency=args.report_currency))
+        if statement.skipped:
+            print(f"{path}: skipped {statement.skipped} rows without a valid date or amount",
+                  file=sys.stderr)
+    return 0
+
+def _run_records(args: argparse.Namespace, writer: ExportWriter) -> int:
+    handler = HANDLERS[args.command]
+    failures = 0
+    for index, record in enumerate(read_records(args.inputs, args.input_format), 1):
+        try:
+            result = handler(record)
+        except (KeyError, TypeError, ValueError) as exc:
+            failures += 1
+            print(f"record {index}: {exc!r}", file=sys.stderr)
+            continue
+        writer.write_records([result])
+    return 1 if failures else 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    runners = {"plan": _run_plan, "roster": _run_roster, "statement": _run_statement,
+               "todo-bulk": _run_todo_bulk}
+    fmt, compression = args.output_format, args.compression
+    if args.output != "-":
+        detected_format, detected_compression = detect_export(args.output)
+        fmt = fmt or detected_format
+        compression = compression or detected_compression
+    fmt = fmt or ("csv" if args.command in runners else "jsonl")
+    if fmt == "parquet" and compression is not None:
+        parser.error("parquet files are compressed per column; drop --compression")
+
+    if args.output == "-":
+        sys.stdout.flush()
+        target = sys.stdout.buffer
+    else:
+        target = args.output
+    with ExportWriter(target, fmt=fmt, compression=compression) as writer:
+        status = runners.get(args.command, _run_records)(args, writer)
+    if target is sys.stdout.buffer:
+        target.flush()
+    return status
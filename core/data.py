@@ -0,0 +1,85 @@
+"""
+Static catalogs shared by the Personal Automation Hub core functions
+"""
+
+# --- Enhanced Data Structures ---
+DAILY_TASKS = {
+    "Work": [
+        "Check emails", 
+        "Attend meetings", 
+        "Complete project tasks", 
+        "Review daily reports", 
+        "Team standup",
+        "Update project documentation",
+        "Code review session",
+        "Client communication",
+        "Weekly planning",
+        "Performance analysis"
+    ],
+    "Study": [
+        "Review lecture notes", 
+        "Complete assignments", 
+        "Practice coding", 
+        "Read course materials", 
+        "Study group session",
+        "Research project topics",
+        "Prepare for exams",
+        "Online course modules",
+        "Academic writing",
+        "Lab experiments"
+    ],
+    "Personal": [
+        "Exercise", 
+        "Meal prep", 
+        "Call family", 
+        "Read a book", 
+        "Plan tomorrow",
+        "Grocery shopping",
+        "House cleaning",
+        "Personal reflection",
+        "Hobby time",
+        "Social activities"
+    ],
+    "Creative": [
+        "Write in journal", 
+        "Learn new skill", 
+        "Work on side project", 
+        "Practice hobby", 
+        "Brainstorm ideas",
+        "Digital art creation",
+        "Music practice",
+        "Creative writing",
+        "Photography session",
+        "Design exploration"
+    ]
+}
+
+MOTIVATIONAL_QUOTES = [
+    "Work smarter, not harder. 💪",
+    "Automate the boring stuff, enjoy life! 🚀",
+    "One hour saved is one more for yourself tomorrow. ⏰",
+    "Let technology work for you! 🤖",
+    "Consistency beats intensity. Small steps daily! 📈",
+    "Progress, not perfection. 🎯",
+    "Your future self will thank you. 🙏",
+    "Make it happen! ⚡",
+    "Dream big, start small, move fast. 🏃‍♂️",
+    "Success is automated habits. 🔄",
+    "Innovation distinguishes between a leader and a follower. 🌟",
+    "The best time to plant a tree was 20 years ago. The second best time is now. 🌳",
+    "Don't wait for opportunity. Create it. 🔥",
+    "Excellence is not a skill, it's an attitude. ✨",
+    "The future belongs to those who believe in the beauty of their dreams. 🌈"
+]
+
+# Priority levels with their corresponding time multipliers and the value
+# of completing a task at that level (the day planner weighs tasks by it)
+PRIORITY_CONFIG = {
+    "High": {"emoji": "🔴", "multiplier": 1.5, "value": 3.0},
+    "Medium": {"emoji": "🟡", "multiplier": 1.0, "value": 2.0},
+    "Low": {"emoji": "🟢", "multiplier": 0.7, "value": 1.0}
+}
+
+# Time estimates for different types of tasks
+TIME_ESTIMATES = ["15 min", "30 min", "45 min", "1 hour", "1.5 hours", "2 hours", "3 hours"]
+TIME_ESTIMATE_MINUTES = [15, 30, 45, 60, 90, 120, 180]
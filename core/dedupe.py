@@ -0,0 +1,243 @@
+"""
+Near-duplicate detection for roster names.
+
+Exact duplicates (case, spacing, Unicode forms) are already dropped by
+groups.normalize_name. This module flags the spellings that survive it,
+such as 'Sarah Léon' / 'Sarah Leon', 'Leon Sarah' or 'Sara Leon', as
+clusters for review.
+
+1. Every name is folded: normalized, accents stripped, a few Latin letters
+   transliterated (ß -> ss, ø -> o, ...) and its words sorted. Names with
+   equal folded keys are one cluster without any comparison.
+2. Each distinct folded key is fingerprinted by a MinHash signature over
+   its character trigrams, computed for all keys at once as NumPy arrays
+   of code points.
+3. The signature is cut into bands (locality-sensitive hashing). Keys that
+   share a whole band in some band are candidate pairs, found by sorting
+   band hashes, so pairs are never enumerated over all n^2 names.
+4. Candidates whose signatures agree on too few hashes (the MinHash
+   estimate of their Jaccard similarity) are dropped in one vectorized
+   pass; the rest are verified by their exact trigram Jaccard similarity,
+   and verified pairs are joined into clusters.
+
+With the default 16 bands of 4 hashes, a pair at Jaccard 0.7 becomes a
+candidate with probability about 0.98 and one at 0.3 with about 0.12.
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .groups import normalize_name
+
+# MinHash signature layout: BANDS bands of ROWS_PER_BAND hashes
+BANDS = 16
+ROWS_PER_BAND = 4
+
+# Trigram Jaccard similarity from which two names are flagged
+DEFAULT_THRESHOLD = 0.7
+
+# Folded names are fingerprinted on at most this many characters
+MAX_NAME_CHARS = 64
+
+# Band buckets larger than this are only linked to their sorted neighbours,
+# which keeps the candidate count linear for very common spellings
+MAX_BUCKET = 32
+
+# Names fingerprinted (or candidate pairs estimated) per NumPy pass, bounding memory
+SIGNATURE_CHUNK = 1 << 15
+
+# Candidates whose estimated similarity falls this far below the threshold
+# are dropped without exact verification (about two standard deviations of
+# the estimate over 64 hashes)
+ESTIMATE_MARGIN = 0.12
+
+# Latin letters NFKD does not decompose
+_TRANSLITERATION = str.maketrans({
+    "ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "ł": "l", "đ": "d", "ð": "d",
+    "þ": "th", "ı": "i", "ŀ": "l", "ħ": "h", "ŧ": "t",
+})
+
+_HASH_SEEDS = np.random.default_rng(0x5EED).integers(1, 2 ** 63, size=(2, BANDS * ROWS_PER_BAND),
+                                                     dtype=np.uint64)
+# Odd multipliers combining a band's hashes into one sort key
+_BAND_MIX = np.random.default_rng(0xBA2D).integers(1, 2 ** 63, size=ROWS_PER_BAND,
+                                                   dtype=np.uint64) | np.uint64(1)
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def fold_name(name: str) -> str:
+    """
+    Comparison form of a name: normalize_name without accents, with
+    transliterated letters, punctuation as spaces and words sorted
+    """
+    key = normalize_name(name)
+    if not key.isascii():
+        key = "".join(char for char in unicodedata.normalize("NFKD", key)
+                      if not unicodedata.combining(char))
+        key = key.translate(_TRANSLITERATION)
+    return " ".join(sorted(_SEPARATORS.sub(" ", key).split()))
+
+def trigram_codes(keys: Sequence[str]) -> np.ndarray:
+    """
+    One uint64 per character trigram of ' key ', one row per key. Rows are
+    padded to the longest key by repeating their first trigram, which
+    leaves every minimum unchanged.
+    """
+    padded = np.array([f" {key[:MAX_NAME_CHARS]} " for key in keys])
+    if padded.dtype.itemsize < 12:
+        # At least three characters wide, so an empty key has a trigram column too
+        padded = padded.astype("<U3")
+    chars = padded.view(np.uint32).reshape(len(keys), -1).astype(np.uint64)
+    # Code points fit in 21 bits, so three of them pack into one integer
+    codes = (chars[:, :-2] << np.uint64(42)) | (chars[:, 1:-1] << np.uint64(21)) | chars[:, 2:]
+    return np.where(chars[:, 2:] != 0, codes, codes[:, :1])
+
+def minhash_signatures(keys: Sequence[str]) -> np.ndarray:
+    """
+    (len(keys), BANDS * ROWS_PER_BAND) uint32 MinHash signatures over trigrams
+    """
+    multipliers, offsets = _HASH_SEEDS
+    signatures = np.empty((len(keys), multipliers.size), dtype=np.uint32)
+    for start in range(0, len(keys), SIGNATURE_CHUNK):
+        codes = trigram_codes(keys[start:start + SIGNATURE_CHUNK])
+        block = signatures[start:start + len(codes)]
+        with np.errstate(over="ignore"):
+            for k in range(multipliers.size):
+                # Multiply-shift hashing to 32 bits, wrapping modulo 2^64
+                hashed = (codes * multipliers[k] + offsets[k]) >> np.uint64(32)
+                block[:, k] = hashed.min(axis=1)
+    return signatures
+
+def candidate_pairs(signatures: np.ndarray, min_estimate: float = 0.0) -> np.ndarray:
+    """
+    (m, 2) index pairs i < j sharing all hashes of at least one band, and
+    whose estimated similarity (see estimated_similarity) is at least min_estimate
+    """
+    count = len(signatures)
+    found = []
+    for band in range(BANDS):
+        rows = signatures[:, band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].astype(np.uint64)
+        with np.errstate(over="ignore"):
+            keys = (rows * _BAND_MIX).sum(axis=1)
+        order = np.argsort(keys)
+        ordered = keys[order]
+        same = ordered[1:] == ordered[:-1]
+        if not same.any():
+            continue
+        # Bucket id and position inside the bucket for every sorted entry
+        bucket = np.concatenate([[0], np.cumsum(~same)])
+        starts = np.flatnonzero(np.concatenate([[True], ~same]))
+        sizes = np.diff(np.append(starts, count))
+        position = np.arange(count) - starts[bucket]
+        big = sizes[bucket] > MAX_BUCKET
+        for gap in range(1, min(int(sizes.max()), MAX_BUCKET)):
+            left = np.flatnonzero(position[:count - gap] + gap < sizes[bucket[:count - gap]])
+            if gap > 1:
+                left = left[~big[left]]
+            if not len(left):
+                break
+            pairs = np.stack([order[left], order[left + gap]], axis=1)
+            if min_estimate > 0:
+                pairs = pairs[estimated_similarity(signatures, pairs) >= min_estimate]
+            found.append(pairs)
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(found), axis=1)
+    # Pairs found in several bands once each
+    flat = np.unique(pairs[:, 0] * count + pairs[:, 1])
+    return np.stack([flat // count, flat % count], axis=1)
+
+def estimated_similarity(signatures: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+    """
+    MinHash estimate of each pair's Jaccard similarity: the share of equal hashes
+    """
+    estimate = np.empty(len(pairs))
+    for start in range(0, len(pairs), SIGNATURE_CHUNK):
+        part = pairs[start:start + SIGNATURE_CHUNK]
+        estimate[start:start + len(part)] = (signatures[part[:, 0]] == signatures[part[:, 1]]).mean(axis=1)
+    return estimate
+
+def trigram_jaccard(left: str, right: str) -> float:
+    """
+    Jaccard similarity of the character trigram sets of two folded names
+    """
+    grams_left, grams_right = _trigrams(left), _trigrams(right)
+    union = len(grams_left | grams_right)
+    return len(grams_left & grams_right) / union if union else 1.0
+
+def _trigrams(key: str) -> set:
+    padded = f" {key[:MAX_NAME_CHARS]} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _components(count: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Smallest member index of each node's connected component
+    """
+    labels = np.arange(count)
+    if not len(pairs):
+        return labels
+    left, right = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, low)
+        np.minimum.at(updated, right, low)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def find_near_duplicates(names: Sequence[str], threshold: float = DEFAULT_THRESHOLD
+                         ) -> List[List[int]]:
+    """
+    Clusters of names that look like the same person, as lists of indices
+    into ``names`` (each sorted, clusters ordered by their first index).
+    Only clusters of two or more names are returned.
+    """
+    if not 0.0 < threshold <= 1.0:
+        raise ValueError("The similarity threshold must be in (0, 1]")
+    # Step 1: names with the same folded key
+    key_index: Dict[str, int] = {}
+    folded = np.fromiter((key_index.setdefault(fold_name(name), len(key_index)) for name in names),
+                         dtype=np.int64, count=len(names))
+    keys = list(key_index)
+    if len(keys) <= 1:
+        return [list(range(len(names)))] if len(names) > 1 else []
+
+    # Steps 2-4: near-identical folded keys
+    signatures = minhash_signatures(keys)
+    pairs = candidate_pairs(signatures, threshold - ESTIMATE_MARGIN)
+    if len(pairs):
+        similar = np.fromiter((trigram_jaccard(keys[i], keys[j]) >= threshold
+                               for i, j in pairs.tolist()), dtype=bool, count=len(pairs))
+        pairs = pairs[similar]
+    key_cluster = _components(len(keys), pairs)
+
+    # Back to name indices: clusters of the names' folded keys
+    cluster = key_cluster[folded]
+    flagged = np.flatnonzero(np.bincount(cluster, minlength=len(keys))[cluster] > 1)
+    if not len(flagged):
+        return []
+    order = flagged[np.argsort(cluster[flagged], kind="stable")]
+    bounds = np.flatnonzero(np.diff(cluster[order])) + 1
+    clusters = [members.tolist() for members in np.split(order, bounds)]
+    clusters.sort(key=lambda members: members[0])
+    return clusters
+
+def merge_near_duplicates(names: Sequence[str], clusters: Sequence[Sequence[int]]) -> List[str]:
+    """
+    names without the later members of each cluster (the first spelling is kept)
+    """
+    dropped = {index for members in clusters for index in members[1:]}
+    return [name for index, name in enumerate(names) if index not in dropped]
+
+def describe_clusters(names: Sequence[str], clusters: Sequence[Sequence[int]],
+                      limit: Optional[int] = None) -> List[List[str]]:
+    """
+    The spellings in each cluster, optionally only the first ``limit`` clusters
+    """
+    return [[names[index] for index in members] for members in clusters[:limit]]
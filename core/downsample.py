@@ -0,0 +1,54 @@
+"""
+Shape-preserving downsampling for chart series.
+
+Largest-Triangle-Three-Buckets (LTTB) keeps the first and last points and,
+for each of the (threshold - 2) equal buckets in between, the point that
+forms the largest triangle with the previously kept point and the average
+of the next bucket. Peaks and dips survive, so a multi-year daily series
+can be sent to the browser as a few thousand points that look the same.
+"""
+from typing import Tuple
+
+import numpy as np
+
+# Upper bound on points sent to the browser per chart series
+MAX_CHART_POINTS = 2000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int = MAX_CHART_POINTS) -> np.ndarray:
+    """
+    Indices of the points LTTB keeps, in increasing order
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold < 3:
+        raise ValueError("threshold must be at least 3")
+    if n <= threshold:
+        return np.arange(n)
+
+    # Bucket edges over the points between the first and the last
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # The last bucket is compared against the final point itself
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        px, py = x[previous], y[previous]
+        area = np.abs((px - avg_x) * (y[start:stop] - py) - (px - x[start:stop]) * (avg_y - py))
+        previous = start + int(area.argmax())
+        kept[bucket + 1] = previous
+    return kept
+
+def lttb(x: np.ndarray, y: np.ndarray,
+         threshold: int = MAX_CHART_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsampled (x, y); series at or under the threshold are returned as is
+    """
+    index = lttb_indices(x, y, threshold)
+    return np.asarray(x)[index], np.asarray(y)[index]
@@ -0,0 +1,342 @@
+"""
+Streaming export of hub results as CSV, JSON lines or Parquet.
+
+ExportWriter takes rows, records or column chunks and writes them to a
+path or binary stream as they arrive. CSV and JSON lines are compressed
+on the fly (gzip, bz2 or xz) by wrapping the output stream; Parquet is
+written one row group per chunk, with its own column compression
+(requires pyarrow). Nothing is buffered beyond one chunk, so a million
+row export needs the memory of a chunk, not of the file.
+
+The format and compression can be taken from a file name:
+
+    with ExportWriter("groups.csv.gz", ["name", "group"]) as writer:
+        writer.write_rows(assignment.iter_rows())
+
+Helpers cover the hub's result shapes: export_groups (nested lists or a
+RosterAssignment), export_todo_lists (results of the todo handler) and
+export_finance (advanced_financial_calc dicts, or the column dicts of
+advanced_financial_calc_batch chunks).
+"""
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import math
+import os
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+# Stream compressions for CSV and JSON lines, by file suffix
+COMPRESSIONS = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}
+
+# Parquet column codec when none is given
+PARQUET_COMPRESSION = "zstd"
+
+# Rows buffered per Parquet row group when rows arrive one at a time
+EXPORT_CHUNK = 65536
+
+MIME_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson",
+              "parquet": "application/vnd.apache.parquet",
+              "gzip": "application/gzip", "bz2": "application/x-bzip2", "xz": "application/x-xz"}
+
+_ENCODE = json.JSONEncoder(ensure_ascii=False).encode
+
+ExportTarget = Union[str, "os.PathLike[str]", BinaryIO]
+
+# Text written per underlying write; compressors are fed in blocks of this size
+TEXT_BUFFER = 1 << 20
+
+# gzip level 6 (the gzip tool's default) compresses several times faster than 9
+_OPENERS = {
+    "gzip": lambda stream: gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=6),
+    "bz2": lambda stream: bz2.BZ2File(stream, mode="wb"),
+    "xz": lambda stream: lzma.LZMAFile(stream, mode="wb"),
+}
+
+
+def detect_export(path: str) -> Tuple[str, Optional[str]]:
+    """
+    (format, compression) from a file name such as 'groups.csv.gz'
+    """
+    lowered = os.fspath(path).lower()
+    compression = next((name for name, suffix in COMPRESSIONS.items()
+                        if lowered.endswith(suffix)), None)
+    if compression is not None:
+        lowered = lowered[:-len(COMPRESSIONS[compression])]
+    if lowered.endswith(".parquet"):
+        return "parquet", compression
+    if lowered.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl", compression
+    return "csv", compression
+
+def export_file_name(stem: str, fmt: str, compression: Optional[str] = None) -> str:
+    """
+    'stem.fmt' plus the compression suffix for CSV and JSON lines
+    """
+    name = f"{stem}.{fmt}"
+    return name + COMPRESSIONS[compression] if compression and fmt != "parquet" else name
+
+def export_mime_type(fmt: str, compression: Optional[str] = None) -> str:
+    return MIME_TYPES[compression if compression and fmt != "parquet" else fmt]
+
+def jsonable(value: Any) -> Any:
+    # Strict JSON: non-finite floats (e.g. an unreachable months_to_goal) become null
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(item) for item in value]
+    return value
+
+def _is_column(value: Any) -> bool:
+    return isinstance(value, (list, tuple)) or getattr(value, "ndim", 0) > 0
+
+def _is_plain(values: Any) -> bool:
+    """
+    Whether a column's values need no conversion for CSV or JSON: no nested
+    lists or dicts and no non-finite floats
+    """
+    kind = getattr(getattr(values, "dtype", None), "kind", None)
+    if kind is not None and kind != "O":
+        # A NumPy column: only floats can hold inf or nan
+        return kind != "f" or bool(abs(values).max(initial=0.0) < math.inf)
+    return not any(isinstance(value, (list, tuple, dict))
+                   or (isinstance(value, float) and not math.isfinite(value))
+                   for value in (values if _is_column(values) else [values]))
+
+def _column_values(values: Any, length: int) -> List[Any]:
+    # Scalars (e.g. the batch calculator's currency) repeat down the chunk
+    if not _is_column(values):
+        return [values] * length
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+class ExportWriter:
+    """
+    Chunk-by-chunk writer for one export file.
+
+    ``columns`` fixes the column order; without it the columns of the first
+    record or chunk are used. Use as a context manager, or call close().
+    """
+    def __init__(self, target: ExportTarget, columns: Optional[Sequence[str]] = None,
+                 fmt: Optional[str] = None, compression: Optional[str] = None,
+                 chunk_rows: int = EXPORT_CHUNK):
+        if fmt is None:
+            if not isinstance(target, (str, os.PathLike)):
+                raise ValueError("The export format is required when writing to a stream")
+            fmt, detected = detect_export(target)
+            compression = compression or detected
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}")
+        if fmt != "parquet" and compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression!r}; use one of {', '.join(COMPRESSIONS)}")
+        self.fmt = fmt
+        self.compression = compression
+        self.columns = list(columns) if columns is not None else None
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        self._target = target
+        self._owned: List[Any] = []
+        self._text: Optional[io.TextIOWrapper] = None
+        self._csv = None
+        self._parquet = None
+        self._pending: List[Sequence[Any]] = []
+        if fmt != "parquet":
+            self._open_text()
+
+    def _open_text(self) -> None:
+        stream = self._target
+        if isinstance(stream, (str, os.PathLike)):
+            stream = open(stream, "wb")
+            self._owned.append(stream)
+        if self.compression is not None:
+            stream = _OPENERS[self.compression](stream)
+            self._owned.append(stream)
+        self._text = io.TextIOWrapper(io.BufferedWriter(stream, TEXT_BUFFER) if self.compression
+                                      else stream, encoding="utf-8", newline="")
+
+    def __enter__(self) -> "ExportWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # --- Input shapes ---
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Write rows ordered like ``columns``; returns the rows accepted
+        (Parquet buffers them up to chunk_rows, see rows_written)
+        """
+        if self.columns is None:
+            raise ValueError("Rows need the columns to be given up front")
+        if self.fmt == "parquet":
+            count = 0
+            for row in rows:
+                self._pending.append(row)
+                count += 1
+                if len(self._pending) >= self.chunk_rows:
+                    self._flush_pending()
+            return count
+        return self._write_text_rows(rows)
+
+    def write_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write dicts, e.g. advanced_financial_calc results; returns the rows written
+        """
+        records = iter(records)
+        if self.columns is None:
+            first = next(records, None)
+            if first is None:
+                return 0
+            self.columns = list(first)
+            records = _prepend(first, records)
+        columns = self.columns
+        return self.write_rows([record.get(column) for column in columns] for record in records)
+
+    def write_chunk(self, chunk: Dict[str, Any]) -> int:
+        """
+        Write a dict of equally long columns (lists or NumPy arrays; scalars
+        are repeated) as one block; returns the rows written
+        """
+        if self.columns is None:
+            self.columns = list(chunk)
+        length = next((len(values) for values in chunk.values() if _is_column(values)), 0)
+        if self.fmt == "parquet":
+            self._flush_pending()
+            return self._write_parquet({
+                column: chunk[column] if _is_column(chunk[column]) else [chunk[column]] * length
+                for column in self.columns})
+        plain = all(_is_plain(chunk[column]) for column in self.columns)
+        return self._write_text_rows(zip(*(_column_values(chunk[column], length)
+                                           for column in self.columns)), plain)
+
+    # --- Formats ---
+    def _write_text_rows(self, rows: Iterable[Sequence[Any]], plain: bool = False) -> int:
+        # plain rows (see _is_plain) are written without per-value conversion
+        count = 0
+        if self.fmt == "csv":
+            if self._csv is None:
+                self._csv = csv.writer(self._text)
+                self._csv.writerow(self.columns)
+            if plain:
+                rows = list(rows)
+                self._csv.writerows(rows)
+                self.rows_written += len(rows)
+                return len(rows)
+            for row in rows:
+                self._csv.writerow([json.dumps(jsonable(value), ensure_ascii=False)
+                                    if isinstance(value, (list, tuple, dict)) else value
+                                    for value in row])
+                count += 1
+        else:
+            write = self._text.write
+            columns = self.columns
+            convert = (lambda record: record) if plain else jsonable
+            for row in rows:
+                write(_ENCODE(convert(dict(zip(columns, row)))) + "\n")
+                count += 1
+        self.rows_written += count
+        return count
+
+    def _flush_pending(self) -> None:
+        if self._pending:
+            rows, self._pending = self._pending, []
+            self._write_parquet({column: [row[i] for row in rows]
+                                 for i, column in enumerate(self.columns)})
+
+    def _write_parquet(self, columns: Dict[str, Any]) -> int:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from exc
+
+        table = pa.table({name: pa.array(values) for name, values in columns.items()})
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self._target, table.schema,
+                                             compression=self.compression or PARQUET_COMPRESSION)
+        elif not table.schema.equals(self._parquet.schema):
+            # Later chunks may infer another type (e.g. all-null); keep the first schema
+            table = table.cast(self._parquet.schema)
+        self._parquet.write_table(table)
+        self.rows_written += table.num_rows
+        return table.num_rows
+
+    def close(self) -> None:
+        if self.fmt == "parquet":
+            self._flush_pending()
+            if self._parquet is None and self.columns is not None:
+                # An empty export is still a valid file with the columns
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                self._parquet = pq.ParquetWriter(self._target, pa.schema(
+                    [(column, pa.string()) for column in self.columns]))
+            if self._parquet is not None:
+                self._parquet.close()
+                self._parquet = None
+            return
+        if self._text is not None:
+            if self._csv is None and self.fmt == "csv" and self.columns is not None:
+                csv.writer(self._text).writerow(self.columns)
+            self._text.flush()
+            # Detach so closing the wrapper does not close a caller's stream
+            self._text.detach()
+            self._text = None
+        for stream in reversed(self._owned):
+            stream.close()
+        self._owned = []
+
+def _prepend(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    yield first
+    yield from rest
+
+
+# --- Hub Results ---
+def export_groups(groups: Any, target: ExportTarget, fmt: Optional[str] = None,
+                  compression: Optional[str] = None) -> int:
+    """
+    Write a name,group assignment (group numbers start at 1) from
+    smart_group_generator's nested lists or a RosterAssignment
+    """
+    with ExportWriter(target, ["name", "group"], fmt, compression) as writer:
+        if hasattr(groups, "iter_chunks"):
+            for chunk in groups.iter_chunks():
+                writer.write_chunk(chunk)
+        else:
+            writer.write_rows((name, number) for number, members in enumerate(groups, 1)
+                              for name in members)
+    # Counted after closing, which flushes any rows Parquet still buffers
+    return writer.rows_written
+
+def export_todo_lists(results: Iterable[Dict[str, Any]], target: ExportTarget,
+                      fmt: Optional[str] = None, compression: Optional[str] = None) -> int:
+    """
+    Write to-do lists, one row per task, from {'user_name', 'tasks',
+    'motivation'} results (the todo handler's output)
+    """
+    rows = ((result["user_name"], position, task, result.get("motivation", ""))
+            for result in results
+            for position, task in enumerate(result["tasks"], 1))
+    with ExportWriter(target, ["user_name", "position", "task", "motivation"], fmt,
+                      compression) as writer:
+        writer.write_rows(rows)
+    return writer.rows_written
+
+def export_finance(results: Iterable[Dict[str, Any]], target: ExportTarget,
+                   fmt: Optional[str] = None, compression: Optional[str] = None) -> int:
+    """
+    Write financial results: advanced_financial_calc dicts, or column
+    chunks from advanced_financial_calc_batch (dicts of arrays)
+    """
+    with ExportWriter(target, fmt=fmt, compression=compression) as writer:
+        for result in results:
+            if any(_is_column(value) for value in result.values()):
+                writer.write_chunk(result)
+            else:
+                writer.write_records([result])
+    return writer.rows_written
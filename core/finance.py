@@ -0,0 +1,141 @@
+"""
+Financial calculator and health scoring
+"""
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .fx import DateLike, consolidate, load_rate_table
+from .tax import get_tax_table
+
+# A plain amount, or (amount, currency) lines in any currencies
+Amount = Union[float, Sequence[Tuple[float, str]]]
+
+# Results in money (converted to the report currency); the others are ratios, months or points
+MONETARY_KEYS = (
+    'salary', 'tax', 'net_salary', 'expenses', 'savings', 'savings_goal',
+    'projected_savings_6m', 'projected_savings_12m', 'emergency_fund_needed'
+)
+
+def _amount_in(value: Amount, currency: str, on: DateLike) -> float:
+    if isinstance(value, (int, float)):
+        return value
+    return consolidate(value, currency, on)
+
+def advanced_financial_calc(salary: Amount, expenses: Amount, savings_goal: Amount = 0, 
+                          currency: str = "UGX",
+                          tax_table: Optional[str] = None,
+                          report_currency: Optional[str] = None,
+                          rate_date: DateLike = None) -> Dict[str, Union[float, str]]:
+    """
+    Advanced financial calculator with comprehensive analysis
+
+    Tax uses the progressive bracket table given by id, or the default
+    table for the currency (see core.tax).
+
+    Amounts are in ``currency``, or lists of (amount, currency) lines that
+    are consolidated into it at the rates in force on rate_date (default:
+    the latest, see core.fx). With a report_currency, every monetary result
+    is converted into it and fx_rate is the rate used.
+    """
+    salary = _amount_in(salary, currency, rate_date)
+    expenses = _amount_in(expenses, currency, rate_date)
+    savings_goal = _amount_in(savings_goal, currency, rate_date)
+    if salary < 0 or expenses < 0 or savings_goal < 0:
+        raise ValueError("Financial values cannot be negative")
+    
+    # Tax calculation (progressive brackets)
+    table = get_tax_table(tax_table, currency)
+    tax = table.tax(salary)
+    net_salary = salary - tax
+    
+    # Basic savings calculation
+    savings = net_salary - expenses
+    
+    # Calculate percentages
+    savings_rate = (savings / salary * 100) if salary > 0 else 0
+    expense_rate = (expenses / salary * 100) if salary > 0 else 0
+    tax_rate_percent = (tax / salary * 100) if salary > 0 else 0
+    marginal_tax_rate_percent = table.marginal_rate(salary) * 100
+    
+    # Goal tracking
+    months_to_goal = (savings_goal / savings) if savings > 0 and savings_goal > 0 else float('inf')
+    
+    # Future projections
+    projected_savings_6m = savings * 6
+    projected_savings_12m = savings * 12
+    
+    # Financial health indicators
+    emergency_fund_needed = expenses * 6  # 6 months of expenses
+    emergency_fund_coverage = (savings / expenses) if expenses > 0 else float('inf')
+    
+    # Debt-to-income ratio (assuming expenses include debt payments)
+    debt_to_income = expense_rate
+    
+    # Financial health score (0-100)
+    health_score = calculate_financial_health_score(savings_rate, debt_to_income, emergency_fund_coverage)
+    
+    results = {
+        'salary': salary,
+        'tax': tax,
+        'net_salary': net_salary,
+        'expenses': expenses,
+        'savings': savings,
+        'savings_rate': savings_rate,
+        'expense_rate': expense_rate,
+        'tax_rate_percent': tax_rate_percent,
+        'marginal_tax_rate_percent': marginal_tax_rate_percent,
+        'tax_table': table.key,
+        'savings_goal': savings_goal,
+        'months_to_goal': months_to_goal,
+        'projected_savings_6m': projected_savings_6m,
+        'projected_savings_12m': projected_savings_12m,
+        'emergency_fund_needed': emergency_fund_needed,
+        'emergency_fund_coverage': emergency_fund_coverage,
+        'debt_to_income': debt_to_income,
+        'health_score': health_score,
+        'currency': currency,
+        'fx_rate': 1.0
+    }
+    if report_currency is not None and report_currency != currency:
+        fx_rate = load_rate_table().rate(currency, report_currency, rate_date)
+        for key in MONETARY_KEYS:
+            results[key] = results[key] * fx_rate
+        results['currency'] = report_currency
+        results['fx_rate'] = fx_rate
+    return results
+
+def calculate_financial_health_score(savings_rate: float, debt_to_income: float, 
+                                   emergency_coverage: float) -> float:
+    """
+    Calculate financial health score based on key metrics
+    """
+    score = 0
+    
+    # Savings rate scoring (40 points max)
+    if savings_rate >= 20:
+        score += 40
+    elif savings_rate >= 10:
+        score += 30
+    elif savings_rate >= 5:
+        score += 20
+    elif savings_rate > 0:
+        score += 10
+    
+    # Debt-to-income scoring (30 points max)
+    if debt_to_income <= 20:
+        score += 30
+    elif debt_to_income <= 30:
+        score += 25
+    elif debt_to_income <= 40:
+        score += 15
+    elif debt_to_income <= 50:
+        score += 10
+    
+    # Emergency fund scoring (30 points max)
+    if emergency_coverage >= 6:
+        score += 30
+    elif emergency_coverage >= 3:
+        score += 20
+    elif emergency_coverage >= 1:
+        score += 10
+    
+    return min(100, score)
@@ -0,0 +1,216 @@
+"""
+Currency conversion with dated exchange rates.
+
+Rates are loaded from a local JSON file (``fx_rates.json`` next to this
+module, or the file named by ``HUB_FX_RATES``): for each date, the units of
+every currency per one unit of the base currency. A rate applies from its
+date until the next entry, and a currency missing from an entry keeps its
+previous rate. The file is compiled once into sorted dates and a
+(dates, currencies) rate matrix, so a conversion is a binary search for the
+date plus one division: ``bisect`` and a memo for single amounts,
+``numpy.searchsorted`` and one gather for arrays of millions of amounts.
+NumPy is only imported by the array methods so the scalar API stays
+dependency free.
+"""
+import bisect
+import json
+import os
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .cache import TTLCache
+
+DEFAULT_RATES_PATH = os.environ.get(
+    "HUB_FX_RATES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fx_rates.json"))
+
+DateLike = Union[date, str, None]
+
+# Memoized (from, to, date) rates kept per table
+RATE_MEMO_SIZE = 4096
+
+
+def _as_date(on: DateLike) -> Optional[date]:
+    if on is None or type(on) is date:
+        return on
+    if isinstance(on, datetime):
+        return on.date()
+    return date.fromisoformat(str(on)[:10])
+
+
+class RateTable:
+    """
+    Compiled dated exchange rates, quoted as units per one ``base``
+    """
+    def __init__(self, base: str, entries: Dict[str, Dict[str, float]]):
+        if not entries:
+            raise ValueError("The exchange rate table has no dates")
+        self.base = base
+        self.dates = sorted(_as_date(day) for day in entries)
+        by_date = {_as_date(day): rates for day, rates in entries.items()}
+        self.currencies = [base] + sorted({currency for rates in entries.values()
+                                           for currency in rates} - {base})
+        self._index = {currency: i for i, currency in enumerate(self.currencies)}
+        # One row per date, carrying each currency's last known rate forward
+        self.rows: List[List[Optional[float]]] = []
+        last: List[Optional[float]] = [1.0] + [None] * (len(self.currencies) - 1)
+        for day in self.dates:
+            last = list(last)
+            for currency, rate in by_date[day].items():
+                if currency != base:
+                    if not rate > 0:
+                        raise ValueError(f"Exchange rate for {currency} on {day} must be positive")
+                    last[self._index[currency]] = float(rate)
+            self.rows.append(last)
+        self._memo = TTLCache(maxsize=RATE_MEMO_SIZE)
+        self._arrays: Optional[Tuple[Any, Any]] = None
+
+    def __repr__(self) -> str:
+        return (f"RateTable({self.base!r}, {len(self.currencies)} currencies, "
+                f"{self.dates[0]} to {self.dates[-1]})")
+
+    def currency_index(self, currency: str) -> int:
+        try:
+            return self._index[currency]
+        except KeyError:
+            raise ValueError(f"No exchange rate for {currency}") from None
+
+    # --- Scalar ---
+    def date_index(self, on: DateLike = None) -> int:
+        """
+        Row of the rates in force on a date (default: the latest rates)
+        """
+        on = _as_date(on)
+        if on is None:
+            return len(self.dates) - 1
+        i = bisect.bisect_right(self.dates, on) - 1
+        if i < 0:
+            raise ValueError(f"No exchange rates on or before {on} (rates start {self.dates[0]})")
+        return i
+
+    def rate(self, from_currency: str, to_currency: str, on: DateLike = None) -> float:
+        """
+        Units of to_currency per unit of from_currency on a date
+        """
+        if from_currency == to_currency:
+            return 1.0
+        key = (from_currency, to_currency, _as_date(on))
+        rate = self._memo.get(key)
+        if rate is None:
+            i = self.date_index(on)
+            row = self.rows[i]
+            to_rate = row[self.currency_index(to_currency)]
+            from_rate = row[self.currency_index(from_currency)]
+            if to_rate is None or from_rate is None:
+                missing = from_currency if from_rate is None else to_currency
+                raise ValueError(f"No {missing} exchange rate on or before {self.dates[i]}")
+            rate = to_rate / from_rate
+            self._memo.set(key, rate)
+        return rate
+
+    def convert(self, amount: float, from_currency: str, to_currency: str,
+                on: DateLike = None) -> float:
+        return amount * self.rate(from_currency, to_currency, on)
+
+    # --- Vectorized ---
+    def _compiled(self):
+        if self._arrays is None:
+            import numpy as np
+            days = np.array(self.dates, dtype="datetime64[D]")
+            matrix = np.array([[np.nan if rate is None else rate for rate in row]
+                               for row in self.rows])
+            self._arrays = (days, matrix)
+        return self._arrays
+
+    def _codes(self, currencies):
+        """
+        Column index per currency; arrays are dict-encoded so each distinct
+        currency is looked up once
+        """
+        import numpy as np
+        if np.ndim(currencies) == 0:
+            return self.currency_index(str(currencies))
+        values = np.asarray(currencies, dtype=object).ravel()
+        seen: Dict[Any, int] = {}
+        codes = np.fromiter((seen.setdefault(value, len(seen)) for value in values),
+                            dtype=np.int64, count=values.size)
+        lookup = np.array([self.currency_index(str(value)) for value in seen], dtype=np.int64)
+        return lookup[codes].reshape(np.shape(currencies))
+
+    def rate_batch(self, from_currency, to_currency, on=None):
+        """
+        rate() for scalars or arrays of currencies and dates (anything
+        numpy.datetime64 accepts, or None for the latest rates), broadcast
+        together. As in rate(), rows converting a currency to itself are 1.0
+        without a lookup, whatever the currency or date.
+        """
+        import numpy as np
+        days, matrix = self._compiled()
+        if on is not None:
+            on = np.asarray(on, dtype="datetime64[D]")
+        shape = np.broadcast_shapes(np.shape(from_currency), np.shape(to_currency), np.shape(on))
+        same = np.asarray(from_currency, dtype=object) == np.asarray(to_currency, dtype=object)
+        if np.all(same):
+            return np.ones(shape)
+        convert = ~np.broadcast_to(same, shape)
+
+        def pick(values):
+            # Only the rows that convert, keeping scalars scalar
+            return values if np.ndim(values) == 0 else np.broadcast_to(values, shape)[convert]
+
+        if on is None:
+            rows = len(days) - 1
+        else:
+            on = pick(on)
+            rows = np.searchsorted(days, on, side="right") - 1
+            if np.any(rows < 0):
+                first = np.min(on)
+                raise ValueError(f"No exchange rates on or before {first} (rates start {days[0]})")
+        to_codes, from_codes = self._codes(pick(to_currency)), self._codes(pick(from_currency))
+        converted = matrix[rows, to_codes] / matrix[rows, from_codes]
+        if np.isnan(converted).any():
+            raise ValueError("Missing exchange rate for a currency on one of the dates")
+        rates = np.ones(shape)
+        rates[convert] = converted
+        return rates
+
+    def convert_batch(self, amounts, from_currency, to_currency, on=None):
+        import numpy as np
+        return np.asarray(amounts, dtype=np.float64) * self.rate_batch(from_currency, to_currency, on)
+
+
+@lru_cache(maxsize=8)
+def load_rate_table(path: str = DEFAULT_RATES_PATH) -> RateTable:
+    """
+    Compile a rates file once per path
+    """
+    with open(path, encoding="utf-8") as stream:
+        spec = json.load(stream)
+    return RateTable(spec["base"], spec["rates"])
+
+def convert(amount: float, from_currency: str, to_currency: str, on: DateLike = None,
+            path: str = DEFAULT_RATES_PATH) -> float:
+    """
+    amount in from_currency expressed in to_currency at the rates of a date
+    """
+    if from_currency == to_currency:
+        return amount
+    return load_rate_table(path).convert(amount, from_currency, to_currency, on)
+
+def consolidate(lines: Iterable[Tuple[float, str]], to_currency: str, on: DateLike = None,
+                path: str = DEFAULT_RATES_PATH) -> float:
+    """
+    Sum of (amount, currency) lines in one currency
+    """
+    return sum(convert(amount, currency, to_currency, on, path) for amount, currency in lines)
+
+def consolidate_batch(amounts, currencies, to_currency, rows, row_count: int, on=None,
+                      path: str = DEFAULT_RATES_PATH):
+    """
+    Per-row totals of mixed-currency lines: line i (amounts[i] in
+    currencies[i], dated on[i]) is added to row rows[i] of row_count rows,
+    all lines converted in one array operation
+    """
+    import numpy as np
+    converted = load_rate_table(path).convert_batch(amounts, currencies, to_currency, on)
+    return np.bincount(np.asarray(rows), weights=converted, minlength=row_count)
@@ -0,0 +1,237 @@
+"""
+Goal-seeking solver for savings targets with compounding.
+
+A savings balance grows by monthly deposits, starting at ``monthly_savings``
+and rising by ``savings_growth`` a year, and earns ``annual_return``
+compounded monthly (nominal rate / 12). After n months the balance is
+
+    balance * (1 + r)^n + monthly_savings * ((1 + r)^n - (1 + q)^n) / (r - q)
+
+with r and q the monthly return and growth rates. Each question is answered
+for whole arrays of scenarios at once:
+
+- months to goal: closed form (a logarithm) when savings do not grow,
+  bisection on n when they do;
+- savings needed by a deadline: closed form, the balance is linear in them;
+- maximum expenses and required salary by a deadline: closed forms on top
+  of that, through the tax table (TaxTable.gross_from_net_batch);
+- return needed by a deadline: bisection on the rate.
+
+Bisection runs a fixed number of halvings over every row together, so
+thousands of scenarios cost the same handful of array passes as one.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .batch import ArrayLike, as_float_array, tax_batch
+from .tax import get_tax_table
+
+# Search ranges and halvings for the bisection solvers
+MAX_MONTHS = 1200
+MAX_ANNUAL_RETURN = 1.0
+BISECTION_STEPS = 60
+
+GOAL_COLUMNS = [
+    'salary', 'net_salary', 'expenses', 'savings', 'savings_goal', 'months', 'annual_return',
+    'balance', 'savings_growth', 'months_to_goal', 'months_to_goal_simple',
+    'projected_balance', 'required_savings', 'max_expenses', 'required_salary',
+    'required_return', 'currency'
+]
+
+
+def _monthly_rates(annual_return: ArrayLike, savings_growth: ArrayLike):
+    annual_return = as_float_array(annual_return)
+    savings_growth = as_float_array(savings_growth)
+    if (annual_return < 0).any():
+        raise ValueError("annual_return cannot be negative")
+    if (savings_growth <= -1).any():
+        raise ValueError("savings_growth must be above -100%")
+    return annual_return / 12, np.expm1(np.log1p(savings_growth) / 12)
+
+def _annuity_factor(months: np.ndarray, rate: np.ndarray, growth: np.ndarray) -> np.ndarray:
+    """
+    Balance after n months of deposits starting at 1 and growing by growth a
+    month, earning rate a month
+    """
+    rate_growth = np.exp(months * np.log1p(rate))
+    deposit_growth = np.exp(months * np.log1p(growth))
+    close = np.abs(rate - growth) < 1e-12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (rate_growth - deposit_growth) / (rate - growth)
+    # Equal rates: the limit n (1 + r)^(n - 1)
+    return np.where(close, months * rate_growth / (1 + rate), factor)
+
+def _future_value(monthly_savings, months, rate, growth, balance) -> np.ndarray:
+    return (balance * np.exp(months * np.log1p(rate))
+            + monthly_savings * _annuity_factor(months, rate, growth))
+
+def _bisect(reaches, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Smallest x in [lo, hi] with reaches(x) true, for a reaches() that is
+    false then true along every row
+    """
+    for _ in range(BISECTION_STEPS):
+        mid = (lo + hi) / 2
+        hit = reaches(mid)
+        hi = np.where(hit, mid, hi)
+        lo = np.where(hit, lo, mid)
+    return hi
+
+
+# --- Solvers ---
+def future_value(monthly_savings: ArrayLike, months: ArrayLike, annual_return: ArrayLike = 0.0,
+                 balance: ArrayLike = 0.0, savings_growth: ArrayLike = 0.0) -> np.ndarray:
+    """
+    Balance after the given (possibly fractional) number of months
+    """
+    rate, growth = _monthly_rates(annual_return, savings_growth)
+    return _future_value(as_float_array(monthly_savings), as_float_array(months), rate,
+                         growth, as_float_array(balance))
+
+def months_to_goal(savings_goal: ArrayLike, monthly_savings: ArrayLike,
+                   annual_return: ArrayLike = 0.0, balance: ArrayLike = 0.0,
+                   savings_growth: ArrayLike = 0.0) -> np.ndarray:
+    """
+    Months until the balance reaches the goal: 0 if it already has, inf if
+    it never does (or not within MAX_MONTHS when savings grow). Growth only
+    applies to positive savings.
+    """
+    rate, growth = _monthly_rates(annual_return, savings_growth)
+    goal, savings, rate, growth, balance = np.broadcast_arrays(
+        as_float_array(savings_goal), as_float_array(monthly_savings), rate, growth,
+        as_float_array(balance))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Closed forms without growth: (G - P) / s, or log((G r + s) / (P r + s)) / log(1 + r)
+        simple = np.where(savings > 0, (goal - balance) / savings, np.inf)
+        compound = np.log((goal * rate + savings) / (balance * rate + savings)) / np.log1p(rate)
+    compound = np.where(balance * rate + savings > 0, compound, np.inf)
+    months = np.where(rate > 0, compound, simple)
+
+    grows = (growth != 0) & (savings > 0) & (goal > balance)
+    if grows.any():
+        args = (savings[grows], rate[grows], growth[grows], balance[grows])
+        target = goal[grows]
+        hi = np.full(target.shape, float(MAX_MONTHS))
+        reachable = _future_value(args[0], hi, *args[1:]) >= target
+        found = _bisect(lambda n: _future_value(args[0], n, *args[1:]) >= target,
+                        np.zeros_like(hi), hi)
+        months[grows] = np.where(reachable, found, np.inf)
+    return np.where(goal <= balance, 0.0, months)
+
+def required_savings(savings_goal: ArrayLike, months: ArrayLike, annual_return: ArrayLike = 0.0,
+                     balance: ArrayLike = 0.0, savings_growth: ArrayLike = 0.0) -> np.ndarray:
+    """
+    First month's savings that reach the goal in the given months; 0 when
+    the balance gets there on its own
+    """
+    rate, growth = _monthly_rates(annual_return, savings_growth)
+    months = as_float_array(months)
+    if (months <= 0).any():
+        raise ValueError("months must be positive")
+    balance = as_float_array(balance)
+    shortfall = as_float_array(savings_goal) - balance * np.exp(months * np.log1p(rate))
+    return np.maximum(shortfall / _annuity_factor(months, rate, growth), 0.0)
+
+def required_return(savings_goal: ArrayLike, monthly_savings: ArrayLike, months: ArrayLike,
+                    balance: ArrayLike = 0.0, savings_growth: ArrayLike = 0.0) -> np.ndarray:
+    """
+    Lowest annual return that reaches the goal in the given months: 0 if
+    none is needed, nan if even MAX_ANNUAL_RETURN does not (or savings are
+    negative, where a higher return need not help)
+    """
+    _, growth = _monthly_rates(0.0, savings_growth)
+    goal, savings, months, balance, growth = np.broadcast_arrays(
+        as_float_array(savings_goal), as_float_array(monthly_savings),
+        as_float_array(months), as_float_array(balance), growth)
+    reaches = lambda annual: _future_value(savings, months, annual / 12, growth, balance) >= goal
+    lo = np.zeros(goal.shape)
+    hi = np.full(goal.shape, MAX_ANNUAL_RETURN)
+    found = _bisect(reaches, lo, hi)
+    found = np.where(reaches(hi) & (savings >= 0), found, np.nan)
+    return np.where(reaches(lo), 0.0, found)
+
+
+# --- Scenarios ---
+def _gross_from_net_batch(net: np.ndarray, table_ids: Any) -> np.ndarray:
+    if np.ndim(table_ids) == 0:
+        return get_tax_table(table_ids).gross_from_net_batch(net)
+    gross = np.empty_like(net)
+    for key in set(table_ids.ravel().tolist()):
+        rows = table_ids == key
+        gross[rows] = get_tax_table(key).gross_from_net_batch(net[rows])
+    return gross
+
+def solve_goals(salary: ArrayLike, expenses: ArrayLike = None, savings_goal: ArrayLike = 0,
+                months: ArrayLike = 12, annual_return: ArrayLike = 0.0,
+                balance: ArrayLike = 0.0, savings_growth: ArrayLike = 0.0,
+                currency: ArrayLike = "UGX",
+                tax_table: Optional[ArrayLike] = None) -> Dict[str, Any]:
+    """
+    Every goal question for arrays of scenarios, broadcast together.
+
+    Pass arrays (or scalars) to get a dict of column arrays, or a pandas
+    DataFrame with salary/expenses[/savings_goal/months/annual_return/
+    balance/savings_growth/currency/tax_table] columns to get a DataFrame.
+    months is the deadline, and max_expenses / required_salary are nan
+    where no amount reaches the goal by then. months_to_goal_simple is the
+    calculator's goal / savings for comparison.
+    """
+    frame = None
+    if hasattr(salary, 'columns'):
+        frame = salary
+        columns = {'expenses': expenses, 'savings_goal': savings_goal, 'months': months,
+                   'annual_return': annual_return, 'balance': balance,
+                   'savings_growth': savings_growth, 'currency': currency,
+                   'tax_table': tax_table}
+        for name in columns:
+            if name in frame.columns:
+                columns[name] = frame[name]
+        expenses, savings_goal, months, annual_return, balance, savings_growth, currency, \
+            tax_table = columns.values()
+        salary = frame['salary']
+    if expenses is None:
+        raise ValueError("expenses is required")
+
+    salary, expenses, savings_goal, months, annual_return, balance, savings_growth = \
+        np.broadcast_arrays(*(as_float_array(values) for values in (
+            salary, expenses, savings_goal, months, annual_return, balance, savings_growth)))
+    if (salary < 0).any() or (expenses < 0).any() or (savings_goal < 0).any() \
+            or (balance < 0).any():
+        raise ValueError("Financial values cannot be negative")
+
+    tax, _, table_ids = tax_batch(salary, currency, tax_table)
+    net_salary = salary - tax
+    savings = net_salary - expenses
+    needed = required_savings(savings_goal, months, annual_return, balance, savings_growth)
+    max_expenses = net_salary - needed
+    with np.errstate(divide='ignore', invalid='ignore'):
+        months_simple = np.where((savings > 0) & (savings_goal > 0),
+                                 savings_goal / savings, np.inf)
+
+    results = {
+        'salary': salary,
+        'net_salary': net_salary,
+        'expenses': expenses,
+        'savings': savings,
+        'savings_goal': savings_goal,
+        'months': months,
+        'annual_return': annual_return,
+        'balance': balance,
+        'savings_growth': savings_growth,
+        'months_to_goal': months_to_goal(savings_goal, savings, annual_return, balance,
+                                         savings_growth),
+        'months_to_goal_simple': months_simple,
+        'projected_balance': future_value(savings, months, annual_return, balance,
+                                          savings_growth),
+        'required_savings': needed,
+        'max_expenses': np.where(max_expenses >= 0, max_expenses, np.nan),
+        'required_salary': _gross_from_net_batch(expenses + needed, table_ids),
+        'required_return': required_return(savings_goal, savings, months, balance,
+                                           savings_growth),
+        'currency': currency,
+    }
+    if frame is not None:
+        import pandas as pd
+        return pd.DataFrame(results, index=frame.index)
+    return results
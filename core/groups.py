@@ -0,0 +1,96 @@
+"""
+Smart group generation
+"""
+import random
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Number of names grouped between two progress reports
+PROGRESS_CHUNK = 10000
+
+def normalize_name(name: str) -> str:
+    """
+    Key under which two spellings count as the same name: NFKC-normalized,
+    case-folded, with runs of whitespace collapsed ('SARAH  LEON ' and
+    'Sarah Leon' share a key). Accent and transliteration variants are left
+    to core.dedupe.
+    """
+    if not name.isascii():
+        name = unicodedata.normalize("NFKC", name)
+    return " ".join(name.casefold().split())
+
+def dedupe_names(names: Iterable[str]) -> List[str]:
+    """
+    Names without duplicates (see normalize_name), first spelling kept, in order
+    """
+    unique: Dict[str, str] = {}
+    for name in names:
+        unique.setdefault(normalize_name(name), name)
+    return list(unique.values())
+
+def group_page(groups: Any, start: int, count: int) -> List[List[str]]:
+    """
+    ``count`` groups from group ``start`` of nested lists, a RosterAssignment
+    or BalancedGroups, without materializing the others
+    """
+    if hasattr(groups, "to_groups"):
+        return groups.to_groups(limit=count, start=start)
+    return groups[start:start + count]
+
+def find_groups(groups: Any, query: str) -> List[int]:
+    """
+    Zero-based indices of the groups (see group_page) with a member whose
+    name contains query, ignoring case and spacing
+    """
+    if hasattr(groups, "find_groups"):
+        return groups.find_groups(query)
+    needle = normalize_name(query)
+    return [index for index, members in enumerate(groups)
+            if any(needle in normalize_name(name) for name in members)]
+
+def smart_group_generator(names_str: str, group_size: int = 3, shuffle_mode: str = "Random",
+                          progress_callback: Optional[Callable[[int, int], None]] = None) -> List[List[str]]:
+    """
+    Enhanced group generator with multiple algorithms and validation
+
+    progress_callback, if given, is called as (names_grouped, total_names)
+    after every PROGRESS_CHUNK names so callers can report real progress.
+    """
+    if not names_str.strip():
+        return []
+    
+    if group_size < 1:
+        raise ValueError("Group size must be at least 1")
+    
+    # Parse and clean names
+    names = [name.strip() for name in names_str.split(",") if name.strip()]
+    
+    if not names:
+        return []
+    
+    # Remove duplicates (see normalize_name) while preserving order
+    names = dedupe_names(names)
+    
+    # Apply sorting based on shuffle mode
+    if shuffle_mode == "Alphabetical":
+        names.sort(key=str.lower)
+    elif shuffle_mode == "Reverse":
+        names.sort(key=str.lower, reverse=True)
+    else:  # Random
+        random.shuffle(names)
+    
+    # Create groups
+    groups = []
+    total = len(names)
+    next_report = PROGRESS_CHUNK
+    for i in range(0, total, group_size):
+        group = names[i:i + group_size]
+        groups.append(group)
+        if progress_callback is not None and i + group_size >= next_report:
+            progress_callback(min(i + group_size, total), total)
+            next_report += PROGRESS_CHUNK
+    
+    if progress_callback is not None:
+        progress_callback(total, total)
+    
+    return groups
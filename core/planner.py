@@ -0,0 +1,333 @@
+"""
+Time-boxed day planner.
+
+Plans work on numeric minutes instead of display labels. For each
+(user, day) the free time between day start and day end is split into
+gaps by the fixed meetings (clipped to the working day). Candidate tasks
+are drawn from the task catalog's alias table for the user's category and
+priority, as for their to-do list, with durations drawn like the to-do
+lists' estimates (core.bulk_todo.draw_minutes), rounded to SLOT_MINUTES
+slots. Each gap, largest first, is then filled by an exact 0/1 knapsack
+over the remaining candidates, maximizing the total value of the planned
+tasks: the priority's PRIORITY_CONFIG value times each task's catalog
+weight. The knapsack DP runs for all user-days of a batch at
+once as NumPy array operations over (user-days x capacity), so a week for
+thousands of users is planned in one pass per candidate and gap. Chosen
+tasks are ordered within their gap shortest first and timed back to back
+from the gap start.
+
+    python -m core plan staff.csv --days 5 --start-date 2026-10-19 -o plan.csv
+"""
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .bulk_todo import draw_minutes
+from .catalog import TaskCatalog, get_task_catalog
+from .data import PRIORITY_CONFIG
+
+# Planning resolution in minutes; durations are rounded to whole slots
+SLOT_MINUTES = 5
+
+# Candidates drawn for each planned day
+PLAN_CANDIDATES = 24
+
+# User-days planned per NumPy pass, bounding the DP's memory
+PLAN_CHUNK = 4096
+
+PLAN_COLUMNS = ["user_name", "day", "start", "end", "kind", "task", "priority", "minutes"]
+
+Meetings = Sequence[Tuple[Union[str, int], Union[str, int]]]
+
+# "HH:MM" for every minute of the day, indexed by minute
+_CLOCK = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60 + 1)], dtype=object)
+
+
+def parse_time(value: Union[str, int]) -> int:
+    """
+    Minutes since midnight from 'HH:MM' (or minutes as an int)
+    """
+    if isinstance(value, int):
+        minutes = value
+    else:
+        hours, _, mins = str(value).strip().partition(":")
+        try:
+            minutes = int(hours) * 60 + int(mins or 0)
+        except ValueError:
+            raise ValueError(f"Time must be HH:MM: {value!r}") from None
+    if not 0 <= minutes <= 24 * 60:
+        raise ValueError(f"Time outside the day: {value!r}")
+    return minutes
+
+def parse_meetings(value: Union[str, Meetings, None]) -> List[Tuple[int, int]]:
+    """
+    Meetings as (start, end) minutes, from pairs or a '10:00-11:00; 14:00-14:30' string
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        pairs = []
+        for part in value.replace(",", ";").split(";"):
+            if not part.strip():
+                continue
+            raw_start, _, raw_end = part.partition("-")
+            if not raw_start.strip() or not raw_end.strip():
+                raise ValueError(f"Meeting must be HH:MM-HH:MM: {part.strip()!r}")
+            pairs.append((raw_start, raw_end))
+        value = pairs
+    meetings = []
+    for pair in value:
+        if len(pair) != 2:
+            raise ValueError(f"Meeting must be a (start, end) pair: {pair!r}")
+        raw_start, raw_end = pair
+        start, end = parse_time(raw_start), parse_time(raw_end)
+        if end <= start:
+            raise ValueError(f"Meeting ends before it starts: {_CLOCK[start]}-{_CLOCK[end]}")
+        meetings.append((start, end))
+    return sorted(meetings)
+
+def free_gaps(day_start: int, day_end: int, meetings: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    (start, end) minutes of free time between meetings, at least one slot long
+    """
+    gaps = []
+    cursor = day_start
+    for start, end in sorted(meetings):
+        if start > cursor:
+            gaps.append((cursor, min(start, day_end)))
+        cursor = max(cursor, end)
+        if cursor >= day_end:
+            break
+    if cursor < day_end:
+        gaps.append((cursor, day_end))
+    return [(start, end) for start, end in gaps if end - start >= SLOT_MINUTES]
+
+
+# --- Solver ---
+def knapsack_batch(weights: np.ndarray, values: np.ndarray, capacity: np.ndarray,
+                   available: np.ndarray) -> np.ndarray:
+    """
+    Exact 0/1 knapsack for B independent problems at once.
+
+    weights (B, n) positive integer slots, values (B, n), capacity (B,)
+    slots, available (B, n) bool. Returns the (B, n) bool choice with the
+    highest total value per problem. Time and memory are O(n * B * C) for
+    the largest capacity C.
+    """
+    count, items = weights.shape
+    width = int(capacity.max(initial=0)) + 1
+    rows = np.arange(count)[:, None]
+    cols = np.arange(width)
+    best = np.zeros((count, width))
+    keep = np.zeros((items, count, width), dtype=bool)
+    for i in range(items):
+        source = cols - weights[:, i, None]
+        candidate = best[rows, np.maximum(source, 0)] + values[:, i, None]
+        take = (source >= 0) & available[:, i, None] & (candidate > best)
+        keep[i] = take
+        best = np.where(take, candidate, best)
+
+    chosen = np.zeros((count, items), dtype=bool)
+    remaining = capacity.astype(np.int64).copy()
+    for i in range(items - 1, -1, -1):
+        taken = keep[i, rows[:, 0], remaining]
+        chosen[:, i] = taken
+        remaining -= np.where(taken, weights[:, i], 0)
+    return chosen
+
+def assign_gaps(weights: np.ndarray, values: np.ndarray, available: np.ndarray,
+                gap_slots: np.ndarray) -> np.ndarray:
+    """
+    Gap index per candidate (-1 = not planned), filling each problem's
+    gaps largest first with an exact knapsack over what is left
+    """
+    assignment = np.full(weights.shape, -1, dtype=np.int64)
+    available = available.copy()
+    order = np.argsort(-gap_slots, axis=1, kind="stable")
+    rows = np.arange(len(gap_slots))
+    for rank in range(gap_slots.shape[1]):
+        gap = order[:, rank]
+        capacity = gap_slots[rows, gap]
+        active = capacity > 0
+        if not active.any():
+            break
+        chosen = knapsack_batch(weights[active], values[active], capacity[active],
+                                available[active])
+        block = np.zeros(weights.shape, dtype=bool)
+        block[active] = chosen
+        assignment[block] = np.repeat(gap, block.sum(axis=1))
+        available &= ~block
+    return assignment
+
+
+# --- Planning ---
+def plan_batch(records: Sequence[Dict[str, Any]], days: Sequence[date],
+               seed: Optional[int] = None,
+               catalog: Optional[TaskCatalog] = None) -> Dict[str, np.ndarray]:
+    """
+    Plan the given days for every record and return long-format columns
+    (see PLAN_COLUMNS), one row per planned task or meeting, ordered by
+    user, day and start time.
+
+    Records have user_name plus optional category, priority (default
+    Medium), day_start, day_end ('HH:MM', default 09:00-17:00) and meetings
+    (pairs or a '10:00-11:00; 14:00-14:30' string, repeated every day).
+    Meetings are clipped to the working day; those outside it are dropped.
+    """
+    catalog = catalog if catalog is not None else get_task_catalog()
+    sampler = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    width = PLAN_CANDIDATES
+
+    # One problem per (user, day): candidates and free gaps, padded to arrays
+    problems = []
+    for record in records:
+        user = str(record["user_name"])
+        if not user.strip():
+            raise ValueError("User name cannot be empty")
+        day_start = parse_time(record.get("day_start") or "09:00")
+        day_end = parse_time(record.get("day_end") or "17:00")
+        if day_end <= day_start:
+            raise ValueError(f"{user}: the day ends before it starts")
+        meetings = [(max(start, day_start), min(end, day_end))
+                    for start, end in parse_meetings(record.get("meetings"))
+                    if end > day_start and start < day_end]
+        gaps = free_gaps(day_start, day_end, meetings)
+        category = record.get("category") or "Work"
+        priority = record.get("priority") or "Medium"
+        if priority not in PRIORITY_CONFIG:
+            raise ValueError(f"Unknown priority: {priority}")
+        for day in days:
+            problems.append((user, day, meetings, gaps, priority,
+                             catalog.sample(category, priority, width, sampler)))
+
+    count = len(problems)
+    max_gaps = max((len(problem[3]) for problem in problems), default=0) or 1
+    durations = np.full((count, width, 3), np.nan)
+    multiplier = np.ones((count, width))
+    values = np.zeros((count, width))
+    available = np.zeros((count, width), dtype=bool)
+    gap_start = np.zeros((count, max_gaps), dtype=np.int64)
+    gap_slots = np.zeros((count, max_gaps), dtype=np.int64)
+    for row, (_, _, _, gaps, priority, candidates) in enumerate(problems):
+        multiplier[row] = PRIORITY_CONFIG[priority]["multiplier"]
+        value = PRIORITY_CONFIG[priority]["value"]
+        for col, task in enumerate(candidates):
+            if task.duration is not None:
+                durations[row, col] = task.duration
+            values[row, col] = value * task.weight
+            available[row, col] = True
+        for col, (start, end) in enumerate(gaps):
+            gap_start[row, col] = start
+            gap_slots[row, col] = (end - start) // SLOT_MINUTES
+
+    # Durations for every candidate in one draw, in whole slots of at least one
+    minutes, _ = draw_minutes(durations, multiplier, rng)
+    slots = np.maximum(1, np.rint(minutes / SLOT_MINUTES)).astype(np.int64)
+
+    assignment = np.full((count, width), -1, dtype=np.int64)
+    for start in range(0, count, PLAN_CHUNK):
+        part = slice(start, start + PLAN_CHUNK)
+        assignment[part] = assign_gaps(slots[part], values[part], available[part], gap_slots[part])
+    return _schedule_columns(problems, assignment, slots, gap_start)
+
+def _schedule_columns(problems: List[Tuple[Any, ...]], assignment: np.ndarray,
+                      slots: np.ndarray, gap_start: np.ndarray) -> Dict[str, np.ndarray]:
+    # Order planned tasks per (problem, gap) shortest first
+    rows, cols = np.nonzero(assignment >= 0)
+    gaps = assignment[rows, cols]
+    order = np.lexsort((slots[rows, cols], gaps, rows))
+    rows, cols, gaps = rows[order], cols[order], gaps[order]
+    durations = slots[rows, cols] * SLOT_MINUTES
+
+    # Back to back from the gap start: cumulative minutes within each (row, gap) run
+    ends = np.cumsum(durations)
+    new_run = np.ones(len(rows), dtype=bool)
+    new_run[1:] = (rows[1:] != rows[:-1]) | (gaps[1:] != gaps[:-1])
+    run_offset = np.maximum.accumulate(np.where(new_run, ends - durations, 0))
+    starts = gap_start[rows, gaps] + ends - durations - run_offset
+
+    # Meetings join the schedule as rows of their own
+    tasks = [problems[row][5][col] for row, col in zip(rows.tolist(), cols.tolist())]
+    meetings = [(row, start, end) for row, problem in enumerate(problems)
+                for start, end in problem[2]]
+    meeting_rows = np.array([row for row, _, _ in meetings], dtype=np.int64)
+    all_rows = np.concatenate([rows, meeting_rows])
+    all_starts = np.concatenate([starts, np.array([start for _, start, _ in meetings],
+                                                  dtype=np.int64)])
+    all_ends = np.concatenate([starts + durations, np.array([end for _, _, end in meetings],
+                                                            dtype=np.int64)])
+    users = np.array([problem[0] for problem in problems], dtype=object)
+    days = np.array([problem[1].isoformat() for problem in problems], dtype=object)
+    order = np.lexsort((all_starts, all_rows))
+    columns = {
+        "user_name": users[all_rows],
+        "day": days[all_rows],
+        "start": _CLOCK[all_starts],
+        "end": _CLOCK[all_ends],
+        "kind": np.array(["task"] * len(tasks) + ["meeting"] * len(meetings), dtype=object),
+        "task": np.array([task.name for task in tasks] + ["Meeting"] * len(meetings),
+                         dtype=object),
+        "priority": np.array([problems[row][4] for row in rows.tolist()] + [""] * len(meetings),
+                             dtype=object),
+        "minutes": all_ends - all_starts,
+    }
+    return {name: column[order] for name, column in columns.items()}
+
+def iter_plan_batch(records: Iterable[Dict[str, Any]], days: Sequence[date],
+                    chunk_size: int = PLAN_CHUNK // 8, seed: Optional[int] = None
+                    ) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    plan_batch over a stream of records, chunk_size users at a time
+    """
+    seeds = random.Random(seed)
+    chunk: List[Dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield plan_batch(chunk, days, seed=seeds.getrandbits(63))
+            chunk = []
+    if chunk:
+        yield plan_batch(chunk, days, seed=seeds.getrandbits(63))
+
+def plan_day(user_name: str, category: str = "Work", priority: str = "Medium",
+             day_start: str = "09:00", day_end: str = "17:00",
+             meetings: Union[str, Meetings, None] = None, day: Optional[date] = None,
+             seed: Optional[int] = None,
+             catalog: Optional[TaskCatalog] = None) -> List[Dict[str, Any]]:
+    """
+    Timed schedule for one day: a list of {start, end, kind, task, priority,
+    minutes} entries in time order, meetings included
+    """
+    return plan_week(user_name, category, priority, day_start, day_end, meetings,
+                     [day or date.today()], seed, catalog)
+
+def plan_week(user_name: str, category: str = "Work", priority: str = "Medium",
+              day_start: str = "09:00", day_end: str = "17:00",
+              meetings: Union[str, Meetings, None] = None,
+              days: Optional[Sequence[date]] = None, seed: Optional[int] = None,
+              catalog: Optional[TaskCatalog] = None) -> List[Dict[str, Any]]:
+    """
+    plan_day for several days (default: the next five weekdays from today)
+    """
+    days = list(days) if days is not None else week_days(date.today())
+    columns = plan_batch([{"user_name": user_name, "category": category, "priority": priority,
+                           "day_start": day_start, "day_end": day_end, "meetings": meetings}],
+                         days, seed, catalog)
+    keys = [key for key in PLAN_COLUMNS if key != "user_name"]
+    return [dict(zip(keys, values))
+            for values in zip(*(columns[key].tolist() for key in keys))]
+
+def week_days(start: date, count: int = 5, weekends: bool = False) -> List[date]:
+    """
+    The next count days from start, skipping weekends unless asked
+    """
+    days = []
+    current = start
+    while len(days) < count:
+        if weekends or current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
@@ -0,0 +1,115 @@
+"""
+Monte Carlo savings projection with percentile bands.
+
+Each month's salary and expenses vary independently around the entered
+amounts with normal shocks (standard deviation = volatility x amount), so
+a month's savings is itself normal with the combined spread and needs a
+single draw per path and month. All paths are simulated as one
+(months, paths) float32 array: one normal draw, one cumsum along the month
+axis, one row-wise sort for the percentile bands and a running "goal hit"
+mask per month. Results are cached per input set, so Streamlit reruns do
+not resimulate.
+"""
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+from .cache import TTLCache
+from .tax import get_tax_table
+
+DEFAULT_PATHS = 10000
+DEFAULT_HORIZON = 12
+DEFAULT_SEED = 0
+
+# Percentile bands reported per month
+PERCENTILES = (10, 50, 90)
+
+# Projections shared by every session; seeded inputs fully determine the result
+PROJECTION_CACHE = TTLCache(maxsize=256, ttl=60 * 60)
+
+
+def simulate_savings_paths(salary: float, expenses: float, months: int = DEFAULT_HORIZON,
+                           paths: int = DEFAULT_PATHS, salary_volatility: float = 0.05,
+                           expense_volatility: float = 0.10,
+                           seed: Optional[int] = DEFAULT_SEED, currency: str = "UGX",
+                           tax_table: Optional[str] = None) -> np.ndarray:
+    """
+    Cumulative savings for every month and path, shape (months, paths).
+
+    Tax is applied to the salary as in advanced_financial_calc before the
+    salary shock, so the mean path is the straight-line projection.
+    """
+    if salary < 0 or expenses < 0:
+        raise ValueError("Financial values cannot be negative")
+    if months < 1 or paths < 1:
+        raise ValueError("months and paths must be at least 1")
+    if salary_volatility < 0 or expense_volatility < 0:
+        raise ValueError("Volatility cannot be negative")
+
+    net_salary = salary - get_tax_table(tax_table, currency).tax(salary)
+    mean = net_salary - expenses
+    spread = math.hypot(net_salary * salary_volatility, expenses * expense_volatility)
+
+    savings = np.random.default_rng(seed).standard_normal((months, paths), dtype=np.float32)
+    savings *= np.float32(spread)
+    savings += np.float32(mean)
+    return np.cumsum(savings, axis=0, out=savings)
+
+def savings_projection(salary: float, expenses: float, savings_goal: float = 0,
+                       months: int = DEFAULT_HORIZON, paths: int = DEFAULT_PATHS,
+                       salary_volatility: float = 0.05, expense_volatility: float = 0.10,
+                       seed: Optional[int] = DEFAULT_SEED, currency: str = "UGX",
+                       tax_table: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Percentile bands of cumulative savings and the probability of having
+    reached savings_goal by each month.
+
+    Returns 'month' (1..months), 'p10'/'p50'/'p90', 'mean', the straight
+    line 'deterministic' projection and 'goal_probability' (fraction of
+    paths whose balance has hit the goal at or before that month; all zeros
+    without a goal). Seeded results come from PROJECTION_CACHE when
+    available; treat the returned arrays as read-only.
+    """
+    if savings_goal < 0:
+        raise ValueError("Financial values cannot be negative")
+    args = (float(salary), float(expenses), float(savings_goal), int(months), int(paths),
+            float(salary_volatility), float(expense_volatility), currency, tax_table)
+    if seed is None:
+        return _project(*args, seed=None)
+    return PROJECTION_CACHE.get_or_compute(args + (seed,), lambda: _project(*args, seed=seed))
+
+def _project(salary: float, expenses: float, savings_goal: float, months: int, paths: int,
+             salary_volatility: float, expense_volatility: float, currency: str,
+             tax_table: Optional[str], seed: Optional[int]) -> Dict[str, np.ndarray]:
+    cumulative = simulate_savings_paths(salary, expenses, months, paths, salary_volatility,
+                                        expense_volatility, seed, currency, tax_table)
+    month_index = np.arange(1, months + 1)
+    net_salary = salary - get_tax_table(tax_table, currency).tax(salary)
+    result = {
+        'month': month_index,
+        'mean': cumulative.mean(axis=1, dtype=np.float64),
+        'deterministic': (net_salary - expenses) * month_index,
+    }
+
+    # Goal reached by month m if the running balance hit it at any month <= m
+    goal_probability = np.zeros(months)
+    if savings_goal > 0:
+        reached = np.zeros(paths, dtype=bool)
+        goal = np.float32(savings_goal)
+        for month in range(months):
+            reached |= cumulative[month] >= goal
+            goal_probability[month] = np.count_nonzero(reached) / paths
+    result['goal_probability'] = goal_probability
+
+    # Linear-interpolated percentiles (as np.percentile); a full row sort
+    # is much faster than partitioning around several kth indices
+    cumulative.sort(axis=1)
+    position = np.array(PERCENTILES) / 100 * (paths - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, paths - 1)
+    weight = position - lower
+    for percentile, lo, hi, w in zip(PERCENTILES, lower, upper, weight):
+        low_values = cumulative[:, lo].astype(np.float64)
+        result[f'p{percentile}'] = low_values + (cumulative[:, hi] - low_values) * w
+    return result
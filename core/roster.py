@@ -0,0 +1,241 @@
+"""
+Streaming roster ingestion and compact group assignment.
+
+Large rosters are read from a file or iterator in fixed-size chunks instead
+of one comma-separated string. Names are kept in a single UTF-8 buffer with
+an offsets array, duplicates are found through 64-bit hashes of the
+normalized name (see groups.normalize_name), and the result is one int32
+group index per name rather than a list of lists of strings. Only names
+whose hash repeats are decoded again and compared by their normalized key,
+so a hash collision never merges two different names.
+"""
+import codecs
+import os
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from .groups import normalize_name
+
+# Characters read from a file per chunk
+READ_CHUNK = 1 << 18
+
+# Names decoded per chunk when an assignment is written out
+WRITE_CHUNK = 1 << 16
+
+# First fields (as normalize_name keys) that mark the first line as a CSV header
+HEADER_NAMES = {"name", "names", "full name", "student", "students", "student name"}
+
+RosterSource = Union[str, "os.PathLike[str]", TextIO, Iterable[str]]
+
+
+def _iter_chunks(source: RosterSource, chunk_size: int) -> Iterator[str]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8", newline="") as stream:
+            yield from _iter_chunks(stream, chunk_size)
+    elif hasattr(source, "read"):
+        # Binary streams (e.g. uploaded files) may split a UTF-8 character
+        # across chunks, so decode incrementally
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+    else:
+        # Any iterable of strings, e.g. lines or individual names; keep the
+        # items apart even when they carry no trailing separator
+        for item in source:
+            yield item
+            yield "\n"
+
+def _first_field_end(text: str) -> int:
+    ends = [end for end in (text.find(","), text.find("\n")) if end >= 0]
+    return min(ends) if ends else -1
+
+def iter_name_batches(source: RosterSource, chunk_size: int = READ_CHUNK,
+                      header: Optional[bool] = None) -> Iterator[List[str]]:
+    """
+    Yield lists of stripped, non-empty names from a roster separated by
+    commas and/or newlines, reading at most chunk_size characters at a time.
+
+    The first line is skipped as a header row when header is True, or when
+    header is None and its first field is a column title (see HEADER_NAMES).
+    """
+    carry = ""
+    check_header = header is not False
+    skip_line = False
+    for chunk in _iter_chunks(source, chunk_size):
+        text = (carry + chunk).replace("\r", "\n")
+        carry = ""
+        if check_header:
+            end = _first_field_end(text)
+            if end < 0:
+                carry = text
+                continue
+            check_header = False
+            skip_line = header or normalize_name(text[:end]) in HEADER_NAMES
+        if skip_line:
+            end = text.find("\n")
+            if end < 0:
+                continue
+            text = text[end + 1:]
+            skip_line = False
+        parts = text.replace("\n", ",").split(",")
+        carry = parts.pop()
+        names = [name for name in map(str.strip, parts) if name]
+        if names:
+            yield names
+    name = carry.strip()
+    if check_header and (header or normalize_name(name) in HEADER_NAMES):
+        return
+    if name and not skip_line:
+        yield [name]
+
+def iter_roster_names(source: RosterSource, chunk_size: int = READ_CHUNK,
+                      header: Optional[bool] = None) -> Iterator[str]:
+    """
+    Yield roster names one at a time, see iter_name_batches
+    """
+    for names in iter_name_batches(source, chunk_size, header):
+        yield from names
+
+
+class RosterAssignment:
+    """
+    Deduplicated roster names plus one group index per name.
+
+    Names are stored in input order (first occurrence wins) in one uint8
+    array of UTF-8 bytes; ``groups[i]`` is the zero-based group of the i-th name and
+    ``order`` lists name indices in grouped (shuffled or sorted) order.
+    """
+    def __init__(self, buffer: np.ndarray, offsets: np.ndarray, groups: np.ndarray,
+                 order: np.ndarray, group_size: int):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.groups = groups
+        self.order = order
+        self.group_size = group_size
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    @property
+    def num_groups(self) -> int:
+        return int(self.groups.max()) + 1 if len(self.groups) else 0
+
+    def name(self, index: int) -> str:
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+    def iter_rows(self) -> Iterator[Tuple[str, int]]:
+        """
+        (name, group number starting at 1) in input order
+        """
+        for chunk in self.iter_chunks():
+            yield from zip(chunk["name"], chunk["group"].tolist())
+
+    def iter_chunks(self, chunk_size: int = WRITE_CHUNK) -> Iterator[Dict[str, Any]]:
+        """
+        {'name': list of names, 'group': group numbers from 1} column chunks in input order
+        """
+        offsets = self.offsets
+        for start in range(0, len(self.groups), chunk_size):
+            stop = min(start + chunk_size, len(self.groups))
+            base = int(offsets[start])
+            data = self.buffer[base:offsets[stop]].tobytes()
+            bounds = (offsets[start:stop + 1] - base).tolist()
+            names = [data[begin:end].decode("utf-8") for begin, end in zip(bounds[:-1], bounds[1:])]
+            yield {"name": names, "group": self.groups[start:stop].astype(np.int64) + 1}
+
+    def to_groups(self, limit: Optional[int] = None, start: int = 0) -> List[List[str]]:
+        """
+        Nested lists in the smart_group_generator shape, optionally only
+        ``limit`` groups from group ``start`` (members keep their grouped order)
+        """
+        stop = None if limit is None else (start + limit) * self.group_size
+        order = self.order[start * self.group_size:stop]
+        groups: List[List[str]] = []
+        for position, index in enumerate(order.tolist()):
+            if position % self.group_size == 0:
+                groups.append([])
+            groups[-1].append(self.name(index))
+        return groups
+
+    def find_groups(self, query: str) -> List[int]:
+        """
+        Zero-based indices of the groups with a member whose name contains query
+        (compared as normalize_name keys)
+        """
+        needle = normalize_name(query)
+        found = set()
+        for start, chunk in zip(range(0, len(self), WRITE_CHUNK), self.iter_chunks()):
+            hits = [start + i for i, name in enumerate(chunk["name"]) if needle in normalize_name(name)]
+            found.update(self.groups[hits].tolist())
+        return sorted(found)
+
+
+def stream_group_assignment(source: RosterSource, group_size: int = 3,
+                            shuffle_mode: str = "Random", seed: Optional[int] = None,
+                            chunk_size: int = READ_CHUNK,
+                            header: Optional[bool] = None) -> RosterAssignment:
+    """
+    Read a roster in chunks (skipping a header row, see iter_name_batches),
+    drop duplicates (see normalize_name) and assign each remaining name a
+    group index using the given shuffle mode
+    """
+    if group_size < 1:
+        raise ValueError("Group size must be at least 1")
+
+    buffer = bytearray()
+    offsets = array("q", [0])
+    keys = array("q")
+    for names in iter_name_batches(source, chunk_size, header):
+        encoded = [name.encode("utf-8") for name in names]
+        ends = np.cumsum([len(data) for data in encoded], dtype=np.int64) + len(buffer)
+        buffer += b"".join(encoded)
+        offsets.frombytes(ends.tobytes())
+        keys.extend(map(hash, map(normalize_name, names)))
+
+    all_offsets = np.frombuffer(offsets, dtype=np.int64)
+    hashes = np.frombuffer(keys, dtype=np.int64)
+    # First occurrence of each key, back in input order; names sharing a
+    # hash are told apart by their keys
+    _, first, inverse, counts = np.unique(hashes, return_index=True, return_inverse=True,
+                                          return_counts=True)
+    kept = np.zeros(len(hashes), dtype=bool)
+    kept[first] = True
+    seen: Dict[str, int] = {}
+    for index in np.flatnonzero(counts[inverse.reshape(-1)] > 1).tolist():
+        name = bytes(buffer[all_offsets[index]:all_offsets[index + 1]]).decode("utf-8")
+        kept[index] = seen.setdefault(normalize_name(name), index) == index
+    keep = np.flatnonzero(kept)
+    del first, inverse, counts, seen
+
+    # Compact the name buffer down to the unique names
+    if len(keep) == len(hashes):
+        compact = np.frombuffer(buffer, dtype=np.uint8)
+        unique_offsets = all_offsets
+    else:
+        lengths = np.diff(all_offsets)
+        compact = np.frombuffer(buffer, dtype=np.uint8)[np.repeat(kept, lengths)]
+        unique_offsets = np.zeros(len(keep) + 1, dtype=np.int64)
+        np.cumsum(lengths[keep], out=unique_offsets[1:])
+    del buffer, offsets, keys, hashes, all_offsets, kept
+
+    count = len(keep)
+    if shuffle_mode in ("Alphabetical", "Reverse"):
+        lowered = [compact[start:end].tobytes().decode("utf-8").lower()
+                   for start, end in zip(unique_offsets[:-1].tolist(), unique_offsets[1:].tolist())]
+        order = np.array(sorted(range(count), key=lowered.__getitem__,
+                                reverse=shuffle_mode == "Reverse"), dtype=np.int64)
+        del lowered
+    else:  # Random
+        order = np.random.default_rng(seed).permutation(count)
+
+    groups = np.empty(count, dtype=np.int32)
+    groups[order] = np.arange(count, dtype=np.int64) // group_size
+    return RosterAssignment(compact, unique_offsets, groups, order.astype(np.int32), group_size)
@@ -0,0 +1,634 @@
+"""
+Bank statement ingestion for the financial calculator.
+
+A transaction export (a CSV file, possibly hundreds of MB covering several
+years) is read CHUNK_ROWS rows at a time, so memory is bounded by one
+chunk plus the monthly totals. Each chunk becomes typed NumPy columns:
+month index, float64 amount and category code.
+
+- Columns are found by their header (date, amount or debit/credit,
+  description and an optional DR/CR column), or given explicitly. Lines
+  before the header (account details) and the delimiter are detected.
+- Dates and descriptions repeat heavily, so each distinct string is parsed
+  or categorised once and looked up in a dict after that.
+- Categories come from ordered keyword rules (DEFAULT_RULES, or a JSON file
+  named by HUB_STATEMENT_RULES): the first rule matching the description
+  and the direction of the money wins. Unmatched money in and out is
+  "Other income" and "Other expenses".
+
+Chunks are summed into a months x categories matrix (MonthlyStatement)
+whose income and expense series feed advanced_financial_calc_batch month
+by month. load_statement caches that matrix on disk under a hash of the
+file's bytes, the rules and the parser options, so uploading the same
+export again skips parsing.
+"""
+import csv
+import gc
+import hashlib
+import io
+import itertools
+import json
+import os
+import re
+import zipfile
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch import advanced_financial_calc_batch
+from .tax import get_tax_table
+
+# Transactions parsed per chunk
+CHUNK_ROWS = 1 << 16
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "HUB_STATEMENT_CACHE", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                        "data", "statements"))
+
+DEFAULT_RULES_PATH = os.environ.get("HUB_STATEMENT_RULES")
+
+# Part of every cache key; bump it when parsing or the cache layout changes
+CACHE_VERSION = 1
+
+# Distinct descriptions (and dates) remembered between chunks
+MAX_CACHED_STRINGS = 1 << 17
+
+# Rows searched for the header, below any account details
+HEADER_SCAN = 20
+
+# Bytes hashed per read
+HASH_BLOCK = 1 << 20
+
+KINDS = ("income", "expense", "transfer")
+OTHER_INCOME = "Other income"
+OTHER_EXPENSES = "Other expenses"
+
+# Header names per column role, compared in lower case without "(...)" suffixes
+COLUMN_ALIASES = {
+    "date": ("date", "transaction date", "posted date", "posting date", "booking date",
+             "value date", "trans date", "txn date"),
+    "amount": ("amount", "transaction amount", "value", "net amount"),
+    "debit": ("debit", "debit amount", "debits", "withdrawal", "withdrawals", "money out",
+              "paid out"),
+    "credit": ("credit", "credit amount", "credits", "deposit", "deposits", "money in",
+               "paid in"),
+    "description": ("description", "details", "transaction details", "narrative", "narration",
+                    "memo", "payee", "merchant", "particulars", "reference"),
+    "direction": ("dr/cr", "cr/dr", "debit/credit", "credit/debit", "direction", "type"),
+}
+
+# Direction column values meaning money out; other values are ignored
+_DEBIT_MARKERS = frozenset({"d", "dr", "debit", "withdrawal", "out"})
+
+# Tried in order after ISO 8601; day-first or month-first numeric dates
+_DATE_FORMATS = {
+    True: ("%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y", "%d-%m-%y", "%d %b %Y", "%d-%b-%Y",
+           "%d %B %Y", "%d %b %y", "%b %d, %Y", "%B %d, %Y", "%Y/%m/%d"),
+    False: ("%m/%d/%Y", "%m-%d-%Y", "%m.%d.%Y", "%m/%d/%y", "%m-%d-%y", "%d %b %Y", "%d-%b-%Y",
+            "%d %B %Y", "%d %b %y", "%b %d, %Y", "%B %d, %Y", "%Y/%m/%d"),
+}
+
+_HEADER_NOISE = re.compile(r"\(.*?\)|[^\w/ ]")
+_AMOUNT_NOISE = re.compile(r"[^\d,.\-]")
+
+StatementSource = Union[str, "os.PathLike[str]", BinaryIO]
+
+
+# --- Categorisation Rules ---
+class CategoryRule:
+    """
+    Transactions whose description contains one of ``keywords`` at the start
+    of a word (case-insensitive) belong to ``category``. ``direction``
+    ('credit' for money in, 'debit' for money out) limits the rule to one
+    direction; None matches both.
+    """
+    def __init__(self, category: str, kind: str, keywords: Sequence[str],
+                 direction: Optional[str] = None):
+        if kind not in KINDS:
+            raise ValueError(f"Rule {category!r}: kind must be one of {', '.join(KINDS)}")
+        if direction not in (None, "credit", "debit"):
+            raise ValueError(f"Rule {category!r}: direction must be 'credit', 'debit' or null")
+        if not keywords:
+            raise ValueError(f"Rule {category!r} has no keywords")
+        self.category = category
+        self.kind = kind
+        self.keywords = tuple(keywords)
+        self.direction = direction
+        self.pattern = re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords)
+                                  + ")", re.IGNORECASE)
+
+    def __repr__(self) -> str:
+        return f"CategoryRule({self.category!r}, {self.kind!r}, {len(self.keywords)} keywords)"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"category": self.category, "kind": self.kind, "keywords": list(self.keywords),
+                "direction": self.direction}
+
+
+DEFAULT_RULES = (
+    CategoryRule("Transfers", "transfer", ("own account", "internal transfer", "between accounts",
+                                           "savings transfer", "transfer to savings")),
+    CategoryRule("Salary", "income", ("salary", "payroll", "wages", "pay run", "net pay"), "credit"),
+    CategoryRule("Interest", "income", ("interest", "dividend"), "credit"),
+    CategoryRule("Refunds", "expense", ("refund", "reversal", "chargeback", "cashback"), "credit"),
+    CategoryRule("Housing", "expense", ("rent", "mortgage", "landlord", "property"), "debit"),
+    CategoryRule("Utilities", "expense", ("electric", "umeme", "water", "gas bill", "internet",
+                                          "broadband", "airtime", "mobile data", "utility",
+                                          "yaka"), "debit"),
+    CategoryRule("Groceries", "expense", ("supermarket", "grocer", "shoprite", "carrefour", "tesco",
+                                          "walmart", "aldi", "lidl", "capital shoppers"), "debit"),
+    CategoryRule("Transport", "expense", ("uber", "bolt", "safeboda", "taxi", "fuel", "petrol",
+                                          "parking", "bus ", "railway", "train", "airline"),
+                 "debit"),
+    CategoryRule("Dining", "expense", ("restaurant", "cafe", "coffee", "pizza", "kfc",
+                                       "mcdonald", "takeaway", "java house"), "debit"),
+    CategoryRule("Health", "expense", ("pharmacy", "hospital", "clinic", "medical", "dental",
+                                       "insurance"), "debit"),
+    CategoryRule("Education", "expense", ("school", "tuition", "university", "college", "course"),
+                 "debit"),
+    CategoryRule("Entertainment", "expense", ("netflix", "spotify", "cinema", "dstv", "showmax",
+                                              "subscription"), "debit"),
+    CategoryRule("Loan Repayments", "expense", ("loan", "repayment", "card payment"), "debit"),
+    CategoryRule("Cash Withdrawals", "expense", ("atm", "cash withdrawal"), "debit"),
+    CategoryRule("Bank Fees", "expense", ("fee", "charge", "commission", "excise duty",
+                                          "ledger"), "debit"),
+)
+
+def load_rules(path: str) -> List[CategoryRule]:
+    """
+    Rules from a JSON list of {"category", "kind", "keywords", "direction"}
+    objects, in matching order
+    """
+    with open(path, encoding="utf-8") as stream:
+        spec = json.load(stream)
+    return [CategoryRule(rule["category"], rule["kind"], rule["keywords"], rule.get("direction"))
+            for rule in spec]
+
+def default_rules() -> Sequence[CategoryRule]:
+    return load_rules(DEFAULT_RULES_PATH) if DEFAULT_RULES_PATH else DEFAULT_RULES
+
+def rule_categories(rules: Sequence[CategoryRule]) -> Tuple[List[str], List[str]]:
+    """
+    Category names in rule order, then the two fallbacks, and the kind of each
+    """
+    kinds: Dict[str, str] = {}
+    for rule in rules:
+        if kinds.setdefault(rule.category, rule.kind) != rule.kind:
+            raise ValueError(f"Category {rule.category!r} is used with two kinds")
+    kinds.setdefault(OTHER_INCOME, "income")
+    kinds.setdefault(OTHER_EXPENSES, "expense")
+    return list(kinds), list(kinds.values())
+
+
+# --- Field Parsing ---
+def _header_key(name: str) -> str:
+    return " ".join(_HEADER_NOISE.sub(" ", name.lstrip("﻿").lower()).split())
+
+def find_columns(header: Sequence[str]) -> Optional[Dict[str, int]]:
+    """
+    Column index per role for a header row, or None if it has no date
+    column or neither an amount nor a debit/credit pair
+    """
+    keys = [_header_key(name) for name in header]
+    found: Dict[str, int] = {}
+    for role, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in keys:
+                found[role] = keys.index(alias)
+                break
+    if "date" not in found or not ("amount" in found or ("debit" in found and "credit" in found)):
+        return None
+    return found
+
+def parse_amount(text: str) -> float:
+    """
+    One amount as banks print it: currency signs, thousands separators,
+    '(12.50)', '12.50-' or '12.50 DR' for negatives and decimal commas
+    ('1.234,56'). NaN when there is no number.
+    """
+    text = text.strip()
+    negative = text.startswith("(") or text.endswith("-") or text.upper().endswith("DR")
+    digits = _AMOUNT_NOISE.sub("", text)
+    if digits.endswith("-"):
+        digits = digits[:-1]
+    if "," in digits:
+        if "." in digits and digits.rfind(",") < digits.rfind("."):
+            digits = digits.replace(",", "")
+        elif "." in digits or re.fullmatch(r"-?\d+,\d{1,2}", digits):
+            digits = digits.replace(".", "").replace(",", ".")
+        else:
+            digits = digits.replace(",", "")
+    try:
+        value = float(digits)
+    except ValueError:
+        return float("nan")
+    return -abs(value) if negative else value
+
+def _amount(value: str, blank: float) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return parse_amount(value) if value.strip() else blank
+
+def _amounts(values: List[str], blank: float) -> np.ndarray:
+    try:
+        # Plain numbers convert in one NumPy call
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        return np.fromiter((_amount(value, blank) for value in values), dtype=np.float64,
+                           count=len(values))
+
+
+def _read_rows(reader: Iterator[List[str]], count: int) -> List[List[str]]:
+    # The rows are lists of strings and cannot form cycles; without pausing
+    # the cyclic garbage collector, its passes over the growing chunk cost
+    # about as much as parsing the CSV
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return list(itertools.islice(reader, count))
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class StatementParser:
+    """
+    Turns a statement CSV into typed column chunks. Holds the rules and the
+    per-string caches, so one parser can read several files.
+    """
+    def __init__(self, rules: Optional[Sequence[CategoryRule]] = None,
+                 columns: Optional[Dict[str, str]] = None, date_format: Optional[str] = None,
+                 dayfirst: bool = True, chunk_rows: int = CHUNK_ROWS):
+        self.rules = list(default_rules() if rules is None else rules)
+        self.categories, self.kinds = rule_categories(self.rules)
+        self.column_names = columns
+        self.date_format = date_format
+        self.dayfirst = dayfirst
+        self.chunk_rows = chunk_rows
+        self.columns: Optional[Dict[str, int]] = None
+        self.rows_read = 0
+        self.skipped = 0
+        self._other_income = self.categories.index(OTHER_INCOME)
+        self._other_expenses = self.categories.index(OTHER_EXPENSES)
+        self._months: Dict[str, int] = {}
+        self._codes: Dict[str, Tuple[int, int]] = {}
+        self._last_format: Optional[str] = None
+
+    def options(self) -> Dict[str, Any]:
+        """
+        Everything besides the file that changes the parsed result
+        """
+        return {"rules": [rule.to_dict() for rule in self.rules], "columns": self.column_names,
+                "date_format": self.date_format, "dayfirst": self.dayfirst}
+
+    # --- Strings ---
+    def month_index(self, text: str) -> int:
+        """
+        year * 12 + month - 1 for a date string, -1 if it is not a date
+        """
+        month = self._months.get(text)
+        if month is None:
+            parsed = self._parse_date(text.strip())
+            month = parsed.year * 12 + parsed.month - 1 if parsed is not None else -1
+            if len(self._months) >= MAX_CACHED_STRINGS:
+                self._months.clear()
+            self._months[text] = month
+        return month
+
+    def _parse_date(self, text: str) -> Optional[datetime]:
+        if self.date_format is not None:
+            formats: Sequence[str] = (self.date_format,)
+        else:
+            try:
+                return datetime.fromisoformat(text)
+            except ValueError:
+                pass
+            formats = _DATE_FORMATS[self.dayfirst]
+            if self._last_format is not None:
+                formats = (self._last_format,) + formats
+        # Also try the date alone, without a trailing time
+        for candidate in dict.fromkeys((text, text.split(" ")[0])):
+            for fmt in formats:
+                try:
+                    parsed = datetime.strptime(candidate, fmt)
+                except ValueError:
+                    continue
+                self._last_format = fmt
+                return parsed
+        return None
+
+    def category_codes(self, description: str) -> Tuple[int, int]:
+        """
+        Category code of the description for money in and for money out
+        """
+        codes = self._codes.get(description)
+        if codes is None:
+            credit = debit = None
+            for rule in self.rules:
+                if (credit is None or debit is None) and rule.pattern.search(description):
+                    code = self.categories.index(rule.category)
+                    if credit is None and rule.direction != "debit":
+                        credit = code
+                    if debit is None and rule.direction != "credit":
+                        debit = code
+            codes = (self._other_income if credit is None else credit,
+                     self._other_expenses if debit is None else debit)
+            if len(self._codes) >= MAX_CACHED_STRINGS:
+                self._codes.clear()
+            self._codes[description] = codes
+        return codes
+
+    # --- Rows ---
+    def _resolve_columns(self, header: Sequence[str]) -> Optional[Dict[str, int]]:
+        if self.column_names is None:
+            return find_columns(header)
+        keys = [_header_key(name) for name in header]
+        try:
+            return {role: keys.index(_header_key(name)) for role, name in self.column_names.items()}
+        except ValueError:
+            return None
+
+    def _rows(self, stream: io.TextIOBase) -> Iterator[List[str]]:
+        """
+        Rows below the header, which sets self.columns
+        """
+        lines = iter(stream)
+        preamble = list(itertools.islice(lines, HEADER_SCAN))
+        sample = "".join(preamble)
+        delimiter = max(",;\t|", key=sample.count)
+        reader = csv.reader(itertools.chain(preamble, lines), delimiter=delimiter)
+        for row in itertools.islice(reader, HEADER_SCAN):
+            self.columns = self._resolve_columns(row)
+            if self.columns is not None:
+                return reader
+        wanted = ", ".join(self.column_names.values()) if self.column_names else \
+            "a date column and an amount (or debit and credit) column"
+        raise ValueError(f"No statement header found; expected {wanted}")
+
+    def iter_chunks(self, source: StatementSource) -> Iterator[Dict[str, Any]]:
+        """
+        Yield {'month', 'amount', 'category', 'description'} column chunks
+        of the transactions in a statement file or binary stream. Rows
+        without a valid date or amount are counted in ``skipped``.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as stream:
+                yield from self.iter_chunks(stream)
+            return
+        text = io.TextIOWrapper(source, encoding="utf-8-sig", errors="replace", newline="")
+        try:
+            reader = self._rows(text)
+            columns = self.columns
+            width = max(columns.values()) + 1
+            while True:
+                rows = _read_rows(reader, self.chunk_rows)
+                if not rows:
+                    break
+                self.rows_read += len(rows)
+                chunk = self._parse_chunk([row for row in rows if len(row) >= width], columns)
+                self.skipped += len(rows) - len(chunk["amount"])
+                if len(chunk["amount"]):
+                    yield chunk
+        finally:
+            # Leave a caller's stream open
+            text.detach()
+
+    def _parse_chunk(self, rows: List[List[str]], columns: Dict[str, int]) -> Dict[str, Any]:
+        # Cached strings are looked up inline, only new ones go through the parsers
+        date_column, months = columns["date"], self._months
+        dates = [row[date_column] for row in rows]
+        month = np.fromiter((months[text] if text in months else self.month_index(text)
+                             for text in dates), dtype=np.int64, count=len(rows))
+        if "amount" in columns:
+            amount = _amounts([row[columns["amount"]] for row in rows], np.nan)
+        else:
+            amount = (np.abs(_amounts([row[columns["credit"]] for row in rows], 0.0))
+                      - np.abs(_amounts([row[columns["debit"]] for row in rows], 0.0)))
+        if "direction" in columns:
+            debit = np.fromiter((row[columns["direction"]].strip().lower() in _DEBIT_MARKERS
+                                 for row in rows), dtype=bool, count=len(rows))
+            amount = np.where(debit, -np.abs(amount), amount)
+        if "description" in columns:
+            descriptions = [row[columns["description"]].strip() for row in rows]
+        else:
+            descriptions = [""] * len(rows)
+
+        valid = (month >= 0) & np.isfinite(amount)
+        if not valid.all():
+            keep = np.flatnonzero(valid)
+            month, amount = month[keep], amount[keep]
+            descriptions = [descriptions[i] for i in keep.tolist()]
+        known = self._codes
+        codes = np.array([known[description] if description in known
+                          else self.category_codes(description) for description in descriptions],
+                         dtype=np.int32).reshape(-1, 2)
+        category = np.where(amount >= 0, codes[:, 0], codes[:, 1])
+        return {"month": month, "amount": amount, "category": category,
+                "description": descriptions}
+
+
+# --- Monthly Totals ---
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+class MonthlyStatement:
+    """
+    Signed transaction totals and counts per calendar month and category.
+
+    ``totals[m, c]`` sums the amounts (money in positive) of category c in
+    month ``first_month + m``; months without transactions are zero rows.
+    """
+    def __init__(self, first_month: int, categories: Sequence[str], kinds: Sequence[str],
+                 totals: np.ndarray, counts: np.ndarray, skipped: int = 0):
+        self.first_month = first_month
+        self.categories = list(categories)
+        self.kinds = list(kinds)
+        self.totals = totals
+        self.counts = counts
+        self.skipped = skipped
+        self.from_cache = False
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    @property
+    def transactions(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def months(self) -> List[str]:
+        return [month_label(self.first_month + m) for m in range(len(self))]
+
+    def _kind_total(self, kind: str) -> np.ndarray:
+        mask = np.array([k == kind for k in self.kinds])
+        return self.totals[:, mask].sum(axis=1)
+
+    @property
+    def income(self) -> np.ndarray:
+        return np.maximum(self._kind_total("income"), 0.0)
+
+    @property
+    def expenses(self) -> np.ndarray:
+        return np.maximum(-self._kind_total("expense"), 0.0)
+
+    @property
+    def transfers(self) -> np.ndarray:
+        return self._kind_total("transfer")
+
+    def monthly_series(self) -> Dict[str, Any]:
+        """
+        {'month', 'income', 'expenses', 'net', 'transfers', 'transactions'} columns
+        """
+        income, expenses = self.income, self.expenses
+        return {"month": self.months, "income": income, "expenses": expenses,
+                "net": income - expenses, "transfers": self.transfers,
+                "transactions": self.counts.sum(axis=1)}
+
+    def category_totals(self) -> List[Dict[str, Any]]:
+        """
+        One row per category with transactions, largest amounts first
+        """
+        totals, counts = self.totals.sum(axis=0), self.counts.sum(axis=0)
+        rows = [{"category": category, "kind": kind, "total": float(total),
+                 "monthly_average": float(total) / len(self), "transactions": int(count)}
+                for category, kind, total, count in zip(self.categories, self.kinds, totals, counts)
+                if count]
+        rows.sort(key=lambda row: -abs(row["total"]))
+        return rows
+
+    def averages(self, months: Optional[int] = None) -> Dict[str, float]:
+        """
+        Mean monthly income and expenses over the last ``months`` months (default: all)
+        """
+        if not len(self):
+            return {"income": 0.0, "expenses": 0.0}
+        window = slice(-months, None) if months else slice(None)
+        return {"income": float(self.income[window].mean()),
+                "expenses": float(self.expenses[window].mean())}
+
+    def financials(self, savings_goal: float = 0, currency: str = "UGX",
+                   tax_table: Optional[str] = None, gross_up: bool = True,
+                   report_currency: Optional[str] = None) -> Dict[str, Any]:
+        """
+        advanced_financial_calc columns for every month, plus 'month'.
+
+        Bank deposits are take-home pay, so by default each month's income
+        is grossed up through the tax table (TaxTable.gross_from_net) to the
+        salary the calculator expects; pass gross_up=False for gross income.
+        With a report_currency, each month is converted at the rates in
+        force on its first day.
+        """
+        income = self.income
+        salary = get_tax_table(tax_table, currency).gross_from_net_batch(income) if gross_up \
+            else income
+        rate_date = None
+        if report_currency is not None:
+            rate_date = np.array(self.months, dtype="datetime64[M]").astype("datetime64[D]")
+        results = advanced_financial_calc_batch(salary, self.expenses, savings_goal, currency,
+                                                tax_table, report_currency, rate_date)
+        return {"month": self.months, **results}
+
+    # --- Persistence ---
+    def save(self, path: str) -> None:
+        """
+        Write to an .npz file, atomically (readers never see a partial file)
+        """
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "wb") as stream:
+            np.savez(stream, first_month=np.int64(self.first_month),
+                     categories=np.array(self.categories, dtype=str),
+                     kinds=np.array(self.kinds, dtype=str), totals=self.totals,
+                     counts=self.counts, skipped=np.int64(self.skipped))
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str) -> "MonthlyStatement":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(int(data["first_month"]), data["categories"].tolist(),
+                       data["kinds"].tolist(), data["totals"], data["counts"],
+                       int(data["skipped"]))
+
+
+def read_statement(source: StatementSource, parser: Optional[StatementParser] = None
+                   ) -> MonthlyStatement:
+    """
+    Parse a statement in chunks and sum it by month and category
+    """
+    parser = parser or StatementParser()
+    categories = len(parser.categories)
+    sums: Dict[int, float] = {}
+    counts: Dict[int, int] = {}
+    for chunk in parser.iter_chunks(source):
+        # One (month, category) key per transaction, summed per chunk
+        keys, inverse = np.unique(chunk["month"] * categories + chunk["category"],
+                                  return_inverse=True)
+        chunk_sums = np.bincount(inverse, weights=chunk["amount"], minlength=len(keys))
+        chunk_counts = np.bincount(inverse, minlength=len(keys))
+        for key, total, count in zip(keys.tolist(), chunk_sums.tolist(), chunk_counts.tolist()):
+            sums[key] = sums.get(key, 0.0) + total
+            counts[key] = counts.get(key, 0) + count
+
+    if not sums:
+        return MonthlyStatement(0, parser.categories, parser.kinds,
+                                np.zeros((0, categories)), np.zeros((0, categories), dtype=np.int64),
+                                parser.skipped)
+    keys = np.fromiter(sums, dtype=np.int64, count=len(sums))
+    first, last = int(keys.min()) // categories, int(keys.max()) // categories
+    totals = np.zeros((last - first + 1, categories))
+    count_matrix = np.zeros(totals.shape, dtype=np.int64)
+    rows, columns = keys // categories - first, keys % categories
+    totals[rows, columns] = np.fromiter(sums.values(), dtype=np.float64, count=len(sums))
+    count_matrix[rows, columns] = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    return MonthlyStatement(first, parser.categories, parser.kinds, totals, count_matrix,
+                            parser.skipped)
+
+
+# --- Disk Cache ---
+def file_digest(source: StatementSource) -> str:
+    """
+    BLAKE2b hex digest of a file's bytes; streams are rewound afterwards
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as stream:
+            for block in iter(lambda: stream.read(HASH_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    start = source.tell()
+    for block in iter(lambda: source.read(HASH_BLOCK), b""):
+        digest.update(block)
+    source.seek(start)
+    return digest.hexdigest()
+
+def statement_cache_key(source: StatementSource, parser: StatementParser) -> str:
+    options = json.dumps({"version": CACHE_VERSION, **parser.options()}, sort_keys=True)
+    return f"{file_digest(source)}-{hashlib.blake2b(options.encode(), digest_size=8).hexdigest()}"
+
+def load_statement(source: StatementSource, parser: Optional[StatementParser] = None,
+                   cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> MonthlyStatement:
+    """
+    read_statement, cached on disk under cache_dir by the file's hash and the
+    parser options (None disables the cache). Streams must be seekable,
+    since they are hashed before they are parsed.
+    """
+    parser = parser or StatementParser()
+    if cache_dir is None:
+        return read_statement(source, parser)
+    path = os.path.join(cache_dir, statement_cache_key(source, parser) + ".npz")
+    try:
+        statement = MonthlyStatement.load(path)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        pass
+    else:
+        statement.from_cache = True
+        return statement
+    statement = read_statement(source, parser)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        statement.save(path)
+    except OSError:
+        # A read-only cache directory only costs the speedup
+        pass
+    return statement
@@ -0,0 +1,185 @@
+"""
+Parallel what-if sweeps over the financial calculator.
+
+A sweep is the full grid tax table x salary x expenses x savings_goal.
+The grid is never materialized: it is cut into shards of consecutive flat
+indices (never spanning two tax tables), each shard is decoded with
+np.unravel_index and computed in one advanced_financial_calc_batch call in
+a worker process, and reduced there to small summary partials. Partials
+are plain sums and counts, so merging is addition in any order and
+results can be shown while the remaining shards are still running.
+
+Summary tables:
+
+- ``score_sum`` / ``cells``: health score sums per (salary, expenses),
+  giving the mean health score heatmap
+- ``goal_hits``: scenarios reaching the goal within GOAL_HORIZON months,
+  per (salary, savings_goal)
+- ``score_histogram``: scenario counts per health score 0..100
+- ``break_even_expense``: per (tax table, salary), the expense level at
+  which savings are exactly zero (the net salary; computed directly)
+"""
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import advanced_financial_calc_batch
+from .tax import get_tax_table
+
+# Grid points per shard; one shard is one vectorized batch in a worker
+SHARD_SIZE = 1 << 20
+
+# Months within which a savings goal counts as reached in goal_hits
+GOAL_HORIZON = 12
+
+
+class SweepGrid:
+    """
+    Axes of a scenario sweep; the grid itself is implicit
+    """
+    def __init__(self, salaries: Sequence[float], expenses: Sequence[float],
+                 savings_goals: Sequence[float] = (0.0,),
+                 tax_tables: Sequence[Optional[str]] = (None,), currency: str = "UGX"):
+        self.salaries = np.asarray(salaries, dtype=np.float64)
+        self.expenses = np.asarray(expenses, dtype=np.float64)
+        self.savings_goals = np.asarray(savings_goals, dtype=np.float64)
+        # None means the currency's default table; resolve once so shards agree
+        self.tax_tables = [get_tax_table(table, currency).key for table in tax_tables]
+        self.currency = currency
+        if not (len(self.salaries) and len(self.expenses) and len(self.savings_goals)
+                and self.tax_tables):
+            raise ValueError("Every sweep axis needs at least one value")
+
+    @property
+    def inner_shape(self) -> Tuple[int, int, int]:
+        return len(self.salaries), len(self.expenses), len(self.savings_goals)
+
+    def __len__(self) -> int:
+        return len(self.tax_tables) * int(np.prod(self.inner_shape))
+
+    def shards(self, shard_size: int = SHARD_SIZE) -> List[Tuple[int, int, int]]:
+        """
+        (tax table index, start, stop) flat ranges over the inner grid
+        """
+        inner = int(np.prod(self.inner_shape))
+        return [(table, start, min(start + shard_size, inner))
+                for table in range(len(self.tax_tables))
+                for start in range(0, inner, shard_size)]
+
+
+def empty_summary(grid: SweepGrid) -> Dict[str, Any]:
+    num_salaries, num_expenses, num_goals = grid.inner_shape
+    return {
+        "scenarios": 0,
+        "score_sum": np.zeros((num_salaries, num_expenses)),
+        "cells": np.zeros((num_salaries, num_expenses), dtype=np.int64),
+        "goal_hits": np.zeros((num_salaries, num_goals), dtype=np.int64),
+        "goal_cells": np.zeros((num_salaries, num_goals), dtype=np.int64),
+        "score_histogram": np.zeros(101, dtype=np.int64),
+    }
+
+def compute_shard(grid: SweepGrid, table: int, start: int, stop: int) -> Dict[str, Any]:
+    """
+    Summary partials for one shard (runs in a worker process)
+    """
+    salary_idx, expense_idx, goal_idx = np.unravel_index(np.arange(start, stop),
+                                                         grid.inner_shape)
+    results = advanced_financial_calc_batch(
+        grid.salaries[salary_idx], grid.expenses[expense_idx], grid.savings_goals[goal_idx],
+        grid.currency, grid.tax_tables[table])
+    score = results["health_score"]
+    num_salaries, num_expenses, num_goals = grid.inner_shape
+
+    partial = empty_summary(grid)
+    partial["scenarios"] = stop - start
+    cell = salary_idx * num_expenses + expense_idx
+    partial["score_sum"] += np.bincount(cell, weights=score, minlength=num_salaries * num_expenses
+                                        ).reshape(num_salaries, num_expenses)
+    partial["cells"] += np.bincount(cell, minlength=num_salaries * num_expenses
+                                    ).reshape(num_salaries, num_expenses)
+    goal_cell = salary_idx * num_goals + goal_idx
+    reached = results["months_to_goal"] <= GOAL_HORIZON
+    partial["goal_hits"] += np.bincount(goal_cell[reached], minlength=num_salaries * num_goals
+                                        ).reshape(num_salaries, num_goals)
+    partial["goal_cells"] += np.bincount(goal_cell, minlength=num_salaries * num_goals
+                                         ).reshape(num_salaries, num_goals)
+    partial["score_histogram"] += np.bincount(score, minlength=101)
+    return partial
+
+def merge_summary(total: Dict[str, Any], partial: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in partial.items():
+        total[key] = total[key] + value
+    return total
+
+def break_even_expense(grid: SweepGrid) -> Dict[str, np.ndarray]:
+    """
+    Expense level with zero savings per tax table and salary (the net salary)
+    """
+    return {table: grid.salaries - get_tax_table(table).tax_batch(grid.salaries)
+            for table in grid.tax_tables}
+
+def iter_sweep(grid: SweepGrid, executor: Optional[Executor] = None,
+               workers: Optional[int] = None,
+               shard_size: int = SHARD_SIZE) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Run the sweep, yielding (shards_done, shards_total, merged summary so
+    far) each time a shard completes. Without an executor a process pool
+    of ``workers`` processes is created for the sweep (see
+    sweep_executor). Closing the generator early cancels the shards that
+    have not started.
+    """
+    shards = grid.shards(shard_size)
+    summary = empty_summary(grid)
+    own_executor = executor is None
+    if own_executor:
+        executor = sweep_executor(workers)
+    futures = []
+    try:
+        futures = [executor.submit(compute_shard, grid, *shard) for shard in shards]
+        for done, future in enumerate(as_completed(futures), 1):
+            summary = merge_summary(summary, future.result())
+            yield done, len(shards), summary
+    finally:
+        for future in futures:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
+
+def sweep_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process pool for sweeps; workers are spawned rather than forked so the
+    pool is safe to start from a multi-threaded server such as Streamlit
+    """
+    return ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context("spawn"))
+
+def run_sweep(grid: SweepGrid, executor: Optional[Executor] = None,
+              workers: Optional[int] = None, shard_size: int = SHARD_SIZE) -> Dict[str, Any]:
+    """
+    Run the whole sweep and return the final summary tables, including
+    'mean_score', 'goal_share' and 'break_even_expense'
+    """
+    start = time.perf_counter()
+    summary = empty_summary(grid)
+    for _, _, summary in iter_sweep(grid, executor, workers, shard_size):
+        pass
+    return finalize_summary(grid, summary, time.perf_counter() - start)
+
+def finalize_summary(grid: SweepGrid, summary: Dict[str, Any],
+                     elapsed: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Add mean/share tables to a (possibly partial) merged summary
+    """
+    result = dict(summary)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["mean_score"] = np.where(summary["cells"] > 0,
+                                        summary["score_sum"] / summary["cells"], np.nan)
+        result["goal_share"] = np.where(summary["goal_cells"] > 0,
+                                        summary["goal_hits"] / summary["goal_cells"], np.nan)
+    result["break_even_expense"] = break_even_expense(grid)
+    if elapsed is not None:
+        result["elapsed"] = elapsed
+    return result
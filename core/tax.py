@@ -0,0 +1,154 @@
+"""
+Progressive income tax brackets.
+
+Bracket tables are loaded from a local JSON file (``tax_brackets.json``
+next to this module, or the file named by ``HUB_TAX_TABLES``) and compiled
+once into sorted lower bounds, marginal rates and the cumulative tax owed
+at each lower bound. Taxing a salary is then a binary search for its
+bracket plus one multiply-add, both for a single salary (``bisect``) and
+for arrays of millions of salaries (``numpy.searchsorted``). NumPy is only
+imported by the array methods so the scalar API stays dependency free.
+"""
+import bisect
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_TABLES_PATH = os.environ.get(
+    "HUB_TAX_TABLES", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   "tax_brackets.json"))
+
+# Used for currencies without a table of their own
+FALLBACK_TABLE = "FLAT10"
+
+
+class TaxTable:
+    """
+    One compiled progressive tax table
+    """
+    def __init__(self, key: str, name: str, brackets: Sequence[Sequence[float]],
+                 currency: Optional[str] = None):
+        if not brackets:
+            raise ValueError(f"Tax table {key} has no brackets")
+        brackets = sorted((float(lower), float(rate)) for lower, rate in brackets)
+        if brackets[0][0] != 0:
+            raise ValueError(f"Tax table {key} must start at 0")
+        if any(not 0 <= rate <= 1 for _, rate in brackets):
+            raise ValueError(f"Tax table {key} has a rate outside 0-1")
+        self.key = key
+        self.name = name
+        self.currency = currency
+        self.lower = [lower for lower, _ in brackets]
+        self.rates = [rate for _, rate in brackets]
+        # Tax owed on income up to each bracket's lower bound
+        self.base = [0.0]
+        for i in range(1, len(brackets)):
+            self.base.append(self.base[-1] + (self.lower[i] - self.lower[i - 1]) * self.rates[i - 1])
+        self._arrays: Optional[Tuple[Any, Any, Any]] = None
+
+    def __repr__(self) -> str:
+        return f"TaxTable({self.key!r}, {len(self.lower)} brackets)"
+
+    # --- Scalar ---
+    def bracket_index(self, salary: float) -> int:
+        return bisect.bisect_right(self.lower, salary) - 1
+
+    def tax(self, salary: float) -> float:
+        i = self.bracket_index(salary)
+        return self.base[i] + (salary - self.lower[i]) * self.rates[i]
+
+    def marginal_rate(self, salary: float) -> float:
+        return self.rates[self.bracket_index(salary)]
+
+    def effective_rate(self, salary: float) -> float:
+        return self.tax(salary) / salary if salary > 0 else 0.0
+
+    def gross_from_net(self, net: float) -> float:
+        """
+        Salary whose take-home pay (salary - tax) is net. Take-home pay is
+        piecewise linear in the salary, so this inverts one bracket.
+        """
+        net_lower = [lower - base for lower, base in zip(self.lower, self.base)]
+        i = max(bisect.bisect_right(net_lower, net) - 1, 0)
+        if self.rates[i] >= 1:
+            return self.lower[i]
+        return self.lower[i] + (net - net_lower[i]) / (1 - self.rates[i])
+
+    def breakdown(self, salary: float) -> List[Dict[str, float]]:
+        """
+        Income and tax falling in each bracket up to the salary's own
+        """
+        rows = []
+        for i in range(self.bracket_index(salary) + 1):
+            upper = self.lower[i + 1] if i + 1 < len(self.lower) else float("inf")
+            taxed = min(salary, upper) - self.lower[i]
+            rows.append({"lower": self.lower[i], "upper": upper, "rate": self.rates[i],
+                         "income": taxed, "tax": taxed * self.rates[i]})
+        return rows
+
+    # --- Vectorized ---
+    def _compiled(self):
+        if self._arrays is None:
+            import numpy as np
+            self._arrays = (np.array(self.lower), np.array(self.rates), np.array(self.base))
+        return self._arrays
+
+    def bracket_index_batch(self, salary):
+        import numpy as np
+        lower, _, _ = self._compiled()
+        return np.searchsorted(lower, salary, side="right") - 1
+
+    def tax_batch(self, salary):
+        """
+        Tax for an array of salaries, same arithmetic as tax()
+        """
+        import numpy as np
+        salary = np.asarray(salary, dtype=np.float64)
+        lower, rates, base = self._compiled()
+        i = np.searchsorted(lower, salary, side="right") - 1
+        return base[i] + (salary - lower[i]) * rates[i]
+
+    def marginal_rate_batch(self, salary):
+        _, rates, _ = self._compiled()
+        return rates[self.bracket_index_batch(salary)]
+
+    def gross_from_net_batch(self, net):
+        """
+        gross_from_net for an array of take-home pay amounts
+        """
+        import numpy as np
+        net = np.asarray(net, dtype=np.float64)
+        lower, rates, base = self._compiled()
+        net_lower = lower - base
+        i = np.maximum(np.searchsorted(net_lower, net, side="right") - 1, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gross = lower[i] + (net - net_lower[i]) / (1 - rates[i])
+        return np.where(rates[i] >= 1, lower[i], gross)
+
+
+@lru_cache(maxsize=8)
+def load_tax_tables(path: str = DEFAULT_TABLES_PATH) -> Dict[str, TaxTable]:
+    """
+    Compile every table in a bracket file, keyed by table id
+    """
+    with open(path, encoding="utf-8") as stream:
+        spec = json.load(stream)
+    return {key: TaxTable(key, table.get("name", key), table["brackets"], table.get("currency"))
+            for key, table in spec["tables"].items()}
+
+def get_tax_table(table: Optional[str] = None, currency: Optional[str] = None,
+                  path: str = DEFAULT_TABLES_PATH) -> TaxTable:
+    """
+    Table by id, else the first table for the currency, else the flat fallback
+    """
+    tables = load_tax_tables(path)
+    if table is not None:
+        try:
+            return tables[table]
+        except KeyError:
+            raise ValueError(f"Unknown tax table: {table}") from None
+    for candidate in tables.values():
+        if candidate.currency == currency:
+            return candidate
+    return tables[FALLBACK_TABLE]
@@ -0,0 +1,80 @@
+"""
+Smart To-Do generation
+"""
+import hashlib
+import random
+from datetime import date
+from typing import List, Optional, Tuple
+
+from .cache import TTLCache
+from .catalog import TaskCatalog, get_task_catalog
+from .data import MOTIVATIONAL_QUOTES, PRIORITY_CONFIG
+
+# Daily lists shared by every session in the process; a day's list is
+# stable anyway, the TTL just bounds how long stale days linger
+TODO_CACHE = TTLCache(maxsize=10000, ttl=24 * 60 * 60)
+
+def generate_smart_todo(user_name: str, category: str = "Work", priority: str = "Medium",
+                        rng: Optional[random.Random] = None,
+                        catalog: Optional[TaskCatalog] = None) -> Tuple[List[str], str]:
+    """
+    Enhanced todo generator with categories, priorities, and time estimates
+
+    Uses the global random module unless a seeded rng is passed, and the
+    current task catalog (see core.catalog) unless one is passed.
+    """
+    rng = rng if rng is not None else random
+    catalog = catalog if catalog is not None else get_task_catalog()
+    if not user_name.strip():
+        raise ValueError("User name cannot be empty")
+    priority_config = PRIORITY_CONFIG[priority]
+    
+    # Select weighted random tasks eligible for the priority (3-5 tasks based
+    # on priority); unknown categories fall back to the catalog default
+    num_tasks = 5 if priority == "High" else 4 if priority == "Medium" else 3
+    selected_tasks = catalog.sample(category, priority, num_tasks, rng)
+    
+    # Enhance tasks with priority indicators and time estimates
+    enhanced_tasks = []
+    for task in selected_tasks:
+        # Draw from the task's duration (or TIME_ESTIMATES), scaled by the priority
+        time_estimate = task.time_estimate(rng, priority_config["multiplier"])
+        
+        enhanced_task = f"{priority_config['emoji']} {task.name} ({time_estimate})"
+        enhanced_tasks.append(enhanced_task)
+    
+    # Select motivational message
+    motivation = rng.choice(MOTIVATIONAL_QUOTES)
+    
+    return enhanced_tasks, motivation
+
+def todo_seed(user_name: str, category: str, priority: str, day: date) -> int:
+    """
+    Stable 64-bit seed for one user's list on one day
+    """
+    key = "\x1f".join((user_name.strip().lower(), category, priority, day.isoformat()))
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+def generate_daily_todo(user_name: str, category: str = "Work", priority: str = "Medium",
+                        day: Optional[date] = None) -> Tuple[List[str], str]:
+    """
+    Reproducible generate_smart_todo: the same user, category and priority
+    always get the same list on a given day (for one catalog version).
+    Results come from TODO_CACHE when available, so repeated calls do no
+    sampling work.
+    """
+    if not user_name.strip():
+        raise ValueError("User name cannot be empty")
+    day = day or date.today()
+    catalog = get_task_catalog()
+    key = (user_name.strip().lower(), category, priority, day, catalog.version)
+    tasks, motivation = TODO_CACHE.get_or_compute(
+        key, lambda: _seeded_todo(user_name, category, priority, day, catalog))
+    return list(tasks), motivation
+
+def _seeded_todo(user_name: str, category: str, priority: str, day: date,
+                 catalog: TaskCatalog) -> Tuple[Tuple[str, ...], str]:
+    rng = random.Random(todo_seed(user_name, category, priority, day))
+    tasks, motivation = generate_smart_todo(user_name, category, priority, rng=rng,
+                                            catalog=catalog)
+    return tuple(tasks), motivation
@@ -0,0 +1,59 @@
+"""
+HTTP handling of the JSON API, over a real socket
+"""
+import asyncio
+import json
+
+import pytest
+
+from core.api import MAX_BODY_BYTES, HubAPI
+
+
+async def _exchange(raw: bytes):
+    api = HubAPI(workers=1)
+    server = await asyncio.start_server(api.handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=10)
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+        api.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def _post(content_length: str, body: bytes = b"", path: str = "/finance") -> bytes:
+    return (f"POST {path} HTTP/1.1\r\nContent-Length: {content_length}\r\n"
+            f"Connection: close\r\n\r\n").encode("latin-1") + body
+
+
+@pytest.mark.parametrize("content_length, status", [
+    ("abc", 400),
+    ("-5", 400),
+    ("1.5", 400),
+    (str(MAX_BODY_BYTES + 1), 413),
+])
+def test_bad_content_length_is_rejected(content_length, status):
+    code, payload = asyncio.run(_exchange(_post(content_length)))
+    assert code == status
+    assert "error" in payload
+
+
+@pytest.mark.parametrize("names", [5, {"a": 1}, True])
+def test_groups_names_must_be_a_string_or_a_list(names):
+    body = json.dumps({"names": names, "group_size": 2}).encode()
+    code, payload = asyncio.run(_exchange(_post(str(len(body)), body, "/groups")))
+    assert code == 400
+    assert payload["error"] == "names must be a string or a list"
+
+
+def test_valid_request_is_served():
+    body = json.dumps({"salary": 1000000, "expenses": 600000}).encode()
+    code, payload = asyncio.run(_exchange(_post(str(len(body)), body)))
+    assert code == 200
+    assert payload["net_salary"] == 798000
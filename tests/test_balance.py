@@ -0,0 +1,94 @@
+"""
+The balanced partition's local search scores swaps incrementally; the
+accepted changes must add up to a full recompute of the objective, and
+results must respect group size bounds and keep-apart pairs.
+"""
+import random
+import time
+
+import numpy as np
+import pytest
+
+from core.balance import _local_search, _objective, balanced_group_partition
+
+DEPARTMENTS = ["HR", "IT", "Sales", "Ops"]
+
+
+def _roster(count, seed):
+    rng = np.random.default_rng(seed)
+    names = [f"Person {i}" for i in range(count)]
+    numeric = {"skill": rng.normal(60, 15, count).round(1).tolist(),
+               "years": [str(v) if v % 7 else "" for v in rng.integers(0, 20, count).tolist()]}
+    categorical = {"department": rng.choice(DEPARTMENTS, count).tolist(),
+                   "gender": rng.choice(["F", "M", "X"], count, p=[0.45, 0.45, 0.1]).tolist()}
+    return names, numeric, categorical
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_swap_deltas_match_a_full_recompute(seed):
+    rng = np.random.default_rng(seed)
+    count, num_groups = 60, 7
+    z = rng.normal(size=(count, 2))
+    codes = [rng.integers(0, 4, count), rng.integers(0, 2, count)]
+    shares = [np.bincount(code, minlength=4 if i == 0 else 2) / count
+              for i, code in enumerate(codes)]
+    # Overlapping pairs, including partners that may swap with each other
+    pairs = np.array([(0, 1), (0, 2), (1, 2), (3, 4), (5, 6), (5, 7), (8, 9)], dtype=np.int64)
+    groups = rng.permutation(np.arange(count) % num_groups)
+
+    before = _objective(groups, num_groups, z, codes, shares, pairs)
+    _, change = _local_search(groups, num_groups, z, codes, shares, pairs,
+                              time.perf_counter() + 5.0, random.Random(seed))
+    after = _objective(groups, num_groups, z, codes, shares, pairs)
+    assert change < 0
+    assert after["total"] == pytest.approx(before["total"] + change, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("count, group_size, min_size, max_size", [
+    (10, 3, 3, 4),
+    (23, 4, 3, 5),
+    (50, 6, 5, 6),
+    (7, 3, 2, 3),
+])
+def test_group_sizes_stay_within_bounds(count, group_size, min_size, max_size):
+    names, numeric, categorical = _roster(count, count)
+    result = balanced_group_partition(names, numeric, categorical, group_size=group_size,
+                                      min_size=min_size, max_size=max_size, seed=1,
+                                      time_limit=1.0)
+    sizes = np.bincount(result.groups)
+    assert sizes.min() >= min_size and sizes.max() <= max_size
+    assert sorted(name for group in result.to_groups() for name in group) == sorted(names)
+
+
+def test_impossible_sizes_are_rejected():
+    with pytest.raises(ValueError, match="Cannot split"):
+        balanced_group_partition([f"P{i}" for i in range(7)], group_size=4, min_size=4,
+                                 max_size=4)
+
+
+def test_keep_apart_pairs_land_in_different_groups():
+    names, numeric, categorical = _roster(24, 3)
+    keep_apart = [(names[0], names[1]), (names[0], names[2]), (names[3], names[4]),
+                  (names[5], names[6]), (names[7], names[8])]
+    result = balanced_group_partition(names, numeric, categorical, group_size=4, seed=2,
+                                      keep_apart=keep_apart, time_limit=1.0)
+    index = {name: i for i, name in enumerate(names)}
+    for first, second in keep_apart:
+        assert result.groups[index[first]] != result.groups[index[second]]
+    assert result.objective["conflicts"] == 0
+
+
+def test_search_improves_and_reports_the_final_objective():
+    # A generous time limit: the search ends on its own, so a seed fixes the result
+    names, numeric, categorical = _roster(120, 5)
+    result = balanced_group_partition(names, numeric, categorical, group_size=5, seed=4,
+                                      time_limit=60.0)
+    assert result.objective["total"] <= result.initial_objective["total"]
+    again = balanced_group_partition(names, numeric, categorical, group_size=5, seed=4,
+                                     time_limit=60.0)
+    assert again.groups.tolist() == result.groups.tolist()
+
+
+def test_unknown_keep_apart_names_are_rejected():
+    with pytest.raises(ValueError, match="not in roster"):
+        balanced_group_partition(["Ann", "Bob", "Cid"], group_size=2, keep_apart=[("Ann", "Dee")])
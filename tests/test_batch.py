@@ -0,0 +1,111 @@
+"""
+The vectorized financial calculator must match advanced_financial_calc
+value for value on a shared corpus, including edge rows and currency
+conversion.
+"""
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from core.batch import FINANCIAL_COLUMNS, advanced_financial_calc_batch
+from core.finance import advanced_financial_calc
+from core.tax import load_tax_tables
+
+CURRENCIES = ["UGX", "USD", "EUR", "GBP"]
+
+
+def _corpus():
+    """
+    (salary, expenses, savings_goal, currency, tax_table) rows: bracket
+    boundaries and their neighbours for every table, zero and negative
+    savings, zero goals and a seeded random sample
+    """
+    rows = []
+    for key, table in load_tax_tables().items():
+        currency = table.currency or "UGX"
+        for lower in table.lower:
+            for salary in (lower, lower + 0.01, max(lower - 0.01, 0.0), lower * 3):
+                for expenses in (0.0, salary / 2, salary, salary * 2):
+                    rows.append((salary, expenses, 0.0, currency, key))
+                    rows.append((salary, expenses, salary * 5, currency, None))
+    rows += [(0.0, 0.0, 0.0, "UGX", None), (0.0, 100.0, 1000.0, "USD", None),
+             (100.0, 0.0, 0.0, "EUR", None)]
+    rng = np.random.default_rng(2)
+    for _ in range(2000):
+        rows.append((float(rng.uniform(0, 5e6)), float(rng.uniform(0, 5e6)),
+                     float(rng.choice([0.0, rng.uniform(0, 2e7)])),
+                     str(rng.choice(CURRENCIES)), None))
+    return rows
+
+CORPUS = _corpus()
+
+
+def _assert_same(scalar, batch, index):
+    for column in FINANCIAL_COLUMNS:
+        expected = scalar[column]
+        value = batch[column]
+        if np.ndim(value):
+            value = value[index]
+        if isinstance(expected, float):
+            value = float(value)
+            assert value == expected or (math.isnan(value) and math.isnan(expected)), \
+                (column, index, expected, value)
+        else:
+            assert value == expected, (column, index, expected, value)
+
+
+def test_batch_matches_scalar_on_corpus():
+    salary, expenses, goal, currency, _ = (np.array(column) for column in zip(*CORPUS))
+    batch = advanced_financial_calc_batch(salary, expenses, goal, currency)
+    for index, row in enumerate(CORPUS):
+        _assert_same(advanced_financial_calc(*row[:4]), batch, index)
+
+
+def test_batch_matches_scalar_with_explicit_tax_tables():
+    rows = [row for row in CORPUS if row[4] is not None]
+    salary, expenses, goal, currency, tax_table = (np.array(column, dtype=object if i > 2 else None)
+                                                   for i, column in enumerate(zip(*rows)))
+    batch = advanced_financial_calc_batch(salary.astype(float), expenses.astype(float),
+                                          goal.astype(float), currency, tax_table)
+    for index, row in enumerate(rows):
+        _assert_same(advanced_financial_calc(*row), batch, index)
+
+
+@pytest.mark.parametrize("currency, report_currency, rate_date", [
+    (currency, report, rate_date)
+    for currency, report in itertools.product(CURRENCIES, CURRENCIES + ["KES", None])
+    for rate_date in (None, "2024-01-01", "2025-06-15")
+])
+def test_batch_matches_scalar_with_report_currency(currency, report_currency, rate_date):
+    rows = CORPUS[:200]
+    salary, expenses, goal = (np.array(column) for column in list(zip(*rows))[:3])
+    batch = advanced_financial_calc_batch(salary, expenses, goal, currency, None,
+                                          report_currency, rate_date)
+    for index, row in enumerate(rows):
+        scalar = advanced_financial_calc(*row[:3], currency, None, report_currency, rate_date)
+        _assert_same(scalar, batch, index)
+
+
+@pytest.mark.parametrize("currency, tax_table, rate_date", [
+    ("UGX", None, "2020-01-01"),   # before the first rate
+    ("XXX", "FLAT10", None),       # a currency the rate table does not know
+])
+def test_same_report_currency_needs_no_rate(currency, tax_table, rate_date):
+    scalar = advanced_financial_calc(1e6, 4e5, 2e6, currency, tax_table, currency, rate_date)
+    batch = advanced_financial_calc_batch(1e6, 4e5, 2e6, currency, tax_table, currency, rate_date)
+    assert isinstance(batch["fx_rate"], float)
+    _assert_same(scalar, batch, 0)
+
+
+def test_per_row_report_currencies_and_dates():
+    currency = np.array(["UGX", "USD", "EUR", "GBP", "UGX"], dtype=object)
+    report = np.array(["USD", "USD", "GBP", "KES", "EUR"], dtype=object)
+    dates = np.array(["2024-03-01", "2026-10-01", "2025-01-31", "2024-12-01", "2025-07-04"])
+    batch = advanced_financial_calc_batch(np.full(5, 3e6), np.full(5, 1e6), 0, currency, None,
+                                          report, dates)
+    for index in range(5):
+        scalar = advanced_financial_calc(3e6, 1e6, 0, currency[index], None, report[index],
+                                         dates[index])
+        _assert_same(scalar, batch, index)
@@ -0,0 +1,113 @@
+"""
+The batched knapsack must find the optimum brute force finds, and plans
+must keep tasks inside the working day, out of meetings and scaled by the
+user's priority.
+"""
+import itertools
+from datetime import date
+
+import numpy as np
+import pytest
+
+from core.catalog import Task, TaskCatalog
+from core.data import PRIORITY_CONFIG
+from core.planner import (SLOT_MINUTES, assign_gaps, knapsack_batch, parse_meetings,
+                          parse_time, plan_batch, plan_day)
+
+DAY = date(2026, 10, 19)
+
+
+def _brute_force(weights, values, capacity, available):
+    best = 0.0
+    items = [i for i in range(len(weights)) if available[i]]
+    for size in range(len(items) + 1):
+        for subset in itertools.combinations(items, size):
+            if sum(weights[i] for i in subset) <= capacity:
+                best = max(best, sum(values[i] for i in subset))
+    return best
+
+def _catalog(durations, weights=None):
+    weights = weights or [1.0] * len(durations)
+    return TaskCatalog([Task(str(i), f"Task {i}", "Work", (), weight, duration)
+                        for i, (duration, weight) in enumerate(zip(durations, weights))],
+                       version="test")
+
+
+def test_knapsack_matches_brute_force():
+    rng = np.random.default_rng(4)
+    count, items = 300, 7
+    weights = rng.integers(1, 10, size=(count, items))
+    values = np.round(rng.uniform(0.1, 5.0, size=(count, items)), 2)
+    capacity = rng.integers(0, 25, size=count)
+    available = rng.random((count, items)) < 0.85
+    chosen = knapsack_batch(weights, values, capacity, available)
+    for row in range(count):
+        assert not (chosen[row] & ~available[row]).any()
+        assert weights[row][chosen[row]].sum() <= capacity[row]
+        expected = _brute_force(weights[row], values[row], capacity[row], available[row])
+        assert values[row][chosen[row]].sum() == pytest.approx(expected)
+
+
+def test_knapsack_prefers_value_over_count():
+    weights = np.array([[2, 2, 2, 6]])
+    values = np.array([[1.0, 1.0, 1.0, 5.0]])
+    chosen = knapsack_batch(weights, values, np.array([6]), np.ones((1, 4), dtype=bool))
+    assert chosen.tolist() == [[False, False, False, True]]
+
+
+def test_assign_gaps_respects_every_gap():
+    rng = np.random.default_rng(5)
+    count, items = 200, 8
+    weights = rng.integers(1, 8, size=(count, items))
+    values = rng.uniform(0.1, 3.0, size=(count, items))
+    available = rng.random((count, items)) < 0.9
+    gap_slots = rng.integers(0, 12, size=(count, 3))
+    assignment = assign_gaps(weights, values, available, gap_slots)
+    for row in range(count):
+        assert (assignment[row][~available[row]] == -1).all()
+        for gap in range(3):
+            assert weights[row][assignment[row] == gap].sum() <= gap_slots[row, gap]
+
+
+def test_plan_prefers_higher_value_tasks():
+    # One 60-minute gap: the heavy hour-long task beats two light half hours
+    catalog = _catalog([(60, 60, 60), (30, 30, 30), (30, 30, 30)], weights=[5.0, 1.0, 1.0])
+    schedule = plan_day("Sarah", "Work", "Medium", "09:00", "10:00", day=DAY, seed=1,
+                        catalog=catalog)
+    assert [entry["task"] for entry in schedule] == ["Task 0"]
+
+
+def test_meetings_are_clipped_to_the_working_day():
+    schedule = plan_day("Sarah", "Work", "Medium", "09:00", "17:00",
+                        "07:00-08:00; 08:30-09:30; 16:30-18:00; 18:00-19:00", day=DAY, seed=2)
+    meetings = [(entry["start"], entry["end"]) for entry in schedule if entry["kind"] == "meeting"]
+    assert meetings == [("09:00", "09:30"), ("16:30", "17:00")]
+    assert all("09:00" <= entry["start"] < entry["end"] <= "17:00" for entry in schedule)
+
+
+def test_tasks_never_overlap_meetings():
+    records = [{"user_name": f"user {i}", "priority": priority, "meetings": meetings}
+               for i, (priority, meetings) in enumerate(itertools.product(
+                   PRIORITY_CONFIG, ["", "10:00-11:00; 14:00-14:30", "09:10-09:20; 12:00-16:55"]))]
+    columns = plan_batch(records, [DAY, date(2026, 10, 20)], seed=3)
+    rows = list(zip(*(columns[key].tolist() for key in ("user_name", "day", "start", "end", "kind"))))
+    for (user, day), entries in itertools.groupby(rows, key=lambda row: row[:2]):
+        spans = sorted((parse_time(start), parse_time(end)) for _, _, start, end, _ in entries)
+        assert all(end <= start for (_, end), (start, _) in zip(spans, spans[1:])), (user, day)
+        assert spans[0][0] >= parse_time("09:00") and spans[-1][1] <= parse_time("17:00")
+
+
+@pytest.mark.parametrize("priority", list(PRIORITY_CONFIG))
+def test_priority_sets_the_duration_multiplier(priority):
+    catalog = _catalog([(60, 60, 60)] * 3)
+    schedule = plan_day("Sarah", "Work", priority, "09:00", "17:00", day=DAY, seed=1,
+                        catalog=catalog)
+    expected = round(60 * PRIORITY_CONFIG[priority]["multiplier"] / SLOT_MINUTES) * SLOT_MINUTES
+    assert [entry["minutes"] for entry in schedule] == [expected] * 3
+    assert {entry["priority"] for entry in schedule} == {priority}
+
+
+@pytest.mark.parametrize("value", ["10:00", "10:00 11:00", "10:00-", "-11:00"])
+def test_meetings_need_a_start_and_an_end(value):
+    with pytest.raises(ValueError, match="Meeting must be HH:MM-HH:MM"):
+        parse_meetings(value)
@@ -0,0 +1,47 @@
+"""
+Roster deduplication: streamed and balanced rosters drop the same
+duplicates (see normalize_name), hash collisions never merge names and
+header rows are not counted as people.
+"""
+import io
+
+from core import roster
+from core.balance import balanced_group_partition, read_attribute_roster
+from core.roster import iter_roster_names, stream_group_assignment
+
+NAMES = ["Sarah Leon", "sarah  leon", "Mike", "MIKE", "Ann", "Bob", "ann", "Ｍｉｋｅ"]
+UNIQUE = ["Sarah Leon", "Mike", "Ann", "Bob"]
+
+
+def _names(assignment):
+    return [assignment.name(i) for i in range(len(assignment))]
+
+
+def test_stream_drops_normalized_duplicates():
+    assert _names(stream_group_assignment(NAMES, 2)) == UNIQUE
+
+
+def test_hash_collisions_keep_distinct_names(monkeypatch):
+    monkeypatch.setattr(roster, "hash", lambda key: 7, raising=False)
+    assert _names(stream_group_assignment(NAMES, 2)) == UNIQUE
+
+
+def test_attribute_roster_matches_stream_dedupe():
+    data = "Name,Skill\n" + "".join(f"{name},{i}\n" for i, name in enumerate(NAMES))
+    names, columns = read_attribute_roster(data.encode("utf-8"))
+    assert names == UNIQUE
+    assert columns == {"Skill": ["0", "2", "4", "5"]}
+
+
+def test_keep_apart_matches_normalized_names():
+    result = balanced_group_partition(UNIQUE, group_size=2, keep_apart=[("sarah leon", "MIKE")],
+                                      seed=1)
+    assert result.objective["conflicts"] == 0
+
+
+def test_header_row_is_not_a_name():
+    roster_file = io.BytesIO("Name\r\nSarah Leon\r\nMike\r\n".encode("utf-8"))
+    assert list(iter_roster_names(roster_file, chunk_size=3)) == ["Sarah Leon", "Mike"]
+    assert list(iter_roster_names(["Mike", "Name"])) == ["Mike", "Name"]
+    assert list(iter_roster_names(["Mike", "Ann"], header=True)) == ["Ann"]
+    assert list(iter_roster_names(["name", "Ann"], header=False)) == ["name", "Ann"]